@@ -1,8 +1,9 @@
 import logging
 import sqlite3
 import time
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Iterator, Optional
+from typing import Any, Dict, List, Iterator, Optional, Tuple
 import re
 import yaml
 import pandas as pd
@@ -207,6 +208,235 @@ def parse_csv_with_smbeagle_format(
             yield batch
 
 
+_TIMESTAMP_FORMATS = (
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+)
+
+
+def parse_timestamp_to_epoch(value: Optional[str]) -> Optional[int]:
+    """Convertit une date SMBeagle en timestamp Unix (None si invalide)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value in ("0", "NULL", "None"):
+        return None
+
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            return int(datetime.strptime(value, fmt).timestamp())
+        except ValueError:
+            continue
+        except (OverflowError, OSError):
+            # Dates hors plage (ex: 01/01/0001)
+            return None
+    return None
+
+
+def backfill_timestamp_columns(conn: sqlite3.Connection) -> int:
+    """Renseigne les colonnes *_ts des lignes importées avant leur ajout.
+
+    Appelée par la migration du schéma: les dates illisibles restent NULL et
+    ne sont pas relues aux analyses suivantes.
+    """
+    rows = conn.execute(
+        """
+        SELECT id, last_modified, creation_time, last_modified_ts, creation_time_ts
+        FROM fichiers
+        WHERE (last_modified_ts IS NULL AND last_modified IS NOT NULL
+               AND last_modified NOT IN ('', '0'))
+           OR (creation_time_ts IS NULL AND creation_time IS NOT NULL
+               AND creation_time NOT IN ('', '0'))
+        """
+    ).fetchall()
+    updates = []
+    for file_id, last_modified, creation_time, lm_ts, ct_ts in rows:
+        new_lm = lm_ts if lm_ts is not None else parse_timestamp_to_epoch(last_modified)
+        new_ct = ct_ts if ct_ts is not None else parse_timestamp_to_epoch(creation_time)
+        if new_lm != lm_ts or new_ct != ct_ts:
+            updates.append((new_lm, new_ct, file_id))
+    if updates:
+        conn.executemany(
+            "UPDATE fichiers SET last_modified_ts = ?, creation_time_ts = ? WHERE id = ?",
+            updates,
+        )
+        logger.info("Timestamps normalisés pour %d fichiers", len(updates))
+    return len(updates)
+
+
+def refresh_duplicate_stats(conn: sqlite3.Connection) -> int:
+    """Recalcule la table duplicate_stats (copies par fast_hash + taille)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS duplicate_stats (
+            fast_hash TEXT NOT NULL,
+            file_size INTEGER,
+            copy_count INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_duplicate_stats_count "
+        "ON duplicate_stats(copy_count, file_size)"
+    )
+    conn.execute("DELETE FROM duplicate_stats")
+    cursor = conn.execute(
+        """
+        INSERT INTO duplicate_stats (fast_hash, file_size, copy_count)
+        SELECT fast_hash, file_size, COUNT(*)
+        FROM fichiers
+        WHERE fast_hash IS NOT NULL AND fast_hash != ''
+          AND (status IS NULL OR status != 'error')
+        GROUP BY fast_hash, file_size
+        """
+    )
+    groups = cursor.rowcount
+    _record_source_state(conn, "duplicate_stats")
+    conn.commit()
+    return groups
+
+
+# Catégories du drill-down utilisateur: filtre SQL et paramètres ("all": sans filtre)
+USER_FILE_CATEGORIES: Dict[str, Tuple[str, tuple]] = {
+    "all": ("", ()),
+    "Gros fichiers": ("AND f.file_size > ?", (100_000_000,)),
+    "Classification C3": ("AND r.security_classification_cached = ?", ("C3",)),
+    "RGPD Critical": ("AND r.rgpd_risk_cached = ?", ("critical",)),
+}
+
+# Sans table reponses_llm (import CSV seul), jointure sur une ligne vide
+_NO_LLM_RESPONSES = (
+    "(SELECT NULL AS fichier_id, NULL AS security_classification_cached, "
+    "NULL AS rgpd_risk_cached)"
+)
+
+
+# Compteur de changements de statut / suppressions dans fichiers, tenu par
+# triggers: UPDATE ... SET status ne modifie pas MAX(rowid)
+_SOURCE_STATE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS analytics_source_state "
+    "(id INTEGER PRIMARY KEY CHECK (id = 1), status_version INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO analytics_source_state VALUES (1, 0)",
+    "CREATE TRIGGER IF NOT EXISTS trg_fichiers_status_state "
+    "AFTER UPDATE OF status ON fichiers BEGIN "
+    "UPDATE analytics_source_state SET status_version = status_version + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS trg_fichiers_delete_state "
+    "AFTER DELETE ON fichiers BEGIN "
+    "UPDATE analytics_source_state SET status_version = status_version + 1; END",
+    "CREATE TABLE IF NOT EXISTS analytics_tables_state (name TEXT PRIMARY KEY, "
+    "fichiers_max INTEGER, reponses_max INTEGER, status_version INTEGER)",
+)
+
+
+def _source_fingerprint(conn: sqlite3.Connection) -> Tuple[Optional[int], ...]:
+    """Return (fichiers max rowid, reponses_llm max rowid, status version)."""
+    fichiers_max = conn.execute("SELECT MAX(rowid) FROM fichiers").fetchone()[0]
+    has_responses = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='reponses_llm'"
+    ).fetchone()
+    reponses_max = (
+        conn.execute("SELECT MAX(rowid) FROM reponses_llm").fetchone()[0]
+        if has_responses
+        else None
+    )
+    row = conn.execute("SELECT status_version FROM analytics_source_state").fetchone()
+    return fichiers_max, reponses_max, row[0] if row else None
+
+
+def _record_source_state(conn: sqlite3.Connection, name: str) -> None:
+    """Remember the fingerprint a roll-up table was just rebuilt from."""
+    for statement in _SOURCE_STATE_SCHEMA:
+        conn.execute(statement)
+    conn.execute(
+        "INSERT OR REPLACE INTO analytics_tables_state VALUES (?, ?, ?, ?)",
+        (name, *_source_fingerprint(conn)),
+    )
+
+
+def rollup_table_current(conn: sqlite3.Connection, name: str) -> bool:
+    """True if roll-up ``name`` exists and fichiers/reponses_llm are unchanged since.
+
+    Lecture seule: deux MAX(rowid) et un compteur, jamais de recalcul.
+    """
+    try:
+        state = conn.execute(
+            "SELECT fichiers_max, reponses_max, status_version "
+            "FROM analytics_tables_state WHERE name = ?",
+            (name,),
+        ).fetchone()
+        return state is not None and tuple(state) == _source_fingerprint(conn)
+    except sqlite3.OperationalError:
+        return False  # table jamais construite
+
+
+def duplicate_stats_current(conn: sqlite3.Connection) -> bool:
+    """True if duplicate_stats matches the current fichiers contents."""
+    return rollup_table_current(conn, "duplicate_stats")
+
+
+def user_category_files_current(conn: sqlite3.Connection) -> bool:
+    """True if user_category_files matches the current fichiers/reponses_llm."""
+    return rollup_table_current(conn, "user_category_files")
+
+
+def refresh_user_category_files(conn: sqlite3.Connection) -> int:
+    """Recalcule user_category_files (fichiers par propriétaire et catégorie)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_category_files (
+            owner TEXT NOT NULL,
+            category TEXT NOT NULL,
+            fichier_id INTEGER NOT NULL,
+            name TEXT,
+            path TEXT,
+            file_size INTEGER,
+            last_modified TEXT,
+            classif TEXT,
+            rgpd TEXT,
+            PRIMARY KEY (owner, category, fichier_id)
+        )
+        """
+    )
+    # Ordre de pagination (taille, id) servi par l'index, sans tri temporaire
+    conn.execute("DROP INDEX IF EXISTS idx_user_category_files_size")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_category_files_order "
+        "ON user_category_files(owner, category, file_size, fichier_id)"
+    )
+    has_responses = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='reponses_llm'"
+    ).fetchone()
+    responses = "reponses_llm" if has_responses else _NO_LLM_RESPONSES
+    conn.execute("DELETE FROM user_category_files")
+    inserted = 0
+    for category, (condition, params) in USER_FILE_CATEGORIES.items():
+        # Plusieurs réponses pour un fichier: la dernière insérée est conservée
+        cursor = conn.execute(
+            f"""
+            INSERT OR REPLACE INTO user_category_files
+                (owner, category, fichier_id, name, path, file_size,
+                 last_modified, classif, rgpd)
+            SELECT f.owner, ?, f.id, f.name, f.path, f.file_size, f.last_modified,
+                   COALESCE(r.security_classification_cached, 'N/A'),
+                   COALESCE(r.rgpd_risk_cached, 'N/A')
+            FROM fichiers f
+            LEFT JOIN {responses} r ON f.id = r.fichier_id
+            WHERE f.owner IS NOT NULL AND (f.status IS NULL OR f.status != 'error')
+            {condition}
+            """,
+            (category, *params),
+        )
+        inserted += cursor.rowcount
+    _record_source_state(conn, "user_category_files")
+    conn.commit()
+    return inserted
+
+
 class CSVParser:
     """Parse les fichiers CSV SMBeagle vers SQLite."""
 
@@ -271,6 +501,8 @@ class CSVParser:
             "priority_score": "INTEGER DEFAULT 0",
             "special_flags": "TEXT",
             "processed_at": "TIMESTAMP",
+            "last_modified_ts": "INTEGER",
+            "creation_time_ts": "INTEGER",
         }
 
         cursor = conn.cursor()
@@ -303,7 +535,9 @@ class CSVParser:
                 exclusion_reason TEXT,
                 priority_score INTEGER DEFAULT 0,
                 special_flags TEXT,
-                processed_at TIMESTAMP
+                processed_at TIMESTAMP,
+                last_modified_ts INTEGER,
+                creation_time_ts INTEGER
             )
             """
         )
@@ -316,6 +550,10 @@ class CSVParser:
             if col not in existing_cols:
                 cursor.execute(f"ALTER TABLE fichiers ADD COLUMN {col} {col_type}")
 
+        # Colonnes *_ts ajoutées à une base existante: renseignées une seule fois
+        if not {"last_modified_ts", "creation_time_ts"} <= existing_cols:
+            backfill_timestamp_columns(conn)
+
         # Indexes for performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_status ON fichiers(status)")
         cursor.execute(
@@ -396,6 +634,11 @@ class CSVParser:
             logger.warning("Invalid FileSize: %s", row_dict.get("FileSize"))
             file_size = 0
 
+        creation_time = row_dict.get("CreationTime", "").strip()
+        last_modified = row_dict.get("LastWriteTime", "") or row_dict.get(
+            "CreationTime", ""
+        )
+
         return {
             "name": name[:255],
             "host": row_dict.get("Host", "").strip(),
@@ -406,7 +649,7 @@ class CSVParser:
             "username": row_dict.get("Username", "").strip(),
             "hostname": row_dict.get("Hostname", "").strip(),
             "unc_directory": unc_dir,
-            "creation_time": row_dict.get("CreationTime", "").strip(),
+            "creation_time": creation_time,
             "last_write_time": row_dict.get("LastWriteTime", "").strip(),
             "readable": safe_bool(row_dict.get("Readable", "False")),
             "writeable": safe_bool(row_dict.get("Writeable", "False")),
@@ -420,8 +663,9 @@ class CSVParser:
             "access_time": row_dict.get("AccessTime", "").strip(),
             "file_attributes": row_dict.get("FileAttributes", "").strip(),
             "file_signature": row_dict.get("FileSignature", "").strip(),
-            "last_modified": row_dict.get("LastWriteTime", "")
-            or row_dict.get("CreationTime", ""),
+            "last_modified": last_modified,
+            "last_modified_ts": parse_timestamp_to_epoch(last_modified),
+            "creation_time_ts": parse_timestamp_to_epoch(creation_time),
         }
 
     def transform_metadata(self, row: "pd.Series") -> Dict[str, Any]:
@@ -483,6 +727,8 @@ class CSVParser:
                     data["file_attributes"],
                     data["file_signature"],
                     data["last_modified"],
+                    data["last_modified_ts"],
+                    data["creation_time_ts"],
                 )
             )
 
@@ -499,8 +745,8 @@ class CSVParser:
                     readable, writeable, deletable, directory_type,
                     base, path, file_size, owner, fast_hash,
                     access_time, file_attributes, file_signature,
-                    last_modified
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    last_modified, last_modified_ts, creation_time_ts
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 insert_data,
             )
@@ -620,8 +866,8 @@ class CSVParser:
                                 readable, writeable, deletable, directory_type,
                                 base, path, file_size, owner, fast_hash,
                                 access_time, file_attributes, file_signature,
-                                last_modified
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                last_modified, last_modified_ts, creation_time_ts
+                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                             """,
                             (
                                 data["name"],
@@ -645,6 +891,8 @@ class CSVParser:
                                 data["file_attributes"],
                                 data["file_signature"],
                                 data["last_modified"],
+                                data["last_modified_ts"],
+                                data["creation_time_ts"],
                             ),
                         )
                         imported_files += 1
@@ -656,6 +904,9 @@ class CSVParser:
 
                 conn.commit()
 
+            refresh_duplicate_stats(conn)
+            refresh_user_category_files(conn)
+
         finally:
             conn.close()
 
@@ -720,8 +971,8 @@ class CSVParser:
                                     readable, writeable, deletable, directory_type,
                                     base, path, file_size, owner, fast_hash,
                                     access_time, file_attributes, file_signature,
-                                    last_modified
-                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                    last_modified, last_modified_ts, creation_time_ts
+                                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                                 """,
                                 (
                                     data["name"],
@@ -745,6 +996,8 @@ class CSVParser:
                                     data["file_attributes"],
                                     data["file_signature"],
                                     data["last_modified"],
+                                    data["last_modified_ts"],
+                                    data["creation_time_ts"],
                                 ),
                             )
                             conn.execute("COMMIT")
@@ -753,6 +1006,8 @@ class CSVParser:
                             conn.execute("ROLLBACK")
                             validation_stats["invalid_rows"] += 1
 
+            refresh_duplicate_stats(conn)
+            refresh_user_category_files(conn)
             conn.execute("PRAGMA synchronous = NORMAL")
             conn.execute("PRAGMA optimize")
 
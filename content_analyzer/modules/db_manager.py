@@ -13,13 +13,34 @@ from .sql_optimizer import SQLQueryOptimizer
 
 logger = logging.getLogger(__name__)
 
+# Réglages de lecture appliqués à chaque connexion du pool (drill-downs, analytics):
+# cache de pages 64 MiB, lecture mmap 256 MiB, tris temporaires en mémoire
+# journal_mode n'est fixé ni ici ni par les viewers GUI: l'import CSV
+# bascule sa connexion en journal MEMORY avec verrou EXCLUSIVE
+CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Index remplacés par un index plus large (ancien -> remplaçant), supprimés des
+# bases existantes une fois le remplaçant créé
+SUPERSEDED_INDEXES = (
+    ("idx_fichier_id", "idx_reponses_fichier_cached"),
+    ("idx_fichiers_active_size", "idx_fichiers_active_size_ts"),
+    ("idx_fichiers_size_dates", "idx_fichiers_active_size_ts"),
+    ("idx_size_analysis", "idx_fichiers_active_size_ts"),
+)
+
 
 class DBManager:
     """Gestionnaire SQLite pour stocker les analyses."""
 
     def __init__(self, db_path: Path) -> None:
         self.db_path = db_path
-        self._pool = SQLiteConnectionPool(db_path, pool_size=5)
+        self._pool = SQLiteConnectionPool(
+            db_path, pool_size=5, pragmas=CONNECTION_PRAGMAS
+        )
         self._ensure_schema()
         self._maintenance_timer: Optional[Timer] = None
         # Schedule periodic maintenance without blocking
@@ -198,18 +219,64 @@ class DBManager:
                 "CREATE INDEX IF NOT EXISTS idx_user_analytics ON fichiers(owner, file_size, status) WHERE owner IS NOT NULL",
                 "idx_user_analytics",
             ),
+            # Drill-down utilisateur paginé: ordre (taille, rowid) lu dans l'index
+            (
+                "CREATE INDEX IF NOT EXISTS idx_user_files_order ON fichiers(owner, file_size) WHERE owner IS NOT NULL",
+                "idx_user_files_order",
+            ),
+            (
+                "CREATE INDEX IF NOT EXISTS idx_name_size_duplicates ON fichiers(name, file_size)",
+                "idx_name_size_duplicates",
+            ),
+            # Filtres des modales drill-down: niveau + jointure sans relire la table
+            (
+                "CREATE INDEX IF NOT EXISTS idx_reponses_class_fichier ON reponses_llm(security_classification_cached, fichier_id)",
+                "idx_reponses_class_fichier",
+            ),
+            (
+                "CREATE INDEX IF NOT EXISTS idx_reponses_rgpd_fichier ON reponses_llm(rgpd_risk_cached, fichier_id)",
+                "idx_reponses_rgpd_fichier",
+            ),
+            # Filtres temporels des modales sur les dates normalisées (epoch)
+            (
+                "CREATE INDEX IF NOT EXISTS idx_fichiers_lm_ts ON fichiers(last_modified_ts)",
+                "idx_fichiers_lm_ts",
+            ),
+            (
+                "CREATE INDEX IF NOT EXISTS idx_fichiers_ct_ts ON fichiers(creation_time_ts)",
+                "idx_fichiers_ct_ts",
+            ),
+            # Fichiers actifs par taille: le filtre statut/taille des modales est
+            # garanti par l'index, les dates de la modale temporelle y sont lues
+            (
+                "CREATE INDEX IF NOT EXISTS idx_fichiers_active_size_ts ON fichiers(file_size, last_modified_ts, creation_time_ts) WHERE (status IS NULL OR status != 'error') AND file_size > 0",
+                "idx_fichiers_active_size_ts",
+            ),
+            # Jointure f.id = r.fichier_id couvrante: les colonnes *_cached lues dans l'index
+            (
+                "CREATE INDEX IF NOT EXISTS idx_reponses_fichier_cached ON reponses_llm(fichier_id, security_classification_cached, rgpd_risk_cached, legal_type_cached, finance_type_cached)",
+                "idx_reponses_fichier_cached",
+            ),
+            (
+                "CREATE INDEX IF NOT EXISTS idx_fichiers_lastmod ON fichiers(last_modified)",
+                "idx_fichiers_lastmod",
+            ),
+            (
+                "CREATE INDEX IF NOT EXISTS idx_fichiers_ctime ON fichiers(creation_time)",
+                "idx_fichiers_ctime",
+            ),
         ]
 
         specialized_indexes = SQLQueryOptimizer.get_specialized_index_definitions()
 
-        for sql, name in critical_indexes:
-            self._create_index_safely(conn, sql, name)
+        created = set()
+        for sql, name in critical_indexes + performance_indexes + specialized_indexes:
+            if self._create_index_safely(conn, sql, name):
+                created.add(name)
 
-        for sql, name in performance_indexes:
-            self._create_index_safely(conn, sql, name)
-
-        for sql, name in specialized_indexes:
-            self._create_index_safely(conn, sql, name)
+        for obsolete, replacement in SUPERSEDED_INDEXES:
+            if replacement in created:
+                conn.execute(f"DROP INDEX IF EXISTS {obsolete}")
 
     def _ensure_schema(self) -> None:
         with self._connect().get() as conn:
@@ -232,9 +299,6 @@ class DBManager:
                 )
                 """
             )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_fichier_id ON reponses_llm(fichier_id)"
-            )
             cursor.execute(
                 "CREATE INDEX IF NOT EXISTS idx_task_id ON reponses_llm(task_id)"
             )
@@ -508,9 +572,9 @@ class DBManager:
             existing_indexes = {row[0] for row in cursor.fetchall()}
 
             expected_indexes = {
-                'idx_status', 'idx_fichier_id', 'idx_gui_status_priority',
+                'idx_status', 'idx_reponses_fichier_cached', 'idx_gui_status_priority',
                 'idx_fast_hash_duplicates', 'idx_duplicate_detection_enhanced',
-                'idx_gui_analytics_composite', 'idx_age_analysis', 'idx_size_analysis'
+                'idx_gui_analytics_composite', 'idx_age_analysis'
             }
 
             missing = expected_indexes - existing_indexes
@@ -119,10 +119,6 @@ class SQLQueryOptimizer:
                 "CREATE INDEX IF NOT EXISTS idx_age_analysis ON fichiers(last_modified, creation_time) WHERE status='completed'",
                 "idx_age_analysis",
             ),
-            (
-                "CREATE INDEX IF NOT EXISTS idx_size_analysis ON fichiers(file_size, extension) WHERE file_size > 0",
-                "idx_size_analysis",
-            ),
         ]
 
     # ------------------------------------------------------------------
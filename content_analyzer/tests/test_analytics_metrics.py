@@ -0,0 +1,730 @@
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+import types
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from content_analyzer.modules.csv_parser import backfill_timestamp_columns
+from content_analyzer.modules.db_manager import DBManager
+from content_analyzer.modules.duplicate_detector import DuplicateDetector, FileInfo
+from gui.analytics_panel import AnalyticsPanel, _parse_date_cached
+
+
+def test_parse_date_cached_formats():
+    _parse_date_cached.cache_clear()
+    assert _parse_date_cached("2024-01-02 03:04:05") == datetime(2024, 1, 2, 3, 4, 5)
+    assert _parse_date_cached("02/01/2024") == datetime(2024, 1, 2)
+    assert _parse_date_cached("2024-01-02T03:04:05Z") == datetime(2024, 1, 2, 3, 4, 5)
+    assert _parse_date_cached("2024-01-02") == datetime(2024, 1, 2)
+    assert _parse_date_cached("2024-13-02 03:04:05") is None
+    assert _parse_date_cached("0") is None
+    assert _parse_date_cached("not a date") is None
+
+    _parse_date_cached("2024-01-02 03:04:05")
+    assert _parse_date_cached.cache_info().hits >= 1
+
+
+def _make_panel(db_manager=None) -> AnalyticsPanel:
+    panel = AnalyticsPanel.__new__(AnalyticsPanel)
+    panel.db_manager = db_manager
+    panel._last_label_text = {}
+    panel._label_prefix = {}
+    panel._top_users_sig = {}
+    return panel
+
+
+def _setup_db(path: Path) -> DBManager:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "fast_hash TEXT, file_size INTEGER, creation_time TEXT, last_modified TEXT, "
+        "owner TEXT, status TEXT, priority_score INTEGER, exclusion_reason TEXT)"
+    )
+    conn.commit()
+    conn.close()
+    return DBManager(path)
+
+
+def test_size_analysis_sql_matches_python(tmp_path):
+    db = _setup_db(tmp_path / "test.db")
+    mb = 1024 * 1024
+    sizes = [0, 10 * mb, 50 * mb, 120 * mb, 499 * mb, 500 * mb, 900 * mb]
+    with db._connect().get() as conn:
+        conn.executemany(
+            "INSERT INTO fichiers (id, path, file_size, status) VALUES (?, ?, ?, 'completed')",
+            [(i, f"/f{i}", s) for i, s in enumerate(sizes, 1)],
+        )
+        conn.execute(
+            "INSERT INTO fichiers (id, path, file_size, status) VALUES (99, '/err', 1, 'error')"
+        )
+        conn.commit()
+
+    panel = _make_panel(db)
+    sql_dist = panel._calculate_size_analysis_sql()
+    files = [FileInfo(id=i, path=f"/f{i}", fast_hash=None, file_size=s) for i, s in enumerate(sizes, 1)]
+    py_dist = panel._calculate_file_size_metrics(files)
+    db.close()
+
+    assert sql_dist == py_dist
+    assert py_dist["<50MB"]["count"] == 2
+    assert py_dist["50-100MB"]["count"] == 1
+    assert py_dist[">500MB"]["count"] == 2
+
+
+def test_classification_metrics_single_pass():
+    files = [
+        FileInfo(id=1, path="/a", fast_hash=None, file_size=10),
+        FileInfo(id=2, path="/b", fast_hash=None, file_size=20),
+        FileInfo(id=3, path="/c", fast_hash=None, file_size=30),
+        FileInfo(id=4, path="/d", fast_hash=None, file_size=40),
+    ]
+    class_map = {1: "C3", 2: "C3", 3: "C1"}
+    rgpd_map = {1: "critical", 3: "critical", 4: "low"}
+    metrics = _make_panel()._calculate_classification_metrics(files, class_map, rgpd_map)
+    assert metrics["super_critical"]["count"] == 1
+    assert metrics["critical"]["count"] == 2
+    assert metrics["critical"]["percentage"] == 50.0
+    assert metrics["critical"]["size_gb"] == 50 / (1024**3)
+
+
+def test_top_users_single_pass():
+    big = 200 * 1024 * 1024
+    files = [
+        FileInfo(id=1, path="/a", fast_hash=None, file_size=big, owner="alice"),
+        FileInfo(id=2, path="/b", fast_hash=None, file_size=big * 2, owner="bob"),
+        FileInfo(id=3, path="/c", fast_hash=None, file_size=10, owner="alice"),
+        FileInfo(id=4, path="/d", fast_hash=None, file_size=big, owner="  "),
+    ]
+    class_map = {1: "C3", 3: "C3", 4: "C3"}
+    rgpd_map = {2: "critical"}
+    result = _make_panel()._calculate_top_users_metrics_safe(files, class_map, rgpd_map)
+    assert [u["owner"] for u in result["top_large_files"]] == ["bob", "alice"]
+    assert result["top_c3_files"] == [
+        {"owner": "alice", "count": 2, "total_size": big + 10}
+    ]
+    assert result["top_rgpd_critical"][0]["owner"] == "bob"
+
+
+def test_temporal_analysis_sql_matches_python(tmp_path):
+    db = _setup_db(tmp_path / "test.db")
+    now = datetime.now()
+    fmt = "%d/%m/%Y %H:%M:%S"
+    dates = [now - timedelta(days=d) for d in (10, 400, 800, 1500, 3000)]
+    rows = [
+        (i, f"/f{i}", 1024 * i, d.strftime(fmt), d.strftime(fmt), "completed")
+        for i, d in enumerate(dates, 1)
+    ]
+    with db._connect().get() as conn:
+        conn.executemany(
+            "INSERT INTO fichiers (id, path, file_size, last_modified, creation_time, status) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+
+    panel = _make_panel(db)
+    legacy = panel._calculate_temporal_analysis()
+
+    with db._connect().get() as conn:
+        conn.execute("ALTER TABLE fichiers ADD COLUMN last_modified_ts INTEGER")
+        conn.execute("ALTER TABLE fichiers ADD COLUMN creation_time_ts INTEGER")
+        backfill_timestamp_columns(conn)  # migration du schéma à l'import
+        conn.commit()
+    migrated = panel._calculate_temporal_analysis()
+    with db._connect().get() as conn:
+        missing = conn.execute(
+            "SELECT COUNT(*) FROM fichiers WHERE last_modified_ts IS NULL"
+        ).fetchone()[0]
+    db.close()
+
+    assert missing == 0
+    assert migrated == legacy
+    assert migrated["modification_dates"]["0_1y"]["count"] == 1
+    assert migrated["modification_dates"]["6plus"]["count"] == 1
+
+
+def test_temporal_metrics_streaming_buckets():
+    now = datetime.now()
+    fmt = "%Y-%m-%d %H:%M:%S"
+    rows = iter(
+        [
+            ((now - timedelta(days=d)).strftime(fmt), None, 100, 1, 0)
+            for d in (5, 370, 370, 2500)
+        ]
+    )
+    result = _make_panel()._calculate_temporal_metrics_streaming(rows)
+    metrics = result["modification_dates"]
+    assert metrics["0_1y"]["count"] == 1
+    assert metrics["1_2y"] == {"count": 2, "percentage": 50.0, "size_gb": 200 / (1024**3)}
+    assert metrics["6plus"]["count"] == 1
+    assert metrics["3_4y"]["percentage"] == 0.0
+    assert all(v["count"] == 0 for v in result["creation_dates"].values())
+
+
+def test_user_preferences_cached_by_mtime(tmp_path):
+    prefs_file = tmp_path / "user_prefs.json"
+    prefs_file.write_text('{"age_years": "3"}', encoding="utf-8")
+    panel = _make_panel()
+    panel._prefs_cache = None
+
+    first = panel._read_user_preferences(prefs_file)
+    assert panel._read_user_preferences(prefs_file) is first
+
+    prefs_file.write_text('{"age_years": "5"}', encoding="utf-8")
+    mtime = prefs_file.stat().st_mtime + 10
+    os.utime(prefs_file, (mtime, mtime))
+    assert panel._read_user_preferences(prefs_file)["age_years"] == "5"
+
+
+def test_duplicates_analysis_on_seeded_data(tmp_path):
+    db = _setup_db(tmp_path / "test.db")
+    rows = [
+        (1, "report.pdf", "/a/report.pdf", 100),
+        (2, "report.pdf", "/b/report.pdf", 100),
+        (3, "report.pdf", "/c/report.pdf", 100),
+        (4, "report.pdf", "/d/report.pdf", 999),
+        (5, "unique.txt", "/a/unique.txt", 10),
+    ]
+    with db._connect().get() as conn:
+        conn.executemany(
+            "INSERT INTO fichiers (id, name, path, file_size, status) "
+            "VALUES (?, ?, ?, ?, 'completed')",
+            rows,
+        )
+        conn.commit()
+
+    result = _make_panel(db)._calculate_duplicates_analysis()
+    db.close()
+
+    assert result["duplicate_groups"] == 1
+    assert result["total_duplicates"] == 2
+    assert result["duplicates_by_count"] == {3: ["report.pdf"]}
+    assert result["wasted_space_gb"] == 200 / (1024**3)
+
+
+def test_temporal_streaming_mixed_formats_and_chunks():
+    now = datetime.now()
+    rows = [
+        ((now - timedelta(days=3)).strftime("%d/%m/%Y %H:%M:%S"), "0", 10, 1, 0),
+        ((now - timedelta(days=800)).strftime("%Y-%m-%dT%H:%M:%S"), "", 20, 1, 0),
+        (str((now - timedelta(days=400)).timestamp()), None, 30, 1, 0),
+        ("01/01/0001 00:00:00", None, 40, 1, 0),
+        ("garbage", None, 50, 1, 0),
+        ((now + timedelta(days=30)).strftime("%Y-%m-%d"), None, 60, 1, 0),
+    ]
+    panel = _make_panel()
+    panel.TEMPORAL_CHUNK_SIZE = 2
+    metrics = panel._calculate_temporal_metrics_streaming(rows)["modification_dates"]
+    assert metrics["0_1y"]["count"] == 1
+    assert metrics["1_2y"]["count"] == 1
+    assert metrics["2_3y"]["count"] == 1
+    assert metrics["6plus"]["count"] == 1
+    # 5 dates valides (dont une future, hors tranche)
+    assert metrics["0_1y"]["percentage"] == 20.0
+
+
+def test_cached_analysis_reused_until_revision_changes(tmp_path):
+    db = _setup_db(tmp_path / "test.db")
+    with db._connect().get() as conn:
+        conn.execute("INSERT INTO fichiers (id, path, file_size) VALUES (1, '/a', 1)")
+        conn.commit()
+    panel = _make_panel(db)
+    panel._analysis_cache = {}
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    assert panel._cached_analysis("size", compute) == {"value": 1}
+    assert panel._cached_analysis("size", compute) == {"value": 1}
+
+    with db._connect().get() as conn:
+        conn.execute("UPDATE fichiers SET status = 'error' WHERE id = 1")
+        conn.commit()
+    assert panel._cached_analysis("size", compute) == {"value": 2}
+    db.close()
+
+
+def test_cached_analysis_skips_fallback_results(tmp_path):
+    from gui.analytics_panel import _AnalysisFallback
+
+    db = _setup_db(tmp_path / "test.db")
+    panel = _make_panel(db)
+    panel._analysis_cache = {}
+    results = [_AnalysisFallback(size_distribution={}), {"size_distribution": {"x": 1}}]
+    assert panel._cached_analysis("size", lambda: results.pop(0)) == {"size_distribution": {}}
+    assert "size" not in panel._analysis_cache
+    assert panel._cached_analysis("size", lambda: results.pop(0)) == {
+        "size_distribution": {"x": 1}
+    }
+    assert panel._cached_analysis("size", lambda: results.pop(0)) == {
+        "size_distribution": {"x": 1}
+    }
+    db.close()
+
+
+def test_global_metrics_totals():
+    mb = 1024 * 1024
+    files = [
+        FileInfo(id=i, path=f"/f{i}", fast_hash=None, file_size=s)
+        for i, s in enumerate([mb, 60 * mb, 600 * mb], 1)
+    ]
+    panel = _make_panel()
+    assert panel._calculate_global_metrics(files) == {
+        "total_files": 3,
+        "total_size_gb": 661 * mb / (1024**3),
+    }
+    size_metrics = panel._calculate_file_size_metrics(files)
+    assert [size_metrics[k]["count"] for k in ("<50MB", "50-100MB", ">500MB")] == [1, 1, 1]
+
+
+def test_files_context_reused_per_data_version(monkeypatch):
+    panel = _make_panel()
+    panel._data_version = 0
+    panel._files_context_cache = None
+    panel._metrics_cache = {}
+    panel.duplicate_detector = DuplicateDetector()
+    calls = []
+
+    def fake_files():
+        calls.append(1)
+        return [FileInfo(id=1, path="/a", fast_hash="h", file_size=1)]
+
+    monkeypatch.setattr(panel, "_connect_files", fake_files)
+    monkeypatch.setattr(panel, "_get_all_maps", lambda: ({}, {}, {}))
+
+    first = panel._get_files_context()
+    assert panel._get_files_context() is first
+    panel._invalidate_cache()
+    assert panel._get_files_context() is not first
+    assert len(calls) == 2
+
+
+def test_all_maps_single_join_cached_per_data_version(tmp_path):
+    db = _setup_db(tmp_path / "maps.db")
+    with db._connect().get() as conn:
+        conn.executemany(
+            "INSERT INTO fichiers (id, path, file_size) VALUES (?, ?, 1)",
+            [(1, "/a"), (2, "/b")],
+        )
+        conn.execute(
+            "INSERT INTO reponses_llm (fichier_id, task_id, security_analysis, rgpd_analysis, "
+            "legal_analysis) VALUES (1, 't', ?, ?, ?)",
+            (
+                '{"classification": "C3"}',
+                '{"risk_level": "critical"}',
+                '{"contract_type": "nda"}',
+            ),
+        )
+        conn.commit()
+    panel = _make_panel(db)
+    panel._data_version = 0
+    panel._maps_cache = None
+    maps = panel._get_all_maps()
+    assert maps == ({1: "C3", 2: ""}, {1: "critical", 2: "none"}, {1: "nda", 2: "none"})
+    assert panel._get_rgpd_map() is maps[1]
+    assert panel._get_all_maps() is maps
+    panel._metrics_cache = {}
+    panel._invalidate_cache()
+    assert panel._get_all_maps() is not maps
+
+
+def test_metrics_core_classifies_each_file_once():
+    from content_analyzer.modules.age_analyzer import AgeAnalyzer
+    from content_analyzer.modules.size_analyzer import SizeAnalyzer
+
+    panel = _make_panel(db_manager=object())
+    files = [FileInfo(id=i, path=f"/f{i}", fast_hash=None, file_size=10) for i in range(1, 5)]
+    panel._connect_files = lambda: files
+    panel.threshold_age_years = types.SimpleNamespace(get=lambda: "2")
+    panel.threshold_size_mb = types.SimpleNamespace(get=lambda: "100")
+    panel.classification_filter = types.SimpleNamespace(get=lambda: "Tous")
+    panel.age_analyzer = AgeAnalyzer()
+    panel.size_analyzer = SizeAnalyzer()
+    panel.duplicate_detector = DuplicateDetector()
+    panel._get_all_maps = lambda: (
+        {1: "C3", 2: "C3"},
+        {1: "critical"},
+        {1: "nda", 3: "litigation"},
+    )
+    panel._calculate_size_age_direct_sql = lambda size_mb, age_days: {}
+    metrics = panel._calculate_metrics_core()
+    assert metrics["super_critical"]["count"] == 1
+    assert metrics["critical"]["count"] == 2
+    assert metrics["critical"]["size_gb"] == 20 / (1024**3)
+
+
+def test_file_buckets_single_pass():
+    panel = _make_panel()
+    panel._data_version = 0
+    panel._file_buckets = None
+    files = [FileInfo(id=i, path=f"/f{i}", fast_hash=None, file_size=1) for i in range(1, 5)]
+    files_ctx = {
+        "files": files,
+        "class_map": {1: "C3", 2: "C3"},
+        "rgpd_map": {1: "critical"},
+        "legal_map": {1: "nda", 3: "litigation"},
+    }
+    buckets = panel._get_file_buckets(files_ctx)
+    assert [f.id for f in buckets["super_critical"]] == [1]
+    assert [f.id for f in buckets["critical"]] == [2, 3]
+    assert panel._get_file_buckets(files_ctx) is buckets
+
+
+def test_duplicate_files_computed_once_per_context(monkeypatch):
+    panel = _make_panel()
+    panel.duplicate_detector = DuplicateDetector()
+    files = [FileInfo(id=i, path=f"/f{i}", fast_hash="h", file_size=1) for i in (1, 2)]
+    calls = []
+
+    def fake_detect(items):
+        calls.append(1)
+        return {"h_1": list(items)}
+
+    monkeypatch.setattr(panel.duplicate_detector, "detect_duplicate_family", fake_detect)
+    files_ctx = {"files": files}
+    assert panel._get_duplicate_files(files_ctx) == files
+    assert panel._get_duplicate_files(files_ctx) is files_ctx["duplicates"]
+    assert len(calls) == 1
+
+
+def test_query_distributions_bulk(tmp_path):
+    db = _setup_db(tmp_path / "test.db")
+    with db._connect().get() as conn:
+        conn.executemany(
+            "INSERT INTO fichiers (id, path, file_size) VALUES (?, ?, ?)",
+            [(1, "/a", 10), (2, "/b", 20), (3, "/c", 30)],
+        )
+        # Les colonnes *_cached sont remplies par le trigger de dénormalisation
+        conn.executemany(
+            "INSERT INTO reponses_llm (fichier_id, task_id, security_analysis, rgpd_analysis) "
+            "VALUES (?, 't', ?, ?)",
+            [
+                (1, '{"classification": "C3"}', '{"risk_level": "critical"}'),
+                (2, '{"classification": "C1"}', "{}"),
+            ],
+        )
+        conn.commit()
+    dists = _make_panel(db)._query_distributions_bulk(
+        ["security_classification_cached", "rgpd_risk_cached"]
+    )
+    db.close()
+    assert dists["security_classification_cached"]["C3"] == {"count": 1, "size": 10}
+    assert dists["security_classification_cached"]["none"] == {"count": 1, "size": 30}
+    assert dists["rgpd_risk_cached"]["none"] == {"count": 2, "size": 50}
+
+
+class _FakeLabel:
+    def __init__(self):
+        self.text = None
+
+    def config(self, text=None, **_kwargs):
+        self.text = text
+        self.writes = getattr(self, "writes", 0) + 1
+
+    configure = config
+
+
+def test_update_dist_labels_single_pass():
+    from gui.analytics_panel import SEC_LEVELS
+
+    labels = {key: _FakeLabel() for key in list(SEC_LEVELS) + ["Autres"]}
+    gib = 1024**3
+    dist = {
+        "C3": {"count": 1, "size": gib},
+        "none": {"count": 2, "size": gib},
+        "weird": {"count": 1, "size": gib},
+    }
+    _make_panel()._update_dist_labels(labels, dist, SEC_LEVELS)
+    assert labels["C3"].text == "C3: 25.0% | 1 fichiers | 1.0GB"
+    assert labels["C0"].text == "C0: 0.0% | 0 fichiers | 0.0GB"
+    assert labels["Autres"].text == "Autres: 75.0% | 3 fichiers | 2.0GB"
+
+
+class _FakeVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def test_business_metrics_memoized_per_data_version(monkeypatch):
+    panel = _make_panel()
+    panel._data_version = 0
+    panel._metrics_cache = {}
+    panel._cache_timestamp = 0.0
+    panel.CACHE_DURATION = 30
+    panel._recommendations_cache = None
+    panel.threshold_age_years = _FakeVar("2")
+    panel.threshold_size_mb = _FakeVar("100")
+    calls = []
+
+    def fake_schema():
+        calls.append(1)
+        return False
+
+    monkeypatch.setattr(panel, "_validate_database_schema", fake_schema)
+    monkeypatch.setattr(panel, "_get_empty_metrics", lambda: {"global": {}})
+    # le chemin "schéma invalide" n'est pas mémorisé
+    panel.calculate_business_metrics()
+    panel.calculate_business_metrics()
+    assert len(calls) == 2
+
+    metrics = {"global": {"total_files": 1}}
+    panel._metrics_cache["business_metrics_2_100"] = (0, time.time(), metrics)
+    assert panel.calculate_business_metrics() is metrics
+    panel._invalidate_cache()
+    assert panel.calculate_business_metrics() is not metrics
+
+    text = panel.generate_recommendations(metrics)
+    monkeypatch.setattr(panel, "_build_recommendations", lambda m: "other")
+    assert panel.generate_recommendations(metrics) is text
+    assert panel.generate_recommendations({"global": {}}) == "other"
+
+
+def test_recommendations_from_partial_metrics():
+    panel = _make_panel()
+    assert panel._build_recommendations({}).startswith("✅")
+    # base vide: aucune autre métrique n'est examinée
+    assert panel._build_recommendations(
+        {"global": {"total_files": 0}, "super_critical": {"count": 3}}
+    ).startswith("✅")
+    text = panel._build_recommendations(
+        {
+            "global": {"total_files": 10},
+            "super_critical": {"count": 3},
+            "duplicates": {"wasted_space_gb": 2.0},
+        }
+    )
+    assert "URGENT: 3" in text
+    assert "2.0GB" in text
+
+
+def test_flush_label_texts_skips_unchanged():
+    label = _FakeLabel()
+    panel = _make_panel()
+    panel._flush_label_texts({label: "a"})
+    panel._flush_label_texts({label: "a"})
+    assert label.text == "a"
+    assert label.writes == 1
+
+
+class _FakeParent:
+    def __init__(self):
+        self.scheduled = {}
+        self._next = 0
+
+    def after(self, _delay, func, *args):
+        self._next += 1
+        token = f"after#{self._next}"
+        self.scheduled[token] = (func, args)
+        return token
+
+    def after_cancel(self, token):
+        self.scheduled.pop(token, None)
+
+
+def test_refresh_all_debounced(monkeypatch):
+    panel = _make_panel()
+    panel.parent = _FakeParent()
+    panel._refresh_after = None
+    runs = []
+    monkeypatch.setattr(panel, "_do_refresh_all", lambda: runs.append(1))
+
+    for _ in range(3):
+        panel.refresh_all()
+    assert len(panel.parent.scheduled) == 1
+    for func, args in list(panel.parent.scheduled.values()):
+        func(*args)
+    assert runs == [1]
+
+
+def test_write_json_report_compact_for_large_volumes(tmp_path):
+    report = {"metrics": {"global": {"total_files": 2}}, "text": "é"}
+    small = tmp_path / "small.json"
+    large = tmp_path / "large.json"
+    AnalyticsPanel._write_json_report(str(small), report, 10)
+    AnalyticsPanel._write_json_report(
+        str(large), report, AnalyticsPanel.COMPACT_EXPORT_THRESHOLD
+    )
+    assert "\n" in small.read_text(encoding="utf-8")
+    assert large.read_text(encoding="utf-8") == (
+        '{"metrics":{"global":{"total_files":2}},"text":"é"}'
+    )
+
+
+def test_basic_metrics_single_group_by(tmp_path):
+    db = _setup_db(tmp_path / "test.db")
+    with db._connect().get() as conn:
+        conn.executemany(
+            "INSERT INTO fichiers (path, file_size, status) VALUES (?, ?, ?)",
+            [("/a", 10, "completed"), ("/b", 5, "completed"), ("/c", 1, "error")],
+        )
+        conn.commit()
+    metrics = _make_panel(db)._calculate_basic_metrics()
+    assert metrics["total_files"] == 3
+    assert metrics["completed_files"] == 2
+    assert metrics["error_files"] == 1
+    assert metrics["total_size"] == 16
+
+
+def test_temporal_display_uses_stored_prefix():
+    panel = _make_panel()
+    label = _FakeLabel()
+    panel.modification_labels = {"0_1y": label}
+    panel._label_prefix[label] = "Récent"
+    panel.update_temporal_analysis_display(
+        {"modification": {"0_1y": {"count": 2, "percentage": 50.0, "size_gb": 1.0}}}
+    )
+    assert label.text == "Récent: 50.0% | 2 fichiers | 1.0GB"
+
+
+def test_basic_metrics_sampled_on_large_tables(tmp_path):
+    db = _setup_db(tmp_path / "test.db")
+    with db._connect().get() as conn:
+        conn.executemany(
+            "INSERT INTO fichiers (path, file_size, status) VALUES (?, ?, ?)",
+            [(f"/f{i}", 10, "completed") for i in range(1, 101)],
+        )
+        conn.commit()
+    panel = _make_panel(db)
+    panel.RECOVERY_SAMPLE_THRESHOLD = 50
+    panel.RECOVERY_SAMPLE_SIZE = 25
+    metrics = panel._calculate_basic_metrics()
+    assert metrics["estimated"] is True
+    assert metrics["total_files"] == 100
+    assert metrics["total_size"] == 1000
+
+
+def test_criticality_predicates():
+    from gui.analytics_panel import is_any_critical, is_super_critical
+
+    assert is_super_critical("C3", "critical", "nda")
+    assert not is_super_critical("C3", "critical", "contract")
+    assert is_any_critical(None, None, "litigation")
+    assert not is_any_critical("C2", "low", None)
+
+
+def test_top_users_labels_skipped_when_unchanged():
+    panel = _make_panel()
+    panel.top_large_files_labels = {"rank_1": _FakeLabel(), "rank_2": _FakeLabel()}
+    metrics = {
+        "top_users": {
+            "top_large_files": [{"owner": "alice", "count": 3, "total_size": 1024**3}]
+        }
+    }
+    panel.update_extended_tabs(metrics)
+    label = panel.top_large_files_labels["rank_1"]
+    assert label.text == "#1: alice (3 fichiers, 1.0GB)"
+    assert panel.top_large_files_labels["rank_2"].text == "#2: -- (0 fichiers, 0GB)"
+    panel._last_label_text.clear()
+    panel.update_extended_tabs(metrics)
+    assert label.writes == 1
+
+
+def test_schema_validation_cached_only_after_success(tmp_path):
+    db = _setup_db(tmp_path / "schema.db")
+    panel = _make_panel(db)
+    # Table vide: l'échec n'est pas mémorisé
+    assert panel._validate_database_schema() is False
+    with db._connect().get() as conn:
+        conn.execute("INSERT INTO fichiers (path, status) VALUES ('/a', 'error')")
+        conn.commit()
+    assert panel._validate_database_schema() is False
+    with db._connect().get() as conn:
+        conn.execute("INSERT INTO fichiers (path, status) VALUES ('/b', NULL)")
+        conn.commit()
+    assert panel._validate_database_schema() is True
+
+    other = _make_panel(db)
+    calls = []
+    other._ensure_database_manager = lambda: True
+    other.db_manager = db
+    original = db._connect
+    db._connect = lambda: calls.append(1) or original()
+    assert other._validate_database_schema() is True
+    assert other._validate_connection_manager() is True
+    assert other._validate_connection_manager() is True
+    assert len(calls) == 1  # seule la première validation de connexion interroge SQLite
+    AnalyticsPanel._validation_cache[db]["schema"] -= AnalyticsPanel.VALIDATION_CACHE_TTL
+    assert other._validate_database_schema() is True
+    assert len(calls) == 2
+
+
+def test_validations_reuse_given_connection(tmp_path):
+    db = _setup_db(tmp_path / "reuse.db")
+    with db._connect().get() as conn:
+        conn.execute("INSERT INTO fichiers (path, status) VALUES ('/a', NULL)")
+        conn.commit()
+        panel = _make_panel(db)
+
+        def no_pool():
+            raise AssertionError("pool should not be used")
+
+        panel._ensure_database_manager = no_pool
+        original, db._connect = db._connect, no_pool
+        try:
+            assert panel._validate_connection_manager(conn) is True
+            assert panel._validate_database_schema(conn) is True
+        finally:
+            db._connect = original
+
+
+def test_root_frame_swapped_with_single_destroy(monkeypatch):
+    import gui.analytics_panel as module
+
+    class _Frame:
+        created = []
+
+        def __init__(self, parent):
+            self.parent, self.destroyed = parent, 0
+            _Frame.created.append(self)
+
+        def pack(self, **kw):
+            pass
+
+        def destroy(self):
+            self.destroyed += 1
+
+    monkeypatch.setattr(module.ttk, "Frame", _Frame)
+    panel = _make_panel()
+    panel.parent = "parent"
+    first = panel._reset_root_frame()
+    second = panel._reset_root_frame()
+    assert first.destroyed == 1 and second.destroyed == 0
+    assert panel._root_frame is second and second.parent == "parent"
+
+
+def test_duplicate_list_filled_by_polling_on_tk_thread():
+    import queue
+    from concurrent.futures import ThreadPoolExecutor
+
+    panel = _make_panel()
+    panel.duplicate_detector = DuplicateDetector()
+    scheduled = []
+    panel.parent = types.SimpleNamespace(after=lambda ms, func, *args: scheduled.append(args))
+    files = [FileInfo(id=i, path=f"/f{i}", fast_hash="h", file_size=1) for i in (1, 2)]
+    files_ctx = {"files": files}
+    listbox = types.SimpleNamespace(
+        paths_var=types.SimpleNamespace(set=lambda value: shown.append(value))
+    )
+    shown = []
+    result_queue = queue.Queue(maxsize=1)
+
+    panel._poll_dup_listbox(listbox, files_ctx, result_queue)
+    assert len(scheduled) == 1 and not shown  # pas encore de résultat: relevé reprogrammé
+    panel._duplicate_files_worker(files, result_queue)
+    assert "duplicates" not in files_ctx  # le worker ne touche pas au contexte
+    panel._poll_dup_listbox(listbox, files_ctx, result_queue)
+    assert shown == [("/f1", "/f2")]
+    assert files_ctx["duplicates"] == files
+
+    panel._executor = ThreadPoolExecutor(max_workers=1)
+    panel.close()
+    assert panel._executor._shutdown
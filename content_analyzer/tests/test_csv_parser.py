@@ -52,8 +52,18 @@ def test_parse_valid_csv(tmp_path):
     assert result["errors"] == []
     conn = sqlite3.connect(db_file)
     count = conn.execute("SELECT COUNT(*) FROM fichiers").fetchone()[0]
+    stats = conn.execute(
+        "SELECT file_size, copy_count FROM duplicate_stats"
+    ).fetchall()
+    user_files = conn.execute(
+        "SELECT category, COUNT(*), MIN(classif) FROM user_category_files "
+        "GROUP BY category"
+    ).fetchall()
     conn.close()
     assert count == 5
+    assert stats == [(100, 5)]
+    # Import seul (sans reponses_llm): seule la catégorie "all" est remplie
+    assert user_files == [("all", 5, "N/A")]
 
 
 def test_parse_invalid_format(tmp_path):
@@ -111,3 +121,41 @@ def test_parse_scan_local_mini(tmp_path):
     assert result["total_files"] == 63
     assert result["imported_files"] == 63
     assert result["errors"] == []
+
+
+def test_parse_timestamp_to_epoch():
+    from datetime import datetime
+    from content_analyzer.modules.csv_parser import parse_timestamp_to_epoch
+
+    expected = int(datetime(2024, 7, 24, 3, 22, 15).timestamp())
+    assert parse_timestamp_to_epoch("24/07/2024 03:22:15") == expected
+    assert parse_timestamp_to_epoch("01/01/0001 00:00:00") is None
+    assert parse_timestamp_to_epoch("") is None
+
+
+def test_schema_migration_backfills_timestamps_once(tmp_path):
+    from content_analyzer.modules.csv_parser import parse_timestamp_to_epoch
+
+    conn = sqlite3.connect(tmp_path / "old.db")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+        "path TEXT UNIQUE NOT NULL, file_size INTEGER NOT NULL, "
+        "last_modified TEXT NOT NULL, creation_time TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO fichiers (name, path, file_size, last_modified, creation_time) "
+        "VALUES (?, ?, 1, ?, ?)",
+        [("a", "/a", "24/07/2024 03:22:15", "01/01/0001 00:00:00")],
+    )
+    statements = []
+    conn.set_trace_callback(statements.append)
+    parser = CSVParser(CONFIG_PATH)
+    parser._ensure_schema(conn)
+    assert conn.execute(
+        "SELECT last_modified_ts, creation_time_ts FROM fichiers"
+    ).fetchone() == (parse_timestamp_to_epoch("24/07/2024 03:22:15"), None)
+    # Colonnes déjà présentes: la date illisible n'est plus relue
+    statements.clear()
+    parser._ensure_schema(conn)
+    assert not any("UPDATE fichiers" in q for q in statements)
+    conn.close()
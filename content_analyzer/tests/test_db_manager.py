@@ -6,8 +6,19 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
+from content_analyzer.modules.csv_parser import CSVParser
 from content_analyzer.modules.db_manager import DBManager
 
+CONFIG_PATH = Path(__file__).resolve().parents[1] / "config" / "analyzer_config.yaml"
+
+
+def setup_full_db(path: Path) -> DBManager:
+    """Base avec le schéma ``fichiers`` réel (CSVParser) puis les tables DBManager."""
+    conn = sqlite3.connect(path)
+    CSVParser(CONFIG_PATH)._ensure_schema(conn)
+    conn.close()
+    return DBManager(path)
+
 
 def setup_db(path: Path) -> DBManager:
     conn = sqlite3.connect(path)
@@ -237,3 +248,138 @@ def test_connection_pool_exhaustion(tmp_path):
     count = conn.execute("SELECT COUNT(*) FROM fichiers WHERE status='completed'").fetchone()[0]
     conn.close()
     assert count == 7
+
+
+def test_drill_down_filter_indexes(tmp_path):
+    db_file = tmp_path / "idx.db"
+    setup_full_db(db_file)
+    conn = sqlite3.connect(db_file)
+    names = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    }
+    plan = " ".join(
+        str(row[-1])
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM fichiers WHERE creation_time >= ?",
+            ("2024-01-01",),
+        )
+    )
+    conn.close()
+    assert {
+        "idx_reponses_class_fichier",
+        "idx_reponses_rgpd_fichier",
+        "idx_fichiers_lastmod",
+        "idx_fichiers_ctime",
+    } <= names
+    assert "USING" in plan and "INDEX" in plan
+
+
+def test_reponses_join_uses_covering_index(tmp_path):
+    db_file = tmp_path / "cov.db"
+    setup_full_db(db_file)
+    conn = sqlite3.connect(db_file)
+    plan = " ".join(
+        str(row[-1])
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT f.id, r.security_classification_cached, "
+            "r.legal_type_cached FROM fichiers f "
+            "LEFT JOIN reponses_llm r ON f.id = r.fichier_id"
+        )
+    )
+    conn.close()
+    assert "COVERING INDEX idx_reponses_fichier_cached" in plan
+
+
+def test_temporal_modal_query_avoids_sort(tmp_path):
+    from gui.analytics_panel import _TEMPORAL_TS_SQL
+
+    db_file = tmp_path / "temporal.db"
+    setup_full_db(db_file)
+    conn = sqlite3.connect(db_file)
+    plan = " ".join(
+        str(row[-1])
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + _TEMPORAL_TS_SQL[("modification", True, True)] + " LIMIT 10",
+            (0, 1, 0, 1, 10, 10, 5),
+        )
+    )
+    conn.close()
+    assert "USING INDEX idx_fichiers_" in plan
+    assert "TEMP B-TREE FOR ORDER BY" not in plan
+
+
+def test_modal_queries_use_active_files_partial_index(tmp_path):
+    from gui.analytics_panel import _DOC_TYPE_SQL, _MODAL_SQL
+
+    db_file = tmp_path / "active.db"
+    setup_full_db(db_file)
+    conn = sqlite3.connect(db_file)
+    # INDEXED BY échoue si le WHERE de la requête n'implique pas celui de l'index
+    for query, params in (
+        (_MODAL_SQL[("security", "C2", True)][0], ("C2",)),
+        (_DOC_TYPE_SQL[("finance", "exact")], ("invoice",)),
+    ):
+        query = query.replace(
+            "FROM fichiers f", "FROM fichiers f INDEXED BY idx_fichiers_active_size_ts"
+        )
+        plan = " ".join(
+            str(row[-1]) for row in conn.execute("EXPLAIN QUERY PLAN " + query, params)
+        )
+        assert "idx_fichiers_active_size_ts" in plan
+    conn.close()
+
+
+def test_user_drill_down_queries_search_owner_index(tmp_path):
+    from gui.analytics_panel import _USER_FILES_SQL
+
+    db_file = tmp_path / "owner.db"
+    setup_full_db(db_file)
+    conn = sqlite3.connect(db_file)
+    for query, params in _USER_FILES_SQL.values():
+        plan = " ".join(
+            str(row[-1])
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN " + query, ("bob", *params, 5000, 0)
+            )
+        )
+        # owner = ? implique owner IS NOT NULL: l'index partiel fournit l'ordre (taille, id)
+        assert "USING INDEX idx_user_files_order (owner=?" in plan
+        assert "COVERING INDEX idx_reponses_fichier_cached" in plan
+        assert "TEMP B-TREE FOR ORDER BY" not in plan
+    conn.close()
+
+
+def test_pooled_connections_get_read_pragmas(tmp_path):
+    db = DBManager(tmp_path / "pragmas.db")
+    for _ in range(2):
+        with db._connect().get() as conn:
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+
+def test_superseded_indexes_dropped_once_replaced(tmp_path):
+    db_file = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, file_size INTEGER, status TEXT, "
+        "extension TEXT, last_modified_ts INTEGER, creation_time_ts INTEGER)"
+    )
+    conn.execute("CREATE INDEX idx_size_analysis ON fichiers(file_size, extension)")
+    conn.execute("CREATE INDEX idx_fichiers_active_size ON fichiers(file_size)")
+    conn.commit()
+    conn.close()
+    DBManager(db_file)
+    conn = sqlite3.connect(db_file)
+    names = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    }
+    conn.close()
+    assert {"idx_reponses_fichier_cached", "idx_fichiers_active_size_ts"} <= names
+    assert not names & {
+        "idx_fichier_id",
+        "idx_fichiers_active_size",
+        "idx_fichiers_size_dates",
+        "idx_size_analysis",
+    }
+    # Index des dates normalisées: définis une seule fois, par DBManager
+    assert {"idx_fichiers_lm_ts", "idx_fichiers_ct_ts"} <= names
@@ -0,0 +1,1339 @@
+import contextlib
+from pathlib import Path
+import sqlite3
+import sys
+import threading
+import types
+from collections import OrderedDict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from content_analyzer.modules.csv_parser import refresh_duplicate_stats
+from gui.analytics_panel import AnalyticsDrillDownViewer
+
+
+class _FakeTree:
+    _w = ".drill"
+
+    def __init__(self):
+        self.rows = []
+        self.tk = self
+
+    def get_children(self):
+        return tuple(range(len(self.rows)))
+
+    def delete(self, *items):
+        self.rows = []
+
+        self.layout = []
+
+    def call(self, widget, command, *args):
+        assert widget == ".drill"
+        if command == "configure":
+            self.layout.append(args)
+            return
+        parent, index, option, values = args
+        assert (command, option) == ("insert", "-values")
+        self.rows.append(values)
+
+    def eval(self, script):
+        self.layout.append(script)
+
+
+class _FakeScrollbar:
+    def set(self, first, last):
+        self.view = (first, last)
+
+
+def _make_viewer() -> AnalyticsDrillDownViewer:
+    viewer = AnalyticsDrillDownViewer.__new__(AnalyticsDrillDownViewer)
+    viewer.drill_tree = _FakeTree()
+    viewer._v_scrollbar = _FakeScrollbar()
+    viewer._formatted_rows = []
+    viewer._rendered_count = 0
+    viewer._page_state = None
+    viewer._ro_conn = None
+    viewer._ro_lock = threading.Lock()
+    viewer._last_query = None
+    viewer.analytics_panel = types.SimpleNamespace(_data_version=0)
+    viewer._result_cache = OrderedDict()
+    viewer._cache_lock = threading.Lock()
+    return viewer
+
+
+def test_small_results_inserted_at_once():
+    viewer = _make_viewer()
+    rows = [(f"f{i}",) for i in range(10)]
+    viewer._set_tree_rows(rows)
+    assert viewer.drill_tree.rows == rows
+
+
+def test_large_results_rendered_on_scroll():
+    viewer = _make_viewer()
+    rows = [(f"f{i}",) for i in range(1000)]
+    viewer._set_tree_rows(rows)
+    assert len(viewer.drill_tree.rows) == viewer.RENDER_BATCH
+
+    viewer._on_tree_yview("0.0", "0.5")
+    assert len(viewer.drill_tree.rows) == viewer.RENDER_BATCH
+    viewer._on_tree_yview("0.8", "0.95")
+    assert len(viewer.drill_tree.rows) == 2 * viewer.RENDER_BATCH
+    assert viewer.drill_tree.rows[-1] == rows[2 * viewer.RENDER_BATCH - 1]
+
+
+def _loop_format(size_bytes):
+    if not size_bytes:
+        return "0B"
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} PB"
+
+
+def test_format_size_display_matches_division_loop():
+    from gui.analytics_panel import _format_size_display
+
+    for size in (0, 1, 1023, 1024, 1536, 1024**2 - 1, 5 * 1024**3, 3 * 1024**5, 1024**6):
+        assert _format_size_display(size) == _loop_format(size)
+
+
+class _FakeWidget:
+    def __init__(self, *args, text="", **kwargs):
+        self.text = text
+
+    def pack(self, **kwargs):
+        pass
+
+    def config(self, text=None, **kwargs):
+        self.text = text
+
+    def destroy(self):
+        pass
+
+
+class _FakeModal:
+    def __init__(self):
+        self.callbacks = []
+
+    def update_idletasks(self):
+        pass
+
+    def winfo_exists(self):
+        return True
+
+    def after(self, delay, func, *args):
+        self.callbacks.append((func, args))
+
+
+def _files_db(tmp_path, rows):
+    from content_analyzer.modules.db_manager import DBManager
+
+    path = tmp_path / "t.db"
+    raw = sqlite3.connect(path)
+    raw.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, owner TEXT)"
+    )
+    raw.executemany(
+        "INSERT INTO fichiers (name, path, file_size, last_modified, owner) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    raw.commit()
+    raw.close()
+    return DBManager(path)
+
+
+_FILES_SQL = "SELECT id, name, path, file_size, last_modified, owner FROM fichiers ORDER BY id"
+
+
+def _run_callbacks(modal, done):
+    import time
+
+    deadline = time.time() + 5
+    while modal.callbacks and not done() and time.time() < deadline:
+        func, args = modal.callbacks.pop(0)
+        func(*args)
+        time.sleep(0.01)
+
+
+def test_load_filtered_files_runs_query_off_ui_thread(tmp_path, monkeypatch):
+    import gui.analytics_panel as ap
+
+    db = _files_db(tmp_path, [("a.txt", "/a.txt", 2048, "2024-01-01 10:00:00", None)])
+    monkeypatch.setattr(ap.ttk, "Label", _FakeWidget)
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    modal = _FakeModal()
+
+    viewer._load_filtered_files(modal, _FILES_SQL, (), "test")
+    _run_callbacks(modal, lambda: viewer.drill_tree.rows)
+    assert viewer.drill_tree.rows == [
+        ("a.txt", "/a.txt", "2.0 KB", "2024-01-01 10:00:00", "N/A", "N/A", "TXT", "Inconnu")
+    ]
+    assert viewer.current_files[0]["path"] == "/a.txt"
+
+
+_CORRELATED_DUPLICATES_SQL = """
+SELECT f.id, f.fast_hash,
+       (SELECT COUNT(*) FROM fichiers f2
+        WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
+          AND f2.fast_hash IS NOT NULL AND f2.fast_hash != ''
+          AND (f2.status IS NULL OR f2.status != 'error')) AS duplicate_count
+FROM fichiers f
+WHERE (f.status IS NULL OR f.status != 'error') AND f.file_size > 0
+  AND f.fast_hash IS NOT NULL AND f.fast_hash != ''
+  AND (SELECT COUNT(*) FROM fichiers f2
+       WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
+         AND f2.fast_hash IS NOT NULL AND f2.fast_hash != ''
+         AND (f2.status IS NULL OR f2.status != 'error')) > 1
+"""
+
+
+def test_duplicates_modal_query_matches_correlated_version(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, owner TEXT, fast_hash TEXT, status TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE reponses_llm (fichier_id INTEGER, "
+        "security_classification_cached TEXT, rgpd_risk_cached TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO fichiers (id, file_size, fast_hash, status) VALUES (?, ?, ?, ?)",
+        [
+            (1, 10, "h1", None),
+            (2, 10, "h1", "completed"),
+            (3, 10, "h1", "error"),
+            (4, 20, "h1", None),
+            (5, 30, "h2", None),
+            (6, 30, "h2", None),
+            (7, 30, "h2", None),
+            (8, 5, "", None),
+            (9, 5, "", None),
+            (10, 0, "h3", None),
+            (11, 0, "h3", None),
+        ],
+    )
+    captured = {}
+    viewer = _make_viewer()
+    monkeypatch.setattr(viewer, "_create_base_modal", lambda *a: None)
+    monkeypatch.setattr(
+        viewer,
+        "_load_filtered_files",
+        lambda modal, query, params, category: captured.update(query=query),
+    )
+    viewer.show_duplicates_modal("Doublons", {})
+
+    new = {(row[0], row[8], row[9]) for row in conn.execute(captured["query"])}
+    old = set(conn.execute(_CORRELATED_DUPLICATES_SQL))
+    assert new == old
+    assert {row[0] for row in new} == {1, 2, 5, 6, 7}
+
+
+def test_load_filtered_files_paginates_on_scroll(tmp_path, monkeypatch):
+    import gui.analytics_panel as ap
+
+    db = _files_db(tmp_path, [(f"f{i}", f"/f{i}", i, None, "bob") for i in range(5)])
+    monkeypatch.setattr(ap.ttk, "Label", _FakeWidget)
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    viewer.PAGE_SIZE = 2
+    modal = _FakeModal()
+
+    viewer._load_filtered_files(modal, _FILES_SQL, (), "test")
+    _run_callbacks(modal, lambda: viewer.drill_tree.rows)
+    assert [r[0] for r in viewer.drill_tree.rows] == ["f0", "f1"]
+
+    for expected in (4, 5):
+        viewer._on_tree_yview("0.0", "1.0")
+        _run_callbacks(modal, lambda: len(viewer.drill_tree.rows) == expected)
+        assert len(viewer.drill_tree.rows) == expected
+    assert viewer._page_state["has_more"] is False
+    assert [f["name"] for f in viewer.current_files] == [f"f{i}" for i in range(5)]
+
+
+def test_keyset_pages_resume_after_last_size_and_id(tmp_path, monkeypatch):
+    import gui.analytics_panel as ap
+
+    sizes = [5, 3, 5, 3, 5, 1]
+    db = _files_db(tmp_path, [(f"f{i}", f"/f{i}", s, None, "bob") for i, s in enumerate(sizes)])
+    monkeypatch.setattr(ap.ttk, "Label", _FakeWidget)
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    viewer.PAGE_SIZE = 2
+    queries = []
+    fetch = viewer._fetch_cached
+    viewer._fetch_cached = lambda q, p: queries.append(q) or fetch(q, p)
+    modal = _FakeModal()
+    columns = "SELECT id, name, path, file_size, last_modified, owner FROM fichiers f "
+    order = " ORDER BY f.file_size DESC, f.id DESC"
+
+    viewer._load_filtered_files(
+        modal, columns + order, (), "test",
+        keyset_query=columns + "WHERE 1 " + ap._KEYSET_AFTER_SIZE_ID + order,
+    )
+    _run_callbacks(modal, lambda: viewer.drill_tree.rows)
+    for expected in (4, 6):
+        viewer._on_tree_yview("0.0", "1.0")
+        _run_callbacks(modal, lambda: len(viewer.drill_tree.rows) == expected)
+    viewer._on_tree_yview("0.0", "1.0")
+    _run_callbacks(modal, lambda: False)
+
+    assert [f["name"] for f in viewer.current_files] == ["f4", "f2", "f0", "f3", "f1", "f5"]
+    assert viewer._page_state["has_more"] is False
+    assert ["OFFSET" in q for q in queries] == [True, False, False, False]
+
+
+def test_fetch_rows_reuses_read_only_connection(tmp_path):
+    db = _files_db(tmp_path, [("a", "/a", 1, None, None)])
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    assert viewer._fetch_rows("SELECT name FROM fichiers", ()) == [("a",)]
+    conn = viewer._ro_conn
+    assert viewer._fetch_rows("SELECT COUNT(*) FROM fichiers", ()) == [(1,)]
+    assert viewer._ro_conn is conn
+    try:
+        conn.execute("DELETE FROM fichiers")
+        raise AssertionError("read connection accepted a write")
+    except sqlite3.OperationalError:
+        pass
+    viewer.close()
+    assert viewer._ro_conn is None
+
+
+def test_del_closes_read_connection_without_pool():
+    class _NoPool:
+        def _connect(self):
+            raise AssertionError("__del__ must not check out a pool connection")
+
+    viewer = _make_viewer()
+    viewer.db_manager = _NoPool()
+    viewer._ro_conn = sqlite3.connect(":memory:")
+    viewer.__del__()
+    assert viewer._ro_conn is None
+
+
+def test_close_runs_optimize_on_pool():
+    statements = []
+    conn = sqlite3.connect(":memory:")
+    conn.set_trace_callback(statements.append)
+
+    class _Pool:
+        def get(self):
+            return contextlib.nullcontext(conn)
+
+    viewer = _make_viewer()
+    viewer.db_manager = types.SimpleNamespace(_connect=_Pool)
+    viewer._ro_conn = sqlite3.connect(":memory:")
+    viewer.close()
+    assert viewer._ro_conn is None
+    assert statements == ["PRAGMA optimize"]
+
+
+def test_size_bucket_query_uses_precomputed_bounds():
+    viewer = _make_viewer()
+    query, params = viewer._build_modal_query_unified("size", ">500MB")
+    assert "f.file_size >= ?" in query
+    assert params == (500 * 1024 * 1024,)
+    _, params = viewer._build_modal_query_unified("size", "50-100MB")
+    assert params == (50 * 1024 * 1024, 100 * 1024 * 1024)
+    assert viewer._get_file_type("Rapport.DOCX") == "DOC"
+    assert viewer._get_file_type("archive.7z") == "Autres"
+
+
+def test_format_filtered_rows_fast_path_matches_row_loop():
+    viewer = _make_viewer()
+    rows = [
+        (1, "a.pdf", "/x/a.pdf", 2048, "2024-01-01 10:00:00.123", None, "C1", "low"),
+        (2, "b" * 60, "/y/b", None, None, "bob", "none", "none"),
+    ]
+    fast_rows, fast_files = viewer._format_filtered_rows(rows)
+    # Une ligne courte force le chemin ligne à ligne
+    slow_rows, slow_files = viewer._format_filtered_rows(
+        rows + [(3, "c", "/z/c", 1, None, "x")]
+    )
+    assert slow_rows[:2] == fast_rows
+    assert slow_files[:2] == fast_files
+    assert fast_rows[0][3] == "2024-01-01 10:00:00"
+    assert fast_rows[1][7] == "bob"
+
+
+def test_write_files_csv(tmp_path):
+    import csv
+
+    out = tmp_path / "export.csv"
+    files = [
+        {"name": "a.pdf", "path": "/x/a.pdf", "file_size": 10, "owner": "bob",
+         "last_modified": "2024-01-01", "classif": "C1", "rgpd": "low"},
+        {"name": "b.txt", "path": "/x/b.txt"},
+    ]
+    AnalyticsDrillDownViewer._write_files_csv(str(out), iter(files))
+    with open(out, newline="", encoding="utf-8") as fh:
+        rows = list(csv.reader(fh))
+    assert rows[0] == list(AnalyticsDrillDownViewer.EXPORT_HEADERS)
+    assert rows[1] == ["a.pdf", "/x/a.pdf", "10", "bob", "2024-01-01", "C1", "low"]
+    assert rows[2] == ["b.txt", "/x/b.txt", "0", "", "", "", ""]
+
+
+def test_export_query_csv_streams_full_result(tmp_path):
+    import csv
+
+    db = _files_db(
+        tmp_path, [(f"f{i}", f"/d/f{i}", i, "2024-01-01", "bob") for i in range(5)]
+    )
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    out = tmp_path / "export.csv"
+    viewer._export_query_csv(str(out), _FILES_SQL + " LIMIT ?", (10,))
+    viewer.close()
+    with open(out, newline="", encoding="utf-8") as fh:
+        rows = list(csv.reader(fh))
+    assert len(rows) == 6
+    assert rows[1] == ["f0", "/d/f0", "0", "bob", "2024-01-01", "N/A", "N/A"]
+
+
+def test_export_query_csv_runs_in_worker(tmp_path):
+    db = _files_db(tmp_path, [("a", "/d/a", 1, "2024-01-01", "bob")])
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    parent = _FakeModal()
+    viewer.analytics_panel = types.SimpleNamespace(_data_version=0, parent=parent)
+    out = tmp_path / "export.csv"
+    done = []
+    viewer._run_in_worker(
+        viewer._export_query_csv,
+        (str(out), _FILES_SQL, ()),
+        lambda result: done.append((threading.current_thread(), result)),
+    )
+    assert parent.callbacks  # résultat relevé par after(), pas d'attente bloquante
+    _run_callbacks(parent, lambda: done)
+    viewer.close()
+    assert done == [(threading.main_thread(), None)]
+    assert out.read_text(encoding="utf-8").count("\n") == 2
+
+
+def test_close_waits_for_read_lock():
+    viewer = _make_viewer()
+    viewer._ro_conn = sqlite3.connect(":memory:")
+    closed = threading.Event()
+    with viewer._ro_lock:
+        thread = threading.Thread(
+            target=lambda: (viewer._close_ro_conn(), closed.set()), daemon=True
+        )
+        thread.start()
+        assert not closed.wait(0.1)
+        assert viewer._ro_conn is not None
+    thread.join(5)
+    assert closed.is_set() and viewer._ro_conn is None
+
+
+def test_age_condition_binds_cutoffs_and_uses_index(tmp_path):
+    from datetime import datetime
+
+    from gui.analytics_panel import _age_condition
+
+    now = datetime(2024, 6, 30, 12, 0, 0)
+    cond, params = _age_condition("last_modified", "recent_30_days", 365, now)
+    assert cond == "f.last_modified >= ? AND f.last_modified < ?"
+    assert params == ("2024-05-31", "2024-06-23")
+    cond, params = _age_condition("creation_time", "old_2_years", 365, now)
+    assert cond == "f.creation_time < ?" and params == ("2022-06-30",)
+    cond, params = _age_condition("last_modified", "dormant", "90", now)
+    assert params == ("2024-04-01",)
+    # Même borne au jour près que date('now', ...) côté SQLite
+    ref = sqlite3.connect(":memory:")
+    for modifier, category in (("-1 year", "old_1_year"), ("-7 days", "recent_7_days")):
+        leap = datetime(2024, 2, 29, 23, 30, 0)
+        expected = ref.execute("SELECT date(?, ?)", (leap.isoformat(" "), modifier))
+        assert _age_condition("f", category, 365, leap)[1][-1] == expected.fetchone()[0]
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE fichiers (id INTEGER PRIMARY KEY, last_modified TEXT)")
+    conn.execute("CREATE INDEX idx_fichiers_lastmod ON fichiers(last_modified)")
+    cond, params = _age_condition("last_modified", "old_1_year", 365, now)
+    plan = conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT id FROM fichiers f WHERE {cond}", params
+    ).fetchall()
+    assert any("idx_fichiers_lastmod" in str(row) for row in plan)
+
+
+def test_security_and_rgpd_modals_share_unified_query():
+    viewer = _make_viewer()
+    captured = []
+    viewer._create_base_modal = lambda title, subtitle: _FakeModal()
+    viewer._load_filtered_files = lambda modal, query, params, category: captured.append(
+        (query, params)
+    )
+    viewer.show_classification_files_modal("C2", "t", {})
+    viewer.show_rgpd_files_modal("high", "t", {})
+    (sec_query, sec_params), (rgpd_query, rgpd_params) = captured
+    assert sec_params == ("C2",) and rgpd_params == ("high",)
+    assert "f.file_size > 0" in sec_query and "f.file_size > 0" in rgpd_query
+    assert "r.security_classification_cached = ?" in sec_query
+    assert "r.rgpd_risk_cached = ?" in rgpd_query
+    size_query, _ = viewer._build_modal_query_unified(
+        "size", "<50MB", require_positive_size=False
+    )
+    assert "f.file_size > 0" not in size_query
+
+
+def test_read_connection_pragmas(tmp_path):
+    db = _files_db(tmp_path, [("a", "/a", 1, None, None)])
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    viewer._fetch_rows("SELECT 1", ())
+    conn = viewer._ro_conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal"
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -131072
+    assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    assert str(db.db_path) in AnalyticsDrillDownViewer._statistics_checked
+    viewer.close()
+
+
+def test_drill_columns_script_configures_by_position():
+    from gui.analytics_panel import _DRILL_COLUMNS, _drill_columns_script
+
+    lines = _drill_columns_script(".m.tree").splitlines()
+    assert len(lines) == 2 * len(_DRILL_COLUMNS)
+    assert lines[0] == ".m.tree heading #1 -text {Nom}"
+    assert lines[-1] == ".m.tree column #8 -width 150"
+
+
+def test_display_functions_registered_on_read_connection(tmp_path):
+    db = _files_db(tmp_path, [("r.PDF", "/r.PDF", None, None, "alice")])
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    rows = viewer._fetch_rows(
+        "SELECT fmt_size(file_size), owner_or(owner, 'Inconnu'), "
+        "owner_or(NULL, 'Inconnu'), ftype(name) FROM fichiers",
+        (),
+    )
+    viewer.close()
+    assert rows == [("0B", "alice", "Inconnu", "PDF")]
+
+
+def test_fetch_cached_reuses_rows_until_data_version_changes():
+    viewer = _make_viewer()
+    calls = []
+    viewer._fetch_rows = lambda query, params: calls.append(query) or [(len(calls),)]
+    assert viewer._fetch_cached("SELECT 1", ()) == [(1,)]
+    assert viewer._fetch_cached("SELECT 1", ()) == [(1,)]
+    assert len(calls) == 1
+    viewer.analytics_panel._data_version += 1
+    assert viewer._fetch_cached("SELECT 1", ()) == [(2,)]
+    for i in range(viewer.RESULT_CACHE_SIZE + 2):
+        viewer._fetch_cached(f"SELECT {i + 2}", ())
+    assert len(viewer._result_cache) == viewer.RESULT_CACHE_SIZE
+
+
+def test_reopened_modal_is_filled_from_cache_without_worker(tmp_path, monkeypatch):
+    import gui.analytics_panel as ap
+
+    db = _files_db(tmp_path, [("a.txt", "/a.txt", 1, None, None)])
+    monkeypatch.setattr(ap.ttk, "Label", _FakeWidget)
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    modal = _FakeModal()
+    viewer._load_filtered_files(modal, _FILES_SQL, (), "test")
+    _run_callbacks(modal, lambda: viewer.drill_tree.rows)
+
+    viewer.drill_tree = _FakeTree()
+    started = []
+    monkeypatch.setattr(ap.threading, "Thread", lambda **kw: started.append(kw))
+    viewer._load_filtered_files(modal, _FILES_SQL, (), "test")
+    assert [row[0] for row in viewer.drill_tree.rows] == ["a.txt"]
+    assert started == []
+
+
+def test_modal_queries_are_precompiled():
+    viewer = _make_viewer()
+    first, _ = viewer._build_modal_query_unified("rgpd", "high")
+    second, params = viewer._build_modal_query_unified("rgpd", "high")
+    assert first is second and params == ("high",)
+    query, params = viewer._build_modal_query_unified("temporal", "last_modified:last_30_days")
+    assert "f.last_modified >= ?" in query
+    assert isinstance(params[0], str) and len(params[0]) == 19
+    # Valeur hors table précompilée: composée à la demande
+    query, params = viewer._build_modal_query_unified("security", "C9")
+    assert params == ("C9",)
+
+
+def test_offset_paged_queries_break_ties_on_id():
+    import gui.analytics_panel as ap
+
+    queries = [q for q, _ in ap._MODAL_SQL.values()]
+    queries += list(ap._DOC_TYPE_SQL.values())
+    queries += [ap._DUPLICATE_LEVEL_QUERY, ap._DUPLICATE_STATS_QUERY]
+    for query in queries:
+        assert query.rstrip().endswith("f.id DESC"), query
+
+
+def test_bulk_size_format_matches_scalar_above_threshold():
+    from gui.analytics_panel import (
+        _VECTOR_SIZE_THRESHOLD,
+        _format_size_display,
+        _format_sizes_bulk,
+    )
+
+    base = [0, None, 1, 1023, 1024, 1536, 1024**2, 5 * 1024**3 + 7, 1024**5 * 3]
+    sizes = (base * (_VECTOR_SIZE_THRESHOLD // len(base) + 1))[: _VECTOR_SIZE_THRESHOLD + 1]
+    assert _format_sizes_bulk(sizes) == [_format_size_display(s or 0) for s in sizes]
+
+
+class _ReusableModal(_FakeModal):
+    def __init__(self, children):
+        super().__init__()
+        self.children_list = children
+        self.shown_state = "withdrawn"
+        self.titles = []
+
+    def winfo_children(self):
+        return list(self.children_list)
+
+    def title(self, text):
+        self.titles.append(text)
+
+    def state(self):
+        return self.shown_state
+
+    def deiconify(self):
+        self.shown_state = "normal"
+
+    def lift(self):
+        pass
+
+    def focus_set(self):
+        pass
+
+    def grab_release(self):
+        pass
+
+    def withdraw(self):
+        self.shown_state = "withdrawn"
+
+
+def test_base_modal_is_reused_between_opens():
+    class _Child(_FakeWidget):
+        destroyed = False
+
+        def destroy(self):
+            self.destroyed = True
+
+    fixed, leftover = _Child(), _Child()
+    modal = _ReusableModal([fixed, leftover])
+    viewer = _make_viewer()
+    viewer.analytics_panel.parent = object()
+    viewer._modal = modal
+    viewer._modal_fixed = (fixed,)
+    viewer._modal_subtitle = _FakeWidget()
+    viewer.drill_tree.rows = [("old",)]
+    viewer._page_state = {"loading": True}
+
+    assert viewer._create_base_modal("Titre", "Sous-titre") is modal
+    assert leftover.destroyed and not fixed.destroyed
+    assert viewer.drill_tree.rows == [] and viewer._page_state is None
+    assert modal.titles == ["Titre"] and viewer._modal_subtitle.text == "Sous-titre"
+    assert len(modal.callbacks) == 1  # grab au passage masqué -> visible
+
+    viewer._create_base_modal("Titre 2", "Autre")
+    assert len(modal.callbacks) == 1  # déjà visible: pas de nouveau grab
+    viewer._hide_modal()
+    assert modal.shown_state == "withdrawn"
+
+
+def test_bulk_render_hides_columns_during_insert():
+    viewer = _make_viewer()
+    tree = viewer.drill_tree
+    viewer._set_tree_rows([("r",)] * 50)
+    assert tree.layout == []  # petit lot: pas de bascule de mise en page
+    viewer._set_tree_rows([("r",)] * 1000)
+    assert tree.layout[0] == ("-displaycolumns", "")
+    assert "-stretch 0" in tree.layout[1]
+    assert tree.layout[2] == ("-displaycolumns", "#all")
+    assert "-stretch 1" in tree.layout[3]
+
+
+def test_analyze_runs_once_until_stats_exist():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE reponses_llm (fichier_id INTEGER, security_classification_cached TEXT)"
+    )
+    conn.execute(
+        "CREATE INDEX idx_reponses_class_fichier "
+        "ON reponses_llm(security_classification_cached, fichier_id)"
+    )
+    conn.executemany(
+        "INSERT INTO reponses_llm VALUES (?, ?)", [(i, f"C{i % 4}") for i in range(20)]
+    )
+    statements = []
+    conn.set_trace_callback(statements.append)
+    AnalyticsDrillDownViewer._analyze_if_needed(conn)
+    AnalyticsDrillDownViewer._analyze_if_needed(conn)
+    assert statements.count("ANALYZE main") == 1
+
+
+_CORRELATED_LEVEL_SQL = """
+SELECT f.id,
+       (SELECT COUNT(*) FROM fichiers f2
+        WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
+          AND (f2.status IS NULL OR f2.status != 'error')) AS copy_count
+FROM fichiers f
+WHERE (f.status IS NULL OR f.status != 'error')
+  AND f.fast_hash IS NOT NULL AND f.fast_hash != ''
+"""
+
+
+def test_duplicates_detailed_levels_match_correlated_counts(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, owner TEXT, fast_hash TEXT, status TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE reponses_llm (fichier_id INTEGER, "
+        "security_classification_cached TEXT, rgpd_risk_cached TEXT)"
+    )
+    rows = [(1, 10, "solo", None), (2, 10, "h1", None), (3, 10, "h1", "error"),
+            (4, 10, "h1", None), (5, None, "hn", None), (6, 1, "", None)]
+    rows += [(100 + i, 7, "h7", None) for i in range(8)]
+    conn.executemany(
+        "INSERT INTO fichiers (id, file_size, fast_hash, status) VALUES (?, ?, ?, ?)", rows
+    )
+    old = list(conn.execute(_CORRELATED_LEVEL_SQL))
+    viewer = _make_viewer()
+    captured = {}
+    monkeypatch.setattr(viewer, "_create_base_modal", lambda *a: None)
+    monkeypatch.setattr(
+        viewer,
+        "_load_filtered_files",
+        lambda modal, query, params, category: captured.update(q=query, p=params),
+    )
+    pool = types.SimpleNamespace(get=lambda: contextlib.nullcontext(conn))
+    for db_manager in (None, types.SimpleNamespace(_connect=lambda: pool)):
+        if db_manager is not None:
+            refresh_duplicate_stats(conn)  # fait à l'import, pas au clic
+        viewer.analytics_panel.db_manager = db_manager
+        queries = set()
+        for level, keep in (("1x", lambda c: c == 1), ("2x", lambda c: c == 2),
+                            ("7x+", lambda c: c >= 7)):
+            viewer.show_duplicates_detailed_modal(level, "t", {})
+            queries.add(captured["q"])
+            new = {(row[0], row[8]) for row in conn.execute(captured["q"], captured["p"])}
+            assert new == {(i, c) for i, c in old if keep(c)}
+        assert len(queries) == 1
+    assert "duplicate_stats" in captured["q"]
+
+
+def test_duplicate_stats_only_read_on_click():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, file_size INTEGER, "
+        "fast_hash TEXT, status TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO fichiers (file_size, fast_hash) VALUES (?, ?)",
+        [(10, "a"), (10, "a"), (5, "b")],
+    )
+    statements = []
+    conn.set_trace_callback(statements.append)
+    viewer = _make_viewer()
+    pool = types.SimpleNamespace(get=lambda: contextlib.nullcontext(conn))
+    viewer.analytics_panel.db_manager = types.SimpleNamespace(_connect=lambda: pool)
+
+    # Table absente, ou laissée par un import antérieur: repli sur la CTE, sans écriture
+    assert not viewer._has_duplicate_stats()
+    conn.execute("CREATE TABLE duplicate_stats (fast_hash TEXT, file_size INTEGER, copy_count INTEGER)")
+    assert not viewer._has_duplicate_stats()
+    refresh_duplicate_stats(conn)
+    statements.clear()
+    assert viewer._has_duplicate_stats()
+    assert all(q.lstrip().upper().startswith("SELECT") for q in statements)
+    # Fichiers ajoutés ou passés en erreur depuis le recalcul
+    conn.execute("INSERT INTO fichiers (file_size, fast_hash) VALUES (5, 'b')")
+    assert not viewer._has_duplicate_stats()
+    refresh_duplicate_stats(conn)
+    conn.execute("UPDATE fichiers SET status = 'error' WHERE id = 1")
+    assert not viewer._has_duplicate_stats()
+
+
+def test_analysis_complete_refreshes_analytics_tables():
+    from gui.main_window import MainWindow
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, owner TEXT, fast_hash TEXT, status TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO fichiers (file_size, fast_hash, owner) VALUES (?, ?, 'bob')",
+        [(10, "a"), (10, "a")],
+    )
+    window = MainWindow.__new__(MainWindow)
+    window.db_manager = None
+    window._refresh_analytics_tables()  # pas de base chargée: rien à faire
+    pool = types.SimpleNamespace(get=lambda: contextlib.nullcontext(conn))
+    window.db_manager = types.SimpleNamespace(_connect=lambda: pool)
+    window._refresh_analytics_tables()
+    assert list(conn.execute("SELECT fast_hash, copy_count FROM duplicate_stats")) == [("a", 2)]
+    assert conn.execute(
+        "SELECT COUNT(*) FROM user_category_files WHERE category = 'all'"
+    ).fetchone()[0] == 2
+
+
+def test_temporal_sql_filter_matches_python_filter():
+    from datetime import datetime, timedelta
+
+    from gui.analytics_panel import AnalyticsPanel, parse_timestamp_to_epoch
+
+    now = datetime(2025, 6, 1, 12, 0, 0)
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, creation_time TEXT, owner TEXT, "
+        "status TEXT, last_modified_ts INTEGER, creation_time_ts INTEGER)"
+    )
+    conn.execute(
+        "CREATE TABLE reponses_llm (fichier_id INTEGER, security_classification_cached TEXT, "
+        "rgpd_risk_cached TEXT, finance_type_cached TEXT, legal_type_cached TEXT, "
+        "document_resume TEXT)"
+    )
+    rows = []
+    for i, days in enumerate([10, 400, 800, 1200, 1500, 1900, 2500, 3000]):
+        stamp = (now - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        lm, ct = (stamp, None) if i % 2 else (None, stamp)
+        rows.append((i + 1, f"f{i}", f"/f{i}", 100 + i, lm, ct,
+                     parse_timestamp_to_epoch(lm), parse_timestamp_to_epoch(ct)))
+    conn.executemany(
+        "INSERT INTO fichiers (id, name, path, file_size, last_modified, creation_time, "
+        "last_modified_ts, creation_time_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    viewer = _make_viewer()
+    viewer.analytics_panel._parse_date_flexible = (
+        lambda value: AnalyticsPanel._parse_date_flexible(None, value)
+    )
+    ranges = [(0, 365), (365, 730), (730, 1095), (1095, 1460), (1460, 1825),
+              (1825, 2190), (2190, None)]
+    for date_type in ("modification", "creation"):
+        for lo, hi in ranges:
+            range_def = {"min_days": lo, "max_days": hi}
+            query, _, params = viewer._temporal_ts_query(date_type, range_def, now)
+            sql_ids = [row[0] for row in conn.execute(query, params)]
+            py_rows = viewer._filter_temporal_rows_python(
+                conn, date_type, range_def, now
+            )
+            assert sql_ids == [row[0] for row in py_rows]
+            assert len(sql_ids) == (2 if hi is None else 1)
+
+
+def test_click_manager_binds_shared_callbacks():
+    from gui.analytics_panel import (
+        AnalyticsTabClickManager,
+        _on_click,
+        _on_enter,
+        _on_leave,
+    )
+
+    class _Label:
+        def __init__(self):
+            self.bindings = {}
+            self.config = {}
+
+        def configure(self, **kw):
+            self.config.update(kw)
+
+        def bind(self, sequence, func):
+            self.bindings[sequence] = func
+
+    labels = {"C2": _Label(), "C3": _Label()}
+    focus = {"C3 Total": _Label()}
+    clicked = []
+    manager = AnalyticsTabClickManager.__new__(AnalyticsTabClickManager)
+    manager.analytics_panel = types.SimpleNamespace(
+        security_labels=labels, security_focus_labels=focus
+    )
+    manager._handle_classification_click = clicked.append
+    manager._handle_security_focus_click = clicked.append
+    manager.add_click_handlers_to_all_tabs()
+
+    for label in [*labels.values(), *focus.values()]:
+        assert label.bindings == {
+            "<Button-1>": _on_click,
+            "<Enter>": _on_enter,
+            "<Leave>": _on_leave,
+        }
+    event = types.SimpleNamespace(widget=focus["C3 Total"])
+    _on_enter(event)
+    assert focus["C3 Total"].config["font"] == ("Arial", 11, "underline")
+    _on_leave(event)
+    assert focus["C3 Total"].config["foreground"] == "black"
+    _on_click(types.SimpleNamespace(widget=labels["C3"]))
+    assert clicked == [labels["C3"]]
+    assert labels["C3"].click_info["classification"] == "C3"
+    assert focus["C3 Total"].click_info == {
+        "type": "security_focus",
+        "classification": "C3",
+        "category": "c3_total",
+    }
+
+
+def test_click_manifest_covers_single_label_and_temporal_dicts():
+    from gui.analytics_panel import AnalyticsTabClickManager
+
+    class _Label:
+        def configure(self, **kw):
+            pass
+
+        def bind(self, sequence, func):
+            pass
+
+    duplicates, recent = _Label(), _Label()
+    manager = AnalyticsTabClickManager.__new__(AnalyticsTabClickManager)
+    manager.analytics_panel = types.SimpleNamespace(
+        duplicates_label=duplicates, creation_labels={"0_1y": recent}
+    )
+    manager._handle_duplicates_click = manager._handle_temporal_click = print
+    manager.add_click_handlers_to_all_tabs()
+    assert duplicates.click_info == {"type": "duplicates", "category": "duplicate_files"}
+    assert recent.click_info == {
+        "type": "temporal_analysis",
+        "temporal_type": "creation",
+        "period_filter": "0_1y",
+        "category": "temporal_analysis",
+    }
+
+
+def test_click_handlers_attached_from_idle_callbacks():
+    from gui.analytics_panel import AnalyticsPanel, AnalyticsTabClickManager, _LABEL_MANIFEST
+
+    class _Label:
+        bound = False
+
+        def configure(self, **kw):
+            pass
+
+        def bind(self, sequence, func):
+            self.bound = True
+
+    pending = []
+    label = _Label()
+    manager = AnalyticsTabClickManager.__new__(AnalyticsTabClickManager)
+    panel = AnalyticsPanel.__new__(AnalyticsPanel)
+    panel.parent = types.SimpleNamespace(
+        after_idle=lambda func, *args: pending.append((func, args))
+    )
+    panel.duplicates_label = label
+    manager.analytics_panel = panel
+    manager._handle_duplicates_click = print
+    manager.add_click_handlers_to_all_tabs()
+    assert len(pending) == len(_LABEL_MANIFEST)
+    assert not label.bound
+    for func, args in pending:
+        func(*args)
+    assert label.bound
+
+
+def test_temporal_queries_are_static_templates():
+    from gui.analytics_panel import _TEMPORAL_TS_SQL, _TEMPORAL_FALLBACK_SQL
+
+    assert len(_TEMPORAL_TS_SQL) == 8
+    for query in [*_TEMPORAL_TS_SQL.values(), *_TEMPORAL_FALLBACK_SQL.values()]:
+        assert "datetime(" not in query and "{" not in query
+    assert _TEMPORAL_TS_SQL[("modification", True, False)].count("?") == 4
+    assert _TEMPORAL_TS_SQL[("creation", False, False)].count("?") == 2
+    assert _TEMPORAL_TS_SQL[("creation", False, True)].count("?") == 5
+
+
+def test_document_resume_loaded_on_demand(tmp_path):
+    db = _files_db(tmp_path, [("a", "/a", 1, None, None)])
+    with db._connect().get() as conn:
+        conn.execute(
+            "INSERT INTO reponses_llm (fichier_id, task_id, document_resume) "
+            "VALUES (1, 't1', 'Contrat')"
+        )
+        conn.commit()
+    viewer = _make_viewer()
+    viewer.db_manager = db
+    assert viewer._fetch_document_resume(1) == "Contrat"
+    assert viewer._fetch_document_resume(2) is None
+    assert viewer._fetch_document_resume(None) is None
+    parent = _FakeModal()
+    viewer.analytics_panel = types.SimpleNamespace(_data_version=0, parent=parent)
+    shown = []
+    viewer._run_in_worker(
+        viewer._fetch_document_resume,
+        (1,),
+        lambda resume: shown.append((threading.current_thread(), resume)),
+    )
+    _run_callbacks(parent, lambda: shown)
+    viewer.close()
+    assert shown == [(threading.main_thread(), "Contrat")]
+
+
+def test_finance_and_legal_modals_share_static_templates():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, owner TEXT, status TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE reponses_llm (fichier_id INTEGER, security_classification_cached TEXT, "
+        "finance_type_cached TEXT, legal_type_cached TEXT)"
+    )
+    types_ = [None, "none", "invoice", "payment", "other", "nda", "weird"]
+    conn.executemany("INSERT INTO fichiers (id, file_size) VALUES (?, 1)",
+                     [(i,) for i in range(len(types_) + 1)])
+    conn.executemany(
+        "INSERT INTO reponses_llm VALUES (?, 'C1', ?, ?)",
+        [(i, t, t) for i, t in enumerate(types_)],
+    )
+    viewer = _make_viewer()
+
+    def ids(family, value):
+        query, params = viewer._doc_type_query(family, value)
+        return {row[0] for row in conn.execute(query, params)}
+
+    no_answer = len(types_)
+    assert ids("finance", "none") == {0, 1, no_answer}
+    assert ids("finance", "invoice") == {2}
+    # Les non classés (NULL, sans réponse) sont comptés dans "none" par l'onglet
+    assert ids("finance", "Autres") == {4, 5, 6}
+    assert ids("legal", "Autres") == {2, 3, 4, 6}
+    assert ids("legal", "nda") == {5}
+    assert viewer._doc_type_query("finance", "invoice")[0] is viewer._doc_type_query(
+        "finance", "budget"
+    )[0]
+
+
+def test_combined_modal_inner_join_keeps_c3_rows(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, owner TEXT, status TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE reponses_llm (fichier_id INTEGER, security_classification_cached TEXT, "
+        "rgpd_risk_cached TEXT, legal_type_cached TEXT)"
+    )
+    conn.executemany("INSERT INTO fichiers (id, file_size, status) VALUES (?, ?, ?)",
+                     [(1, 5, None), (2, 9, None), (3, 7, "error"), (4, 3, None), (5, 1, None)])
+    conn.executemany(
+        "INSERT INTO reponses_llm VALUES (?, ?, ?, ?)",
+        [(1, "C3", "critical", "nda"), (2, "C3", None, "lease"),
+         (3, "C3", "critical", "nda"), (4, "C2", "critical", "nda")],
+    )
+    viewer = _make_viewer()
+    captured = {}
+    monkeypatch.setattr(viewer, "_create_base_modal", lambda *a: None)
+    monkeypatch.setattr(
+        viewer,
+        "_load_filtered_files",
+        lambda modal, query, params, category: captured.update(q=query, p=params),
+    )
+    expected = {"c3_total": [2, 1], "c3_rgpd": [1], "c3_legal": [1]}
+    for category, ids in expected.items():
+        viewer.show_combined_files_modal("t", "s", {"category": category})
+        rows = conn.execute(captured["q"], captured["p"]).fetchall()
+        assert [row[0] for row in rows] == ids
+    assert rows[0][6:] == ("C3", "nda")
+
+
+class _FakeDrillWindow:
+    def __init__(self):
+        self.pending = []
+
+    def winfo_exists(self):
+        return True
+
+    def after(self, ms, func, *args):
+        self.pending.append((func, args))
+
+    def run(self):
+        import time
+
+        deadline = time.time() + 5
+        while self.pending and time.time() < deadline:
+            func, args = self.pending.pop(0)
+            func(*args)
+            time.sleep(0.001)
+
+
+def _user_viewer(rows):
+    from gui.analytics_panel import UserDrillDownViewer
+
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE fichiers (id INTEGER PRIMARY KEY, name TEXT, path TEXT, "
+        "file_size INTEGER, last_modified TEXT, owner TEXT, status TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE reponses_llm (fichier_id INTEGER, "
+        "security_classification_cached TEXT, rgpd_risk_cached TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO fichiers (name, path, file_size, owner) VALUES (?, ?, ?, ?)", rows
+    )
+    opened = []
+
+    def get():
+        opened.append(1)
+        return contextlib.nullcontext(conn)
+
+    panel = types.SimpleNamespace(
+        db_manager=types.SimpleNamespace(
+            _connect=lambda: types.SimpleNamespace(get=get)
+        ),
+        _data_version=0,
+    )
+    return UserDrillDownViewer(panel), opened
+
+
+def _fake_user_tree():
+    tree = _FakeTree()
+    tree.layout = []
+    return tree
+
+
+def test_user_files_served_from_cache_on_reopen():
+    viewer, opened = _user_viewer([("a", "/a", 10, "bob")])
+    first = viewer._fetch_user_files("bob", "Tous")
+    assert viewer._fetch_user_files("bob", "Tous") is first
+    assert viewer._fetch_user_files("bob", "Tous", 5000) == []
+    assert len(opened) == 2 and len(first) == 1
+    viewer.analytics_panel._data_version = 1
+    viewer._fetch_user_files("bob", "Tous")
+    assert len(opened) == 3
+
+
+def _user_page_state(window, tree, category="Tous"):
+    return {
+        "window": window,
+        "tree": tree,
+        "username": "bob",
+        "category": category,
+        "offset": 0,
+        "loading": False,
+        "page_label": None,
+        "next_button": None,
+    }
+
+
+def test_user_files_loaded_off_thread_in_batches():
+    rows = [(f"f{i}", f"/f{i}", i, "bob") for i in range(450)]
+    viewer, _ = _user_viewer(rows + [("big", "/big", 200_000_000, "bob")])
+    window, tree = _FakeDrillWindow(), _fake_user_tree()
+    viewer._load_user_files(_user_page_state(window, tree))
+    assert tree.rows == []  # rien n'est inséré avant le premier tick
+    batches = []
+    original = viewer._populate_tree
+    viewer._populate_tree = lambda t, chunk: (batches.append(len(chunk)), original(t, chunk))
+    window.run()
+    assert batches == [200, 200, 51]
+    assert tree.rows[0][0] == "big" and len(tree.rows) == 451
+    # Chaque lot masque les colonnes puis les restaure une seule fois
+    assert tree.layout.count(("-displaycolumns", "")) == 3
+    assert tree.layout[-2] == ("-displaycolumns", "#all")
+
+    big_tree = _fake_user_tree()
+    viewer._load_user_files(_user_page_state(window, big_tree, "Gros fichiers"))
+    window.run()
+    assert [row[0] for row in big_tree.rows] == ["big"]
+
+
+def test_user_files_paged_with_next_button():
+    rows = [(f"f{i}", f"/f{i}", 1000 - i, "bob") for i in range(5)]
+    viewer, _ = _user_viewer(rows)
+    viewer.USER_PAGE_SIZE = 2
+    window, tree = _FakeDrillWindow(), _fake_user_tree()
+    label, button = types.SimpleNamespace(), types.SimpleNamespace()
+    label.config = lambda **kw: label.__dict__.update(kw)
+    button.config = lambda **kw: button.__dict__.update(kw)
+    state = _user_page_state(window, tree)
+    state.update(page_label=label, next_button=button)
+    pages = []
+    for _ in range(3):
+        if pages:
+            viewer._next_user_page(state)
+        else:
+            viewer._load_user_files(state)
+        window.run()
+        pages.append(([row[0] for row in tree.rows], label.text, button.state))
+    assert pages == [
+        (["f0", "f1"], "2 affichés (page 1)", "normal"),
+        (["f2", "f3"], "2 affichés (page 2)", "normal"),
+        (["f4"], "1 affichés (page 3)", "disabled"),
+    ]
+
+
+def test_user_file_size_matches_division_loop():
+    from gui.analytics_panel import UserDrillDownViewer
+
+    def loop(size):
+        for unit in ["B", "KB", "MB", "GB", "TB"]:
+            if size < 1024.0:
+                return f"{size:.1f} {unit}"
+            size /= 1024.0
+        return f"{size:.1f} PB"
+
+    sizes = [0, 1, 1023, 1024, 1025, 1536, 1024**2 - 1, 1024**2, 5 * 1024**3,
+             1024**4 + 7, 1024**5, 3 * 1024**6, 123456789]
+    for size in sizes:
+        assert UserDrillDownViewer._format_file_size(size) == loop(size)
+    assert UserDrillDownViewer._format_file_size(None) == "0.0 B"
+
+
+def test_user_files_truncated_by_sqlite_like_python():
+    from gui.analytics_panel import _truncate_display
+
+    names = ["court", "n" * 50, "é" * 51, "x" * 80]
+    rows = [(name, "/p/" + name * 2, 1, "bob") for name in names]
+    viewer, _ = _user_viewer(rows)
+    viewer.db_manager._connect().get().__enter__().execute(
+        "UPDATE fichiers SET last_modified = '2024-01-02 03:04:05.123456' WHERE name = 'court'"
+    )
+    fetched = sorted(viewer._fetch_user_files("bob", "Tous"))
+    expected = sorted(
+        (_truncate_display(name, 50), _truncate_display("/p/" + name * 2, 60))
+        for name in names
+    )
+    assert [row[:2] for row in fetched] == expected
+    modified = {row[0]: row[3] for row in fetched}
+    assert modified["court"] == "2024-01-02 03:04:05"
+    assert modified["n" * 50] == "N/A"
+
+
+def test_simple_click_handlers_dispatch_to_viewer_methods():
+    from gui.analytics_panel import AnalyticsTabClickManager
+
+    calls = []
+
+    class _Viewer:
+        def __getattr__(self, name):
+            return lambda *args: calls.append((name, args[:-1]))
+
+    manager = AnalyticsTabClickManager.__new__(AnalyticsTabClickManager)
+    manager.drill_down_viewer = _Viewer()
+    manager._debug_click_info = lambda *a: None
+    label = types.SimpleNamespace(
+        click_info={"classification": "C2", "finance_type": "invoice", "level": "7x+"}
+    )
+    manager._handle_classification_click(label)
+    manager._handle_finance_click(label)
+    manager._handle_duplicates_click(label)
+    manager._handle_duplicates_detailed_click(label)
+    manager._handle_rgpd_click(types.SimpleNamespace())
+    assert calls == [
+        ("show_classification_files_modal", ("C2", "Fichiers de Classification C2")),
+        ("show_finance_modal", ("invoice", "Types Financiers - invoice")),
+        ("show_duplicates_modal", ("Fichiers Dupliqués - Groupes",)),
+        ("show_duplicates_detailed_modal", ("7x+", "Fichiers Dupliqués - 7x+")),
+        ("show_rgpd_files_modal", ("", "Fichiers RGPD - Risque ")),
+    ]
+
+
+def test_temporal_click_falls_back_to_label_text():
+    from gui.analytics_panel import AnalyticsTabClickManager
+
+    opened = []
+    manager = AnalyticsTabClickManager.__new__(AnalyticsTabClickManager)
+    manager.drill_down_viewer = types.SimpleNamespace(
+        show_temporal_files_modal=lambda period, *rest: opened.append(period)
+    )
+    for text in ("0-1 an: 3", "3-4 ans: 12", "+6 ans: 1", "???"):
+        label = types.SimpleNamespace(click_info={}, cget=lambda _opt, t=text: t)
+        manager._handle_temporal_click(label)
+    assert opened == ["0_1y", "3_4y", "6plus", "0_1y"]
+
+
+def test_user_files_materialized_table_matches_live_query():
+    from content_analyzer.modules.csv_parser import refresh_user_category_files
+    from gui.analytics_panel import _USER_FILES_SQL
+
+    rows = [(f"f{i}", f"/f{i}", (i + 1) * 60_000_000, "bob") for i in range(4)]
+    viewer, opened = _user_viewer(rows + [("x", "/x", 1, "eve")])
+    conn = viewer.db_manager._connect().get().__enter__()
+    conn.executemany(
+        "INSERT INTO reponses_llm VALUES (?, ?, ?)",
+        [(1, "C3", "critical"), (2, "C3", "low"), (3, "C1", "critical")],
+    )
+    refresh_user_category_files(conn)  # fin d'analyse, hors clic
+    for category, (query, params) in _USER_FILES_SQL.items():
+        live = conn.execute(query, ("bob", *params, 5000, 0)).fetchall()
+        assert viewer._fetch_user_files("bob", category) == live
+    assert viewer._fetch_user_files("bob", "inconnue") == viewer._fetch_user_files("bob", "all")
+    assert viewer._category_files_state == (0, True)
+    assert conn.execute("SELECT COUNT(*) FROM user_category_files").fetchone()[0] == 12
+
+
+def test_user_file_pages_do_not_overlap_on_equal_sizes():
+    viewer, _ = _user_viewer([(f"f{i}", f"/f{i}", 10, "bob") for i in range(7)])
+    viewer.USER_PAGE_SIZE = 3
+    names = [
+        row[0] for offset in (0, 3, 6) for row in viewer._fetch_user_files("bob", "all", offset)
+    ]
+    assert names == [f"f{i}" for i in range(6, -1, -1)]
+
+
+def test_user_files_fall_back_to_live_query():
+    from content_analyzer.modules.csv_parser import refresh_user_category_files
+
+    viewer, _ = _user_viewer([("a", "/a", 10, "bob")])
+    conn = viewer.db_manager._connect().get().__enter__()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    # Table absente: requête directe, sans recalcul depuis le clic
+    assert [row[0] for row in viewer._fetch_user_files("bob", "all")] == ["a"]
+    assert viewer._category_files_state == (0, False)
+    assert not any("user_category_files" in q and "INSERT" in q for q in statements)
+    # Table périmée (fichier ajouté après le recalcul): requête directe aussi
+    refresh_user_category_files(conn)
+    conn.execute("INSERT INTO fichiers (name, path, file_size, owner) VALUES ('b', '/b', 5, 'bob')")
+    viewer.analytics_panel._data_version += 1
+    assert [row[0] for row in viewer._fetch_user_files("bob", "all")] == ["a", "b"]
+    assert viewer._category_files_state == (1, False)
+    # Statut modifié sans nouvelle ligne (analyse interrompue): périmée aussi
+    refresh_user_category_files(conn)
+    conn.execute("UPDATE fichiers SET status = 'error' WHERE name = 'b'")
+    viewer.analytics_panel._data_version += 1
+    assert [row[0] for row in viewer._fetch_user_files("bob", "all")] == ["a"]
+    assert viewer._category_files_state == (2, False)
+
+
+def test_user_files_streamed_in_fetchmany_batches():
+    rows = [(f"f{i}", f"/f{i}", i, "bob") for i in range(450)]
+    viewer, _ = _user_viewer(rows)
+    for _ in range(2):  # lecture SQLite puis page servie par le cache
+        sizes = []
+        page = viewer._fetch_user_files("bob", "all", on_batch=lambda b: sizes.append(len(b)))
+        assert sizes == [200, 200, 50] and len(page) == 450
+
+
+def test_debug_click_info_silent_above_debug(caplog):
+    import logging
+    from gui.analytics_panel import AnalyticsTabClickManager
+
+    class _Label:
+        click_info = {"finance_type": "invoice"}
+
+        def cget(self, option):
+            raise AssertionError("label text read outside DEBUG")
+
+    manager = AnalyticsTabClickManager.__new__(AnalyticsTabClickManager)
+    with caplog.at_level(logging.INFO, logger="gui.analytics_panel"):
+        manager._debug_click_info(_Label(), "_handle_finance_click")
+    assert caplog.records == []
+
+
+def test_user_columns_configured_by_one_script():
+    from gui.analytics_panel import (
+        UserDrillDownViewer,
+        _USER_FILES_COLUMNS,
+        _drill_columns_script,
+    )
+
+    script = _drill_columns_script(".u", _USER_FILES_COLUMNS).splitlines()
+    assert len(script) == 2 * len(UserDrillDownViewer.COLUMNS) == 12
+    assert script[6:8] == [".u heading #4 -text {Modifié}", ".u column #4 -width 150"]
@@ -2,7 +2,7 @@ import sqlite3
 from pathlib import Path
 from queue import Queue
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Iterable, Iterator
 
 
 class SQLiteConnectionManager:
@@ -26,11 +26,21 @@ class SQLiteConnectionManager:
 class SQLiteConnectionPool:
     """Simple thread-safe connection pool."""
 
-    def __init__(self, db_path: Path, pool_size: int = 5) -> None:
+    def __init__(
+        self, db_path: Path, pool_size: int = 5, pragmas: Iterable[str] = ()
+    ) -> None:
+        """``pragmas`` are run once on each connection when the pool is created."""
         self.db_path = str(db_path)
         self.pool: Queue[sqlite3.Connection] = Queue(maxsize=pool_size)
+        pragmas = tuple(pragmas)
         for _ in range(pool_size):
             conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            for pragma in pragmas:
+                try:
+                    conn.execute(pragma)
+                except sqlite3.OperationalError:
+                    # PRAGMA non supporté par cette version de SQLite
+                    pass
             self.pool.put(conn)
 
     @contextmanager
@@ -41,6 +51,23 @@ class SQLiteConnectionPool:
         finally:
             self.pool.put(conn)
 
+    def open_readonly(self, cached_statements: int = 256) -> sqlite3.Connection:
+        """Open a dedicated read-only connection for long-lived readers.
+
+        The caller owns the connection and must close it.
+        """
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=cached_statements,
+        )
+        conn.execute("PRAGMA query_only = 1")
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        return conn
+
     def close(self) -> None:
         while not self.pool.empty():
             conn = self.pool.get_nowait()
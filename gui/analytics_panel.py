@@ -2,14 +2,32 @@ from __future__ import annotations
 
 import json
 import logging
+import re
+import sqlite3
 import time
 import tkinter as tk
-from datetime import datetime, timedelta
+import bisect
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache, partial, partialmethod
+from heapq import nlargest
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 from tkinter import messagebox, ttk
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import threading
 import queue
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:  # sérialisation JSON rapide optionnelle
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +35,824 @@ from content_analyzer.modules.age_analyzer import AgeAnalyzer
 from content_analyzer.modules.size_analyzer import SizeAnalyzer
 from content_analyzer.modules.duplicate_detector import DuplicateDetector, FileInfo
 from content_analyzer.modules.db_manager import SafeDBManager as DBManager
+from content_analyzer.modules.csv_parser import (
+    USER_FILE_CATEGORIES,
+    duplicate_stats_current,
+    parse_timestamp_to_epoch,
+    user_category_files_current,
+)
+
+_DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%d",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%SZ",
+)
+
+_MB = 1024 * 1024
+# Inverse d'un Gio: multiplier plutôt que diviser à chaque formatage
+INV_GIB = 1.0 / 1073741824
+SIZE_BUCKET_LABELS = (
+    "<50MB",
+    "50-100MB",
+    "100-150MB",
+    "150-200MB",
+    "200-300MB",
+    "300-500MB",
+    ">500MB",
+)
+# Bornes inférieures (en octets) des tranches 2..7 pour bisect_right
+SIZE_BUCKET_BOUNDS = (50 * _MB, 100 * _MB, 150 * _MB, 200 * _MB, 300 * _MB, 500 * _MB)
+# Intervalle [min, max) en octets par tranche de taille (None = sans borne haute)
+_SIZE_MAP: Dict[str, Tuple[int, Optional[int]]] = dict(
+    zip(
+        SIZE_BUCKET_LABELS,
+        zip((0,) + SIZE_BUCKET_BOUNDS, SIZE_BUCKET_BOUNDS + (None,)),
+    )
+)
+
+# Type affiché par extension de fichier
+_FILE_TYPE_MAP = {
+    "pdf": "PDF",
+    "doc": "DOC",
+    "docx": "DOC",
+    "xls": "XLS",
+    "xlsx": "XLS",
+    "ppt": "PPT",
+    "pptx": "PPT",
+    "jpg": "IMG",
+    "jpeg": "IMG",
+    "png": "IMG",
+    "gif": "IMG",
+    "txt": "TXT",
+    "csv": "CSV",
+    "json": "JSON",
+    "xml": "XML",
+}
+
+# Catégories d'âge: (borne basse, borne haute) en modificateurs de date('now', ...)
+_AGE_RANGES: Dict[str, Tuple[Optional[str], Optional[str]]] = {
+    "recent_7_days": ("-7 days", None),
+    "recent_30_days": ("-30 days", "-7 days"),
+    "recent_90_days": ("-90 days", "-30 days"),
+    "old_1_year": (None, "-1 year"),
+    "old_2_years": (None, "-2 years"),
+}
+
+
+def _cutoff_date(today: date, modifier: str) -> str:
+    """Équivalent Python de ``date('now', modifier)`` (``-N days`` / ``-N years``)."""
+    amount, unit = modifier.split()
+    count = -int(amount)
+    if unit.startswith("year"):
+        try:
+            cutoff = today.replace(year=today.year - count)
+        except ValueError:
+            # 29 février -> 1er mars, comme la normalisation de SQLite
+            cutoff = date(today.year - count, 3, 1)
+    else:
+        cutoff = today - timedelta(days=count)
+    return cutoff.isoformat()
+
+
+def _age_condition(
+    date_field: str, age_category: str, threshold_days: int, now: datetime
+) -> Tuple[str, tuple]:
+    """Return the SQL range condition and bound cutoffs for an age category.
+
+    Les bornes restent au jour près (``YYYY-MM-DD``, date UTC de ``now``),
+    comme les anciennes comparaisons ``date('now', ...)`` faites en SQL.
+    """
+    if age_category == "dormant":
+        lower, upper = None, f"-{int(threshold_days)} days"
+    else:
+        lower, upper = _AGE_RANGES.get(age_category, _AGE_RANGES["old_1_year"])
+    today = now.astimezone(timezone.utc).date() if now.tzinfo else now.date()
+    conditions: List[str] = []
+    params: List[str] = []
+    if lower is not None:
+        conditions.append(f"f.{date_field} >= ?")
+        params.append(_cutoff_date(today, lower))
+    if upper is not None:
+        conditions.append(f"f.{date_field} < ?")
+        params.append(_cutoff_date(today, upper))
+    return " AND ".join(conditions), tuple(params)
+
+
+# Types juridiques qui rendent un fichier C3/RGPD "super critique"
+NDA_LIT = frozenset({"nda", "litigation"})
+
+
+def is_super_critical(cls: Optional[str], rgpd: Optional[str], legal: Optional[str]) -> bool:
+    """C3, RGPD critique et juridique sensible à la fois."""
+    return cls == "C3" and rgpd == "critical" and legal in NDA_LIT
+
+
+def is_any_critical(cls: Optional[str], rgpd: Optional[str], legal: Optional[str]) -> bool:
+    """Au moins un des trois critères de criticité."""
+    return cls == "C3" or rgpd == "critical" or legal in NDA_LIT
+
+
+# Niveaux connus des onglets thématiques (le reste est regroupé dans "Autres")
+SEC_LEVELS = frozenset({"C0", "C1", "C2", "C3"})
+RGPD_LEVELS = frozenset({"none", "low", "medium", "high", "critical"})
+FIN_TYPES = frozenset(
+    {"none", "invoice", "contract", "budget", "accounting", "payment"}
+)
+LEGAL_TYPES = frozenset(
+    {"none", "employment", "lease", "sale", "nda", "compliance", "litigation"}
+)
+
+TEMPORAL_BUCKET_KEYS = ("0_1y", "1_2y", "2_3y", "3_4y", "4_5y", "5_6y", "6plus")
+_SECONDS_PER_YEAR = 365 * 86400
+# Libellé affiché pour chaque tranche temporelle
+TEMPORAL_BUCKET_DISPLAY = {
+    "0_1y": "0-1 an",
+    "1_2y": "1-2 ans",
+    "2_3y": "2-3 ans",
+    "3_4y": "3-4 ans",
+    "4_5y": "4-5 ans",
+    "5_6y": "5-6 ans",
+    "6plus": "+6 ans",
+}
+
+# Repli du clic temporel sans click_info: "0-1" -> "0_1y", ..., "+6" -> "6plus"
+_TEMPORAL_LABEL_PERIODS = {
+    display.split()[0]: key for key, display in TEMPORAL_BUCKET_DISPLAY.items()
+}
+_TEMPORAL_LABEL_RE = re.compile("|".join(map(re.escape, _TEMPORAL_LABEL_PERIODS)))
+
+
+@lru_cache(maxsize=131072)
+def _parse_date_cached(date_str: str) -> Optional[datetime]:
+    """Parse date avec multiple formats supportés (mémoïsé par chaîne)."""
+    if not date_str or date_str in ["0", "", "NULL", "None"]:
+        return None
+
+    # Chemin rapide ISO (formats dominants) par découpage à positions fixes
+    length = len(date_str)
+    if date_str[4:5] == "-" and date_str[7:8] == "-":
+        if (
+            length in (19, 20)
+            and date_str[10] in " T"
+            and date_str[13] == ":"
+            and date_str[16] == ":"
+            and (length == 19 or date_str[19] == "Z")
+        ):
+            try:
+                return datetime(
+                    int(date_str[0:4]),
+                    int(date_str[5:7]),
+                    int(date_str[8:10]),
+                    int(date_str[11:13]),
+                    int(date_str[14:16]),
+                    int(date_str[17:19]),
+                )
+            except ValueError:
+                pass
+        elif length == 10:
+            try:
+                return datetime(
+                    int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10])
+                )
+            except ValueError:
+                pass
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+
+    try:
+        timestamp = float(date_str)
+        return datetime.fromtimestamp(timestamp)
+    except (ValueError, OSError, OverflowError):
+        pass
+
+    logger.debug(f"Format de date non reconnu: {date_str}")
+    return None
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+# Seuils et unités pré-calculés pour l'affichage lisible des tailles
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_SIZE_UNIT_BOUNDS = tuple(1024**i for i in range(1, 6))
+_SIZE_UNIT_DIVISORS = (1,) + _SIZE_UNIT_BOUNDS
+
+
+def _format_size_display(size_bytes: float) -> str:
+    """Taille lisible (``"1.5 MB"``) via une recherche de seuil, sans boucle de divisions."""
+    if not size_bytes:
+        return "0B"
+    idx = bisect.bisect_right(_SIZE_UNIT_BOUNDS, size_bytes)
+    return f"{size_bytes / _SIZE_UNIT_DIVISORS[idx]:.1f} {_SIZE_UNITS[idx]}"
+
+
+# Au-delà de ce nombre de tailles, le formatage passe par numpy
+_VECTOR_SIZE_THRESHOLD = 5000
+
+
+def _format_sizes_bulk(sizes: List[Any]) -> List[str]:
+    """Format many sizes at once; same output as :func:`_format_size_display`."""
+    if len(sizes) <= _VECTOR_SIZE_THRESHOLD:
+        return [_format_size_display(size or 0) for size in sizes]
+    values = np.fromiter((size or 0 for size in sizes), dtype=np.float64, count=len(sizes))
+    idx = np.searchsorted(_SIZE_UNIT_BOUNDS, values, side="right")
+    mantissas = (values / np.asarray(_SIZE_UNIT_DIVISORS, dtype=np.float64)[idx]).tolist()
+    units = _SIZE_UNITS
+    return [
+        f"{m:.1f} {units[i]}" if v else "0B"
+        for v, m, i in zip(values.tolist(), mantissas, idx.tolist())
+    ]
+
+
+def _truncate_display(value: Any, limit: int) -> str:
+    """Tronque un texte d'affichage en ajoutant ``...`` au-delà de ``limit``."""
+    text = str(value)
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _format_gb(size_bytes: float) -> str:
+    """Formate une taille en octets sous la forme ``"1.5GB"``."""
+    return f"{size_bytes * INV_GIB:.1f}GB"
+
+
+NO_RECOMMENDATION_TEXT = (
+    "✅ Aucune recommandation particulière - Le système fonctionne correctement"
+)
+
+# Dictionnaire vide partagé pour les lectures .get() en chaîne (lecture seule)
+_EMPTY: Dict[str, Any] = {}
+
+
+def _date_to_naive_epoch(value: Any) -> float:
+    """Scalar fallback: naive epoch seconds of a parsed date, NaN if invalid."""
+    parsed = _parse_date_cached(str(value))
+    if parsed is None:
+        return float("nan")
+    return (parsed - _EPOCH).total_seconds()
+
+
+def _parse_dates_to_epoch(values: "pd.Series") -> "pd.Series":
+    """Vectorized parse of a date column into naive epoch seconds.
+
+    Formats are tried in the same order as :func:`_parse_date_cached`; values
+    that no vectorized format matches are resolved through that scalar
+    parser (numeric timestamps, dates outside the pandas range).
+    """
+    epoch = pd.Series(float("nan"), index=values.index, dtype="float64")
+    remaining = values.notna()
+    for fmt in _DATE_FORMATS:
+        if not remaining.any():
+            break
+        parsed = pd.to_datetime(values[remaining], format=fmt, errors="coerce")
+        parsed = parsed[parsed.notna()]
+        if parsed.empty:
+            continue
+        epoch[parsed.index] = parsed.astype("datetime64[s]").astype("int64")
+        remaining[parsed.index] = False
+
+    if remaining.any():
+        epoch[remaining] = values[remaining].map(_date_to_naive_epoch)
+    return epoch
+
+
+_MODAL_BASE_QUERY = """
+        SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
+               COALESCE(r.security_classification_cached, 'none') AS classif,
+               COALESCE(r.rgpd_risk_cached, 'none') AS rgpd
+        FROM fichiers f
+        LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+        WHERE (f.status IS NULL OR f.status != 'error')
+        """
+
+# Périodes temporelles: (opérateur, jours avant maintenant)
+_TEMPORAL_PERIODS: Dict[str, Tuple[str, int]] = {
+    "last_7_days": (">=", 7),
+    "last_30_days": (">=", 30),
+    "last_90_days": (">=", 90),
+    "last_year": (">=", 365),
+    "older_1_year": ("<", 365),
+}
+
+
+def _days_ago(days: int):
+    """Parameter resolved at call time: timestamp ``days`` days before now."""
+    return lambda: (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _compose_modal_query(
+    category_type: str, category_value: str, require_positive_size: bool
+) -> Tuple[str, tuple]:
+    """Build a modal SQL template; callable params are materialized per call."""
+    conditions: List[str] = []
+    params: List[Any] = []
+    if require_positive_size:
+        conditions.append("f.file_size > 0")
+
+    if category_type == "security":
+        if category_value == "Autres":
+            # Comme l'onglet Sécurité: tout ce qui n'est pas C0-C3 (non classés inclus)
+            conditions.append(
+                "COALESCE(r.security_classification_cached, 'none') NOT IN ('C0','C1','C2','C3')"
+            )
+        elif category_value == "none":
+            conditions.append(
+                "COALESCE(r.security_classification_cached, 'none') = 'none'"
+            )
+        else:
+            # Comparaison directe pour profiter de idx_reponses_class_fichier
+            conditions.append("r.security_classification_cached = ?")
+            params.append(category_value)
+    elif category_type == "rgpd":
+        if category_value == "Autres":
+            conditions.append(
+                "COALESCE(r.rgpd_risk_cached, 'none') NOT IN ('low','medium','high','critical','none')"
+            )
+        elif category_value == "none":
+            conditions.append("COALESCE(r.rgpd_risk_cached, 'none') = 'none'")
+        else:
+            conditions.append("r.rgpd_risk_cached = ?")
+            params.append(category_value)
+    elif category_type == "size":
+        if category_value in _SIZE_MAP:
+            min_size, max_size = _SIZE_MAP[category_value]
+            if max_size is None:
+                conditions.append("f.file_size >= ?")
+                params.append(min_size)
+            else:
+                conditions.append("f.file_size >= ? AND f.file_size < ?")
+                params.extend([min_size, max_size])
+    elif category_type == "temporal":
+        date_field, period = category_value.split(":")[:2]
+        if period != "all":
+            op, days = _TEMPORAL_PERIODS.get(period, (">=", 0))
+            conditions.append(f"f.{date_field} {op} ?")
+            params.append(_days_ago(days))
+
+    query = _MODAL_BASE_QUERY
+    if conditions:
+        query += " AND " + " AND ".join(conditions)
+    query += " ORDER BY f.file_size DESC, f.id DESC"
+    return query, tuple(params)
+
+
+# Requêtes modales précompilées: même texte SQL à chaque ouverture
+_MODAL_SQL: Dict[Tuple[str, str, bool], Tuple[str, tuple]] = {
+    (category_type, value, positive): _compose_modal_query(category_type, value, positive)
+    for positive in (True, False)
+    for category_type, values in (
+        ("security", ("C0", "C1", "C2", "C3", "none", "Autres")),
+        ("rgpd", ("none", "low", "medium", "high", "critical", "Autres")),
+        ("size", SIZE_BUCKET_LABELS),
+        (
+            "temporal",
+            tuple(
+                f"{field}:{period}"
+                for field in ("last_modified", "creation_time")
+                for period in (*_TEMPORAL_PERIODS, "all")
+            ),
+        ),
+    )
+    for value in values
+}
+
+
+# Types connus par famille de document (catégorie "Autres" = tout le reste)
+_DOC_TYPE_VALUES: Dict[str, Tuple[str, ...]] = {
+    "finance": tuple(sorted(FIN_TYPES)),
+    "legal": tuple(sorted(LEGAL_TYPES)),
+}
+
+
+def _compose_doc_type_query(family: str, selector: str) -> str:
+    """Finance/legal modal SQL for 'Autres', 'none' or an exact type bound as ``?``."""
+    column = f"r.{family}_type_cached"
+    if selector == "Autres":
+        # Liste constante: SQLite la compile une fois en index éphémère (une sonde
+        # par ligne). NULL NOT IN (...) est faux: les non classés restent dans
+        # "none", comme dans le décompte de l'onglet.
+        known = ", ".join(f"'{value}'" for value in _DOC_TYPE_VALUES[family])
+        condition = f"{column} NOT IN ({known})"
+    elif selector == "none":
+        condition = f"({column} IS NULL OR {column} = 'none')"
+    else:
+        condition = f"{column} = ?"
+    return f"""
+                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
+                       COALESCE(r.security_classification_cached, 'none') AS classif,
+                       COALESCE({column}, 'none') AS {family}
+                FROM fichiers f
+                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+                WHERE (f.status IS NULL OR f.status != 'error')
+                AND f.file_size > 0
+                AND {condition}
+                ORDER BY f.file_size DESC, f.id DESC
+                """
+
+
+# Un texte SQL fixe par (famille, sélecteur): le cache de requêtes sqlite3 est réutilisé
+_DOC_TYPE_SQL: Dict[Tuple[str, str], str] = {
+    (family, selector): _compose_doc_type_query(family, selector)
+    for family in _DOC_TYPE_VALUES
+    for selector in ("Autres", "none", "exact")
+}
+
+
+# Tranches du modal temporel: (âge minimum, âge maximum) en jours, None = sans limite
+_PERIOD_DAYS: Dict[str, Tuple[int, Optional[int]]] = {
+    "0_1y": (0, 365),
+    "1_2y": (365, 730),
+    "2_3y": (730, 1095),
+    "3_4y": (1095, 1460),
+    "4_5y": (1460, 1825),
+    "5_6y": (1825, 2190),
+    "6plus": (2190, None),
+}
+
+_TEMPORAL_ROW_QUERY = """
+        SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.creation_time, f.owner,
+               COALESCE(r.security_classification_cached, 'none') AS security_class,
+               COALESCE(r.rgpd_risk_cached, 'none') AS rgpd_risk,
+               COALESCE(r.finance_type_cached, 'none') AS finance_type,
+               COALESCE(r.legal_type_cached, 'none') AS legal_type
+        FROM fichiers f
+        LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+        WHERE (f.status IS NULL OR f.status != 'error')
+        AND f.file_size > 0
+        """
+
+# Colonnes (date, repli) par type de date du modal temporel
+_TEMPORAL_DATE_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "modification": ("last_modified", "creation_time"),
+    "creation": ("creation_time", "last_modified"),
+}
+
+
+# Lignes du modal temporel à la forme standard des modales (pagination, export)
+_TEMPORAL_PAGE_QUERY = """
+        SELECT f.id, f.name, f.path, f.file_size,
+               COALESCE(NULLIF(f.last_modified, ''), f.creation_time) AS file_date,
+               f.owner,
+               COALESCE(r.security_classification_cached, 'none') AS classif,
+               COALESCE(r.rgpd_risk_cached, 'none') AS rgpd
+        FROM fichiers f
+        LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+        WHERE (f.status IS NULL OR f.status != 'error')
+        AND f.file_size > 0
+        """
+
+# Reprise après la dernière ligne (taille, id) de la page précédente
+_KEYSET_AFTER_SIZE_ID = "AND f.file_size <= ? AND (f.file_size < ? OR f.id < ?)"
+
+
+def _compose_temporal_ts_query(date_type: str, bounded: bool, keyset: bool = False) -> str:
+    """Temporal modal SQL on *_ts columns; the epoch bounds are bound parameters."""
+    date_col, fallback_col = _TEMPORAL_DATE_COLUMNS[date_type]
+    date_ts, fallback_ts = f"f.{date_col}_ts", f"f.{fallback_col}_ts"
+    if bounded:
+        condition = f"""(({date_ts} >= ? AND {date_ts} < ?)
+                 OR ({date_ts} IS NULL AND {fallback_ts} >= ? AND {fallback_ts} < ?))"""
+    else:
+        # Plus ancienne tranche: borne haute incluse, pas de borne basse
+        condition = f"""(({date_ts} <= ?)
+                 OR ({date_ts} IS NULL AND {fallback_ts} <= ?))"""
+    after = f"\n        {_KEYSET_AFTER_SIZE_ID}" if keyset else ""
+    return (
+        _TEMPORAL_PAGE_QUERY
+        + f"AND {condition}{after}\n        ORDER BY f.file_size DESC, f.id DESC"
+    )
+
+
+# Requêtes temporelles précompilées: un texte SQL stable par (type de date, borné, reprise)
+_TEMPORAL_TS_SQL: Dict[Tuple[str, bool, bool], str] = {
+    (date_type, bounded, keyset): _compose_temporal_ts_query(date_type, bounded, keyset)
+    for date_type in _TEMPORAL_DATE_COLUMNS
+    for bounded in (True, False)
+    for keyset in (False, True)
+}
+
+_TEMPORAL_FALLBACK_SQL: Dict[str, str] = {
+    date_type: _TEMPORAL_ROW_QUERY
+    + f"""AND (
+            COALESCE(f.{date_col}, f.{fallback_col}) IS NOT NULL
+            AND COALESCE(f.{date_col}, f.{fallback_col}) != ''
+        )
+        ORDER BY f.file_size DESC, f.id DESC
+        LIMIT 10000
+        """
+    for date_type, (date_col, fallback_col) in _TEMPORAL_DATE_COLUMNS.items()
+}
+
+# Bornes (min, max) de copies par niveau: un seul texte SQL pour "Nx" et "7x+"
+_DUPLICATE_MAX_COPIES = (1 << 63) - 1
+
+
+def _duplicate_level_bounds(level: str) -> Tuple[int, int]:
+    """Return the inclusive copy-count range for a duplicates level label."""
+    if level == "7x+":
+        return 7, _DUPLICATE_MAX_COPIES
+    copies = int(level.replace("x", ""))
+    return copies, copies
+
+
+# Fichiers par nombre de copies (hash + taille), groupes comptés une seule fois
+_DUPLICATE_LEVEL_QUERY = """
+            WITH dupe_groups AS (
+                SELECT fast_hash, file_size, COUNT(*) AS copy_count
+                FROM fichiers
+                WHERE (status IS NULL OR status != 'error')
+                  AND fast_hash IS NOT NULL AND fast_hash != ''
+                GROUP BY fast_hash, file_size
+                HAVING COUNT(*) BETWEEN ? AND ?
+            )
+            SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
+                   COALESCE(r.security_classification_cached, 'none') AS classif,
+                   COALESCE(r.rgpd_risk_cached, 'none') AS rgpd,
+                   g.copy_count
+            FROM dupe_groups g
+            JOIN fichiers f
+              ON f.fast_hash = g.fast_hash AND f.file_size = g.file_size
+            LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+            WHERE (f.status IS NULL OR f.status != 'error')
+            ORDER BY copy_count DESC, f.file_size DESC, f.id DESC
+            """
+
+# Même résultat lu depuis la table duplicate_stats (recalculée à l'import)
+_DUPLICATE_STATS_QUERY = """
+            SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
+                   COALESCE(r.security_classification_cached, 'none') AS classif,
+                   COALESCE(r.rgpd_risk_cached, 'none') AS rgpd,
+                   s.copy_count
+            FROM duplicate_stats s
+            JOIN fichiers f
+              ON f.fast_hash = s.fast_hash AND f.file_size = s.file_size
+            LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+            WHERE s.copy_count BETWEEN ? AND ?
+              AND (f.status IS NULL OR f.status != 'error')
+            ORDER BY copy_count DESC, f.file_size DESC, f.id DESC
+            """
+
+# Classification, RGPD et type juridique de chaque fichier en une seule passe
+_ALL_MAPS_SQL = """
+            SELECT f.id, r.security_classification_cached,
+                   r.rgpd_risk_cached, r.legal_type_cached
+            FROM fichiers f
+            LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+            """
+
+
+# Colonnes du Treeview de drill-down: (identifiant, en-tête, largeur)
+_DRILL_COLUMNS = (
+    ("Name", "Nom", 200),
+    ("Path", "Chemin", 250),
+    ("Size", "Taille", 100),
+    ("Modified", "Modifié", 120),
+    ("Classification", "Sécurité", 100),
+    ("RGPD", "RGPD", 80),
+    ("Type", "Type", 80),
+    ("Owner", "Propriétaire", 150),
+)
+
+
+# Colonnes du drill-down utilisateur: (identifiant, en-tête, largeur)
+_USER_FILES_COLUMNS = (
+    ("nom", "Nom du fichier", 200),
+    ("chemin", "Chemin", 300),
+    ("taille", "Taille", 100),
+    ("modifie", "Modifié", 150),
+    ("classification", "Classification", 100),
+    ("rgpd", "RGPD", 100),
+)
+
+
+def _drill_columns_script(
+    tree_path: str, columns: Tuple[Tuple[str, str, int], ...] = _DRILL_COLUMNS
+) -> str:
+    """Tcl script configuring every drill-down column by position (#1..#n)."""
+    return "\n".join(
+        f"{tree_path} heading #{i} -text {{{text}}}\n"
+        f"{tree_path} column #{i} -width {width}"
+        for i, (_, text, width) in enumerate(columns, start=1)
+    )
+
+
+def _file_type(filename: Optional[str]) -> str:
+    """Short display type derived from the file extension."""
+    if not filename:
+        return "Unknown"
+    ext = filename.lower().split(".")[-1] if "." in filename else ""
+    return _FILE_TYPE_MAP.get(ext, "Autres")
+
+
+def _register_display_functions(conn: sqlite3.Connection) -> None:
+    """Register the drill-down display helpers as deterministic SQL functions."""
+    conn.create_function(
+        "fmt_size", 1, lambda size: _format_size_display(size or 0), deterministic=True
+    )
+    conn.create_function(
+        "owner_or", 2, lambda owner, default: str(owner or default), deterministic=True
+    )
+    conn.create_function("ftype", 1, _file_type, deterministic=True)
+
+
+# Colonnes d'affichage calculées par SQLite, ajoutées après les colonnes brutes
+_DISPLAY_COLUMNS_SQL = "fmt_size(q.file_size), owner_or(q.owner, 'Inconnu'), ftype(q.name)"
+
+
+# Index de drill-down dont la présence dans sqlite_stat1 indique un ANALYZE déjà fait
+_ANALYZE_MARKER_INDEX = "idx_reponses_class_fichier"
+
+
+def _drill_stretch_script(
+    tree_path: str, stretch: bool, column_count: int = len(_DRILL_COLUMNS)
+) -> str:
+    """Tcl script toggling auto-stretch on every drill-down column."""
+    flag = 1 if stretch else 0
+    return "\n".join(
+        f"{tree_path} column #{i} -stretch {flag}"
+        for i in range(1, column_count + 1)
+    )
 
 
 class AnalyticsDrillDownViewer:
     """Comprehensive drill-down system for all Analytics tabs exploration."""
 
+    # En dessous de ce nombre de lignes, tout est inséré d'un coup
+    VIRTUAL_ROWS_THRESHOLD = 500
+    # Lignes ajoutées au Treeview à chaque approche de la fin de la vue
+    RENDER_BATCH = 200
+    # Lignes lues par page SQL (LIMIT/OFFSET)
+    PAGE_SIZE = 2000
+    # À partir de ce lot, colonnes masquées et non étirables pendant l'insertion
+    BULK_LAYOUT_THRESHOLD = 100
+    EXPORT_HEADERS = (
+        "Nom",
+        "Chemin",
+        "Taille",
+        "Propriétaire",
+        "Modifié",
+        "Classification",
+        "Risque RGPD",
+    )
+    # Réglages par connexion de lecture (cache 128 MiB, fenêtre mmap 1 GiB)
+    READ_PRAGMAS = (
+        "PRAGMA cache_size = -131072",
+        "PRAGMA mmap_size = 1073741824",
+        "PRAGMA temp_store = MEMORY",
+    )
+    # Bases dont les statistiques ont été vérifiées dans ce processus
+    _statistics_checked: set = set()
+    # Pages de résultats mémorisées pour les réouvertures rapides de modales
+    RESULT_CACHE_TTL = 60.0
+    # 3-4 onglets visités en alternance, avec quelques pages chacun
+    RESULT_CACHE_SIZE = 16
+
     def __init__(self, parent_analytics_panel: "AnalyticsPanel") -> None:
         self.analytics_panel = parent_analytics_panel
         self.db_manager = parent_analytics_panel.db_manager
         # Store currently displayed files for export functionality
         self.current_files: List[Dict[str, Any]] = []
+        # Lignes formatées une seule fois, montées dans le Treeview à la demande
+        self._formatted_rows: List[tuple] = []
+        self._rendered_count = 0
+        # Requête paginée en cours (LIMIT/OFFSET), pages suivantes au défilement
+        self._page_state: Optional[Dict[str, Any]] = None
+        # Connexion de lecture dédiée, conservée entre les ouvertures de modales
+        self._ro_conn: Optional[sqlite3.Connection] = None
+        self._ro_lock = threading.Lock()
+        self._last_query: Optional[Tuple[str, tuple]] = None
+        # (query, params, version des données) -> (horodatage, lignes)
+        self._result_cache: "OrderedDict[tuple, Tuple[float, List[tuple]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Modale réutilisée entre les ouvertures (masquée à la fermeture)
+        self._modal: Optional[tk.Toplevel] = None
+        self._modal_subtitle: Optional[ttk.Label] = None
+        self._modal_fixed: Tuple[Any, ...] = ()
+
+    def __del__(self) -> None:
+        # Ramasse-miettes / arrêt de l'interpréteur: pas d'accès au pool ici
+        self._close_ro_conn()
+
+    def _close_ro_conn(self) -> bool:
+        """Close the dedicated read connection; return True if one was open."""
+        lock = getattr(self, "_ro_lock", None)
+        if lock is None:
+            conn, self._ro_conn = getattr(self, "_ro_conn", None), None
+        else:
+            # Attend la fin d'une lecture en cours sur un thread de travail
+            with lock:
+                conn, self._ro_conn = self._ro_conn, None
+        if conn is None:
+            return False
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        return True
+
+    def close(self) -> None:
+        """Close the dedicated read connection, letting SQLite refresh its stats.
+
+        Called explicitly from the panel shutdown path, never from ``__del__``.
+        """
+        if not self._close_ro_conn():
+            return
+        try:
+            # PRAGMA optimize écrit dans sqlite_stat1: connexion du pool, pas la lecture seule
+            with self.db_manager._connect().get() as rw_conn:
+                rw_conn.execute("PRAGMA optimize")
+        except Exception as e:
+            logger.debug(f"PRAGMA optimize ignoré: {e}")
+
+    def _ensure_ro_conn(self) -> Optional[sqlite3.Connection]:
+        """Open the dedicated read connection on first use (caller holds _ro_lock)."""
+        if self._ro_conn is None:
+            self._ensure_statistics()
+            try:
+                conn = self.db_manager._connect().open_readonly()
+                for pragma in self.READ_PRAGMAS:
+                    conn.execute(pragma)
+                _register_display_functions(conn)
+                self._ro_conn = conn
+            except (sqlite3.Error, AttributeError) as e:
+                logger.warning(f"Connexion lecture seule indisponible: {e}")
+        return self._ro_conn
+
+    def _ensure_statistics(self) -> None:
+        """Check the drill-down index statistics once per process and database.
+
+        Le mode de journal reste géré par DBManager: le viewer ne le modifie pas.
+        """
+        db_path = str(getattr(self.db_manager, "db_path", ""))
+        if db_path in AnalyticsDrillDownViewer._statistics_checked:
+            return
+        AnalyticsDrillDownViewer._statistics_checked.add(db_path)
+        try:
+            with self.db_manager._connect().get() as conn:
+                self._analyze_if_needed(conn)
+        except (sqlite3.Error, AttributeError) as e:
+            logger.warning(f"Statistiques SQLite indisponibles: {e}")
+
+    @staticmethod
+    def _analyze_if_needed(conn: sqlite3.Connection) -> None:
+        """Run a bounded ANALYZE when the drill-down indexes have no statistics yet."""
+        try:
+            marker = conn.execute(
+                "SELECT 1 FROM sqlite_stat1 WHERE idx = ? LIMIT 1",
+                (_ANALYZE_MARKER_INDEX,),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            marker = None  # sqlite_stat1 absente: jamais analysée
+        if marker is not None:
+            return
+        # Échantillonnage borné pour rester rapide sur les grosses bases
+        conn.execute("PRAGMA analysis_limit = 1000")
+        conn.execute("ANALYZE main")
+        conn.commit()
+        logger.info("Statistiques SQLite calculées pour les index de drill-down")
+
+    def _fetch_rows(self, query: str, params: tuple) -> List[tuple]:
+        """Run a read query on the dedicated connection (pool as fallback)."""
+        with self._ro_lock:
+            ro_conn = self._ensure_ro_conn()
+            if ro_conn is not None:
+                return list(ro_conn.execute(query, params))
+        with self.db_manager._connect().get() as conn:
+            _register_display_functions(conn)
+            return list(conn.execute(query, params))
+
+    def _peek_cached(self, query: str, params: tuple) -> Optional[List[tuple]]:
+        """Return a still-valid cached page, or None without touching SQLite."""
+        key = (query, params, getattr(self.analytics_panel, "_data_version", 0))
+        with self._cache_lock:
+            hit = self._result_cache.get(key)
+            if hit and time.time() - hit[0] < self.RESULT_CACHE_TTL:
+                self._result_cache.move_to_end(key)
+                return hit[1]
+        return None
+
+    def _fetch_cached(self, query: str, params: tuple) -> List[tuple]:
+        """Serve recently fetched pages from memory while the data version is unchanged."""
+        rows = self._peek_cached(query, params)
+        if rows is not None:
+            return rows
+        version = getattr(self.analytics_panel, "_data_version", 0)
+        key = (query, params, version)
+        now = time.time()
+        rows = self._fetch_rows(query, params)
+        with self._cache_lock:
+            self._result_cache[key] = (now, rows)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return rows
 
     # ------------------------------------------------------------------
     # Base modal creation helpers
@@ -42,51 +868,12 @@ class AnalyticsDrillDownViewer:
                 logger.error("Parent window non disponible pour la modale")
                 raise ValueError("Parent window indisponible")
 
-            modal = tk.Toplevel(self.analytics_panel.parent)
-            modal.title(title)
-            modal.withdraw()
-            modal.geometry("1200x700")
-            modal.transient(self.analytics_panel.parent)
-            modal.resizable(True, True)
-
-            header_frame = ttk.Frame(modal)
-            header_frame.pack(fill="x", padx=10, pady=5)
-            ttk.Label(header_frame, text=subtitle, font=("Arial", 11, "bold")).pack(
-                anchor="w"
-            )
-
-            self._build_drill_down_treeview(modal)
-
-            buttons_frame = ttk.Frame(modal)
-            buttons_frame.pack(fill="x", padx=10, pady=5)
-            ttk.Button(
-                buttons_frame,
-                text="📊 Export Liste",
-                command=self._export_filtered_files,
-            ).pack(side="left", padx=5)
-            ttk.Button(buttons_frame, text="❌ Fermer", command=modal.destroy).pack(
-                side="right", padx=5
-            )
-
-            modal.update_idletasks()
-            x = (modal.winfo_screenwidth() // 2) - (1200 // 2)
-            y = (modal.winfo_screenheight() // 2) - (700 // 2)
-            modal.geometry(f"1200x700+{x}+{y}")
-
-            modal.deiconify()
-            modal.lift()
-            modal.focus_set()
-
-            def apply_modal_grab():
-                try:
-                    if modal.winfo_exists():
-                        modal.grab_set()
-                        logger.info(f"Modal grab applied successfully for: {title}")
-                except Exception as e:
-                    logger.warning(f"Modal grab application failed: {e}")
-
-            modal.after(50, apply_modal_grab)
-            logger.info(f"Modal window created successfully: {title}")
+            modal = self._modal
+            if modal is not None and modal.winfo_exists():
+                self._reset_modal(modal, title, subtitle)
+            else:
+                modal = self._build_base_modal(title, subtitle)
+            self._show_modal(modal, title)
             return modal
 
         except Exception as e:
@@ -98,39 +885,106 @@ class AnalyticsDrillDownViewer:
             )
             raise
 
+    def _build_base_modal(self, title: str, subtitle: str) -> tk.Toplevel:
+        """Build the drill-down window once; later opens reuse it."""
+        modal = tk.Toplevel(self.analytics_panel.parent)
+        modal.title(title)
+        modal.withdraw()
+        modal.geometry("1200x700")
+        modal.transient(self.analytics_panel.parent)
+        modal.resizable(True, True)
+
+        header_frame = ttk.Frame(modal)
+        header_frame.pack(fill="x", padx=10, pady=5)
+        self._modal_subtitle = ttk.Label(
+            header_frame, text=subtitle, font=("Arial", 11, "bold")
+        )
+        self._modal_subtitle.pack(anchor="w")
+
+        self._build_drill_down_treeview(modal)
+
+        buttons_frame = ttk.Frame(modal)
+        buttons_frame.pack(fill="x", padx=10, pady=5)
+        ttk.Button(
+            buttons_frame,
+            text="📊 Export Liste",
+            command=self._export_filtered_files,
+        ).pack(side="left", padx=5)
+        ttk.Button(buttons_frame, text="❌ Fermer", command=self._hide_modal).pack(
+            side="right", padx=5
+        )
+        modal.protocol("WM_DELETE_WINDOW", self._hide_modal)
+
+        modal.update_idletasks()
+        x = (modal.winfo_screenwidth() // 2) - (1200 // 2)
+        y = (modal.winfo_screenheight() // 2) - (700 // 2)
+        modal.geometry(f"1200x700+{x}+{y}")
+
+        self._modal = modal
+        self._modal_fixed = (header_frame, self.drill_tree.master, buttons_frame)
+        logger.info(f"Modal window created successfully: {title}")
+        return modal
+
+    def _reset_modal(self, modal: tk.Toplevel, title: str, subtitle: str) -> None:
+        """Clear the reused modal before loading a new category."""
+        self._page_state = None
+        self._last_query = None
+        for child in modal.winfo_children():
+            if child not in self._modal_fixed:
+                child.destroy()  # libellés de progression restants
+        tree = self.drill_tree
+        tree.delete(*tree.get_children())
+        self._formatted_rows = []
+        self._rendered_count = 0
+        self.current_files = []
+        modal.title(title)
+        self._modal_subtitle.config(text=subtitle)
+
+    def _show_modal(self, modal: tk.Toplevel, title: str) -> None:
+        """Show the modal, grabbing input only when it was hidden."""
+        was_hidden = modal.state() == "withdrawn"
+        modal.deiconify()
+        modal.lift()
+        modal.focus_set()
+        if not was_hidden:
+            return
+
+        def apply_modal_grab():
+            try:
+                if modal.winfo_exists():
+                    modal.grab_set()
+                    logger.info(f"Modal grab applied successfully for: {title}")
+            except Exception as e:
+                logger.warning(f"Modal grab application failed: {e}")
+
+        modal.after(50, apply_modal_grab)
+
+    def _hide_modal(self) -> None:
+        """Hide the modal instead of destroying it so the next open reuses it."""
+        modal = self._modal
+        self._page_state = None
+        if modal is None:
+            return
+        try:
+            modal.grab_release()
+            modal.withdraw()
+        except tk.TclError:
+            self._modal = None
+
     def _build_drill_down_treeview(self, parent_window: tk.Toplevel) -> None:
         """Build treeview for file exploration."""
 
         tree_frame = ttk.Frame(parent_window)
         tree_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
-        columns = (
-            "Name",
-            "Path",
-            "Size",
-            "Modified",
-            "Classification",
-            "RGPD",
-            "Type",
-            "Owner",
-        )
-
         self.drill_tree = ttk.Treeview(
-            tree_frame, columns=columns, show="headings", height=20
+            tree_frame,
+            columns=tuple(col for col, _, _ in _DRILL_COLUMNS),
+            show="headings",
+            height=20,
         )
-        column_configs = {
-            "Name": {"width": 200, "text": "Nom"},
-            "Path": {"width": 250, "text": "Chemin"},
-            "Size": {"width": 100, "text": "Taille"},
-            "Modified": {"width": 120, "text": "Modifié"},
-            "Classification": {"width": 100, "text": "Sécurité"},
-            "RGPD": {"width": 80, "text": "RGPD"},
-            "Type": {"width": 80, "text": "Type"},
-            "Owner": {"width": 150, "text": "Propriétaire"},
-        }
-        for col, config in column_configs.items():
-            self.drill_tree.heading(col, text=config["text"])
-            self.drill_tree.column(col, width=config["width"])
+        # Toutes les colonnes configurées en un seul aller-retour Tcl
+        self.drill_tree.tk.eval(_drill_columns_script(self.drill_tree._w))
 
         v_scrollbar = ttk.Scrollbar(
             tree_frame, orient="vertical", command=self.drill_tree.yview
@@ -138,8 +992,9 @@ class AnalyticsDrillDownViewer:
         h_scrollbar = ttk.Scrollbar(
             tree_frame, orient="horizontal", command=self.drill_tree.xview
         )
+        self._v_scrollbar = v_scrollbar
         self.drill_tree.configure(
-            yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set
+            yscrollcommand=self._on_tree_yview, xscrollcommand=h_scrollbar.set
         )
 
         self.drill_tree.grid(row=0, column=0, sticky="nsew")
@@ -152,40 +1007,57 @@ class AnalyticsDrillDownViewer:
         self.drill_tree.bind("<Double-1>", self._on_file_double_click)
         self.drill_tree.bind("<Button-3>", self._show_file_context_menu)
 
+    def _set_tree_rows(self, formatted_rows: List[tuple]) -> None:
+        """Replace treeview content, mounting only the first rows of large results."""
+        tree = self.drill_tree
+        tree.delete(*tree.get_children())
+        self._formatted_rows = formatted_rows
+        self._rendered_count = 0
+        if len(formatted_rows) < self.VIRTUAL_ROWS_THRESHOLD:
+            self._render_more(len(formatted_rows))
+        else:
+            self._render_more(self.RENDER_BATCH)
+
+    def _render_more(self, count: int) -> None:
+        """Insert the next ``count`` pre-formatted rows into the treeview."""
+        start = self._rendered_count
+        end = min(start + count, len(self._formatted_rows))
+        # Appel Tcl direct: évite la construction des options de Treeview.insert
+        tree = self.drill_tree
+        call, widget = tree.tk.call, tree._w
+        if end - start < self.BULK_LAYOUT_THRESHOLD:
+            for values in self._formatted_rows[start:end]:
+                call(widget, "insert", "", "end", "-values", values)
+            self._rendered_count = end
+            return
+        # Gros lot: une seule passe de mise en page après l'insertion
+        call(widget, "configure", "-displaycolumns", "")
+        tree.tk.eval(_drill_stretch_script(widget, False))
+        try:
+            for values in self._formatted_rows[start:end]:
+                call(widget, "insert", "", "end", "-values", values)
+        finally:
+            call(widget, "configure", "-displaycolumns", "#all")
+            tree.tk.eval(_drill_stretch_script(widget, True))
+        self._rendered_count = end
+
+    def _on_tree_yview(self, first: str, last: str) -> None:
+        """Scrollbar callback: mount more rows when the view nears the end."""
+        self._v_scrollbar.set(first, last)
+        if float(last) > 0.9:
+            if self._rendered_count < len(self._formatted_rows):
+                self._render_more(self.RENDER_BATCH)
+            else:
+                self._request_next_page()
+
     # ------------------------------------------------------------------
     # Helper utilities
     # ------------------------------------------------------------------
     def _format_file_size(self, size_bytes: int) -> str:
-        if not size_bytes:
-            return "0B"
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+        return _format_size_display(size_bytes)
 
     def _get_file_type(self, filename: str) -> str:
-        if not filename:
-            return "Unknown"
-        ext = filename.lower().split(".")[-1] if "." in filename else ""
-        type_map = {
-            "pdf": "PDF",
-            "doc": "DOC",
-            "docx": "DOC",
-            "xls": "XLS",
-            "xlsx": "XLS",
-            "ppt": "PPT",
-            "pptx": "PPT",
-            "jpg": "IMG",
-            "jpeg": "IMG",
-            "png": "IMG",
-            "gif": "IMG",
-            "txt": "TXT",
-            "csv": "CSV",
-            "json": "JSON",
-            "xml": "XML",
-        }
-        return type_map.get(ext, "Autres")
+        return _file_type(filename)
 
     # ------------------------------------------------------------------
     # Unified modal query builder
@@ -194,90 +1066,99 @@ class AnalyticsDrillDownViewer:
         self,
         category_type: str,
         category_value: str,
+        require_positive_size: bool = True,
     ) -> tuple[str, tuple]:
         """Return SQL query and parameters for a given modal category."""
+        key = (category_type, category_value, require_positive_size)
+        template = _MODAL_SQL.get(key)
+        if template is None:
+            template = _compose_modal_query(*key)
+        query, params = template
+        return query, tuple(p() if callable(p) else p for p in params)
+
+    @classmethod
+    def _write_csv_rows(cls, filename: str, rows: Iterable[tuple]) -> None:
+        """Write export rows to CSV in one buffered writerows call."""
+        import csv
+
+        with open(
+            filename, "w", newline="", encoding="utf-8", buffering=1 << 20
+        ) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(cls.EXPORT_HEADERS)
+            writer.writerows(rows)
+
+    @classmethod
+    def _write_files_csv(cls, filename: str, files: Iterable[Dict[str, Any]]) -> None:
+        """Write exported file dicts to CSV."""
+        cls._write_csv_rows(
+            filename,
+            (
+                (
+                    d.get("name", ""),
+                    d.get("path", ""),
+                    d.get("file_size", 0),
+                    d.get("owner", ""),
+                    d.get("last_modified", ""),
+                    d.get("classif", ""),
+                    d.get("rgpd", ""),
+                )
+                for d in files
+            ),
+        )
 
-        base_query = """
-        SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-               COALESCE(r.security_classification_cached, 'none') AS classif,
-               COALESCE(r.rgpd_risk_cached, 'none') AS rgpd
-        FROM fichiers f
-        LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-        WHERE (f.status IS NULL OR f.status != 'error')
-        """
+    def _export_query_csv(self, filename: str, query: str, params: tuple) -> None:
+        """Stream the full modal query result from the cursor into the CSV file."""
+        # Colonnes modales: id, name, path, size, date, owner[, classif, rgpd]
+        def remap(cursor):
+            for row in cursor:
+                yield (
+                    row[1],
+                    row[2],
+                    row[3],
+                    row[5],
+                    row[4],
+                    row[6] if len(row) > 6 else "N/A",
+                    row[7] if len(row) > 7 else "N/A",
+                )
 
-        conditions: list[str] = []
-        params: list[Any] = []
+        with self._ro_lock:
+            ro_conn = self._ensure_ro_conn()
+            if ro_conn is not None:
+                self._write_csv_rows(filename, remap(ro_conn.execute(query, params)))
+                return
+        with self.db_manager._connect().get() as conn:
+            self._write_csv_rows(filename, remap(conn.execute(query, params)))
 
-        if category_type == "security":
-            if category_value == "Autres":
-                conditions.append(
-                    "COALESCE(r.security_classification_cached, 'none') NOT IN ('C0','C1','C2','C3','none')"
-                )
-            elif category_value == "none":
-                conditions.append(
-                    "COALESCE(r.security_classification_cached, 'none') = 'none'"
-                )
-            else:
-                conditions.append(
-                    "COALESCE(r.security_classification_cached, 'none') = ?"
-                )
-                params.append(category_value)
-        elif category_type == "rgpd":
-            if category_value == "Autres":
-                conditions.append(
-                    "COALESCE(r.rgpd_risk_cached, 'none') NOT IN ('low','medium','high','critical','none')"
-                )
-            elif category_value == "none":
-                conditions.append("COALESCE(r.rgpd_risk_cached, 'none') = 'none'")
-            else:
-                conditions.append("COALESCE(r.rgpd_risk_cached, 'none') = ?")
-                params.append(category_value)
-        elif category_type == "size":
-            size_map = {
-                "<50MB": (0, 50 * 1024 * 1024),
-                "50-100MB": (50 * 1024 * 1024, 100 * 1024 * 1024),
-                "100-150MB": (100 * 1024 * 1024, 150 * 1024 * 1024),
-                "150-200MB": (150 * 1024 * 1024, 200 * 1024 * 1024),
-                "200-300MB": (200 * 1024 * 1024, 300 * 1024 * 1024),
-                "300-500MB": (300 * 1024 * 1024, 500 * 1024 * 1024),
-                ">500MB": (500 * 1024 * 1024, float("inf")),
-            }
-            if category_value in size_map:
-                min_size, max_size = size_map[category_value]
-                if max_size == float("inf"):
-                    conditions.append("f.file_size >= ?")
-                    params.append(min_size)
-                else:
-                    conditions.append("f.file_size >= ? AND f.file_size < ?")
-                    params.extend([min_size, max_size])
-        elif category_type == "temporal":
-            now = datetime.now()
-            date_field = category_value.split(":")[0]
-            period = category_value.split(":")[1]
-            mapping = {
-                "last_7_days": now - timedelta(days=7),
-                "last_30_days": now - timedelta(days=30),
-                "last_90_days": now - timedelta(days=90),
-                "last_year": now - timedelta(days=365),
-            }
-            if period == "older_1_year":
-                conditions.append(f"f.{date_field} < ?")
-                params.append((now - timedelta(days=365)).strftime("%Y-%m-%d %H:%M:%S"))
-            elif period == "all":
-                pass
-            else:
-                cutoff = mapping.get(period, now)
-                conditions.append(f"f.{date_field} >= ?")
-                params.append(cutoff.strftime("%Y-%m-%d %H:%M:%S"))
+    def _run_in_worker(
+        self, func: Callable[..., Any], args: tuple, on_done: Callable[[Any], None]
+    ) -> None:
+        """Run ``func`` off the Tk thread, then hand its result to ``on_done`` on it.
 
-        if conditions:
-            query = base_query + " AND " + " AND ".join(conditions)
-        else:
-            query = base_query
+        ``on_done`` reçoit la valeur retournée ou l'exception levée par ``func``.
+        """
+        result_queue: "queue.Queue[Any]" = queue.Queue(maxsize=1)
+        parent = self.analytics_panel.parent
 
-        query += " ORDER BY f.file_size DESC"
-        return query, tuple(params)
+        def worker() -> None:
+            try:
+                result_queue.put(func(*args))
+            except Exception as exc:
+                result_queue.put(exc)
+
+        def poll() -> None:
+            try:
+                result = result_queue.get_nowait()
+            except queue.Empty:
+                try:
+                    parent.after(50, poll)
+                except tk.TclError:
+                    pass  # fenêtre principale détruite entre-temps
+                return
+            on_done(result)
+
+        threading.Thread(target=worker, daemon=True).start()
+        parent.after(50, poll)
 
     def _export_filtered_files(self) -> None:  # pragma: no cover - UI
         """Export filtered files with proper window Z-order management."""
@@ -304,59 +1185,16 @@ class AnalyticsDrillDownViewer:
             )
 
             if filename:
-                import csv
-
-                with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-                    writer = csv.writer(csvfile)
-                    headers = [
-                        "Nom",
-                        "Chemin",
-                        "Taille",
-                        "Propriétaire",
-                        "Modifié",
-                        "Classification",
-                        "Risque RGPD",
-                    ]
-                    writer.writerow(headers)
-                    for file_data in self.current_files:
-                        writer.writerow(
-                            [
-                                file_data.get("name", ""),
-                                file_data.get("path", ""),
-                                file_data.get("file_size", 0),
-                                file_data.get("owner", ""),
-                                file_data.get("last_modified", ""),
-                                file_data.get("classif", ""),
-                                file_data.get("rgpd", ""),
-                            ]
-                        )
-
-                success_window = tk.Toplevel(self.analytics_panel.parent)
-                success_window.title("Export Réussi")
-                success_window.geometry("400x150")
-                success_window.transient(self.analytics_panel.parent)
-                success_window.lift()
-                success_window.focus_set()
-                success_window.attributes("-topmost", True)
-                success_window.grab_set()
-                success_window.after(
-                    100, lambda: success_window.attributes("-topmost", False)
-                )
-
-                ttk.Label(
-                    success_window, text="✅ Export réussi!", font=("Arial", 12, "bold")
-                ).pack(pady=20)
-                ttk.Label(success_window, text=f"Fichier: {filename}").pack(pady=5)
-                ttk.Button(
-                    success_window,
-                    text="OK",
-                    command=lambda: [
-                        success_window.grab_release(),
-                        success_window.destroy(),
-                    ],
-                ).pack(pady=10)
-
-                logger.info(f"Files exported successfully to: {filename}")
+                if self._last_query is not None:
+                    # Requête complète potentiellement longue: hors du thread Tk
+                    self._run_in_worker(
+                        self._export_query_csv,
+                        (filename, *self._last_query),
+                        lambda result: self._on_export_done(filename, result),
+                    )
+                else:
+                    self._write_files_csv(filename, self.current_files)
+                    self._on_export_done(filename, None)
 
         except Exception as e:
             logger.error(f"Failed to export files: {e}")
@@ -366,22 +1204,102 @@ class AnalyticsDrillDownViewer:
                 parent=self.analytics_panel.parent,
             )
 
-    def _on_file_double_click(self, event):  # pragma: no cover - UI
-        selection = self.drill_tree.selection()
-        if selection:
-            item = self.drill_tree.item(selection[0])
-            filename = item["values"][0]
-            messagebox.showinfo("Fichier", f"Ouverture de: {filename}")
-
-    def _show_file_context_menu(self, event):  # pragma: no cover - UI
-        pass
-
+    def _on_export_done(self, filename: str, result: Any) -> None:  # pragma: no cover - UI
+        """Show the export outcome once the CSV has been written (Tk thread)."""
+        try:
+            if isinstance(result, Exception):
+                raise result
+            success_window = tk.Toplevel(self.analytics_panel.parent)
+            success_window.title("Export Réussi")
+            success_window.geometry("400x150")
+            success_window.transient(self.analytics_panel.parent)
+            success_window.lift()
+            success_window.focus_set()
+            success_window.attributes("-topmost", True)
+            success_window.grab_set()
+            success_window.after(
+                100, lambda: success_window.attributes("-topmost", False)
+            )
+
+            ttk.Label(
+                success_window, text="✅ Export réussi!", font=("Arial", 12, "bold")
+            ).pack(pady=20)
+            ttk.Label(success_window, text=f"Fichier: {filename}").pack(pady=5)
+            ttk.Button(
+                success_window,
+                text="OK",
+                command=lambda: [
+                    success_window.grab_release(),
+                    success_window.destroy(),
+                ],
+            ).pack(pady=10)
+
+            logger.info(f"Files exported successfully to: {filename}")
+
+        except Exception as e:
+            logger.error(f"Failed to export files: {e}")
+            messagebox.showerror(
+                "Erreur Export",
+                f"Échec de l'export:\n{str(e)}",
+                parent=self.analytics_panel.parent,
+            )
+
+    def _on_file_double_click(self, event):  # pragma: no cover - UI
+        selection = self.drill_tree.selection()
+        if selection:
+            item = self.drill_tree.item(selection[0])
+            filename = item["values"][0]
+            message = f"Ouverture de: {filename}"
+            index = self.drill_tree.index(selection[0])
+            if index >= len(self.current_files):
+                messagebox.showinfo("Fichier", message)
+                return
+            # Lecture du résumé hors du thread Tk, affichage au retour du worker
+            self._run_in_worker(
+                self._fetch_document_resume,
+                (self.current_files[index].get("id"),),
+                lambda resume: self._show_file_message(message, resume),
+            )
+
+    @staticmethod
+    def _show_file_message(message: str, resume: Any) -> None:  # pragma: no cover - UI
+        if resume and not isinstance(resume, Exception):
+            message += f"\n\nRésumé:\n{resume}"
+        messagebox.showinfo("Fichier", message)
+
+    def _fetch_document_resume(self, file_id: Optional[int]) -> Optional[str]:
+        """Lit le résumé d'un seul fichier à la demande (absent des requêtes de liste)."""
+        if file_id is None:
+            return None
+        try:
+            rows = self._fetch_rows(
+                "SELECT document_resume FROM reponses_llm WHERE fichier_id = ? LIMIT 1",
+                (file_id,),
+            )
+        except Exception as e:
+            logger.warning(f"Résumé indisponible pour le fichier {file_id}: {e}")
+            return None
+        return rows[0][0] if rows else None
+
+    def _show_file_context_menu(self, event):  # pragma: no cover - UI
+        pass
+
     # ------------------------------------------------------------------
     # Data loading helpers for each tab type
     # ------------------------------------------------------------------
     def _load_filtered_files(
-        self, modal: tk.Toplevel, query: str, params: tuple, category: str
+        self,
+        modal: tk.Toplevel,
+        query: str,
+        params: tuple,
+        category: str,
+        keyset_query: Optional[str] = None,
     ) -> None:
+        """Run the modal query on a worker thread and fill the tree when done.
+
+        ``keyset_query`` (ordered by size then id, extra ``size, size, id``
+        params) resumes later pages after the last row instead of OFFSET.
+        """
         try:
             if not self.db_manager:
                 logger.warning("No database manager available for filtered files")
@@ -395,92 +1313,291 @@ class AnalyticsDrillDownViewer:
             progress_label = ttk.Label(modal, text="🔄 Chargement des données...")
             progress_label.pack(pady=10)
             modal.update_idletasks()
+        except Exception as e:
+            logger.error(f"Critical error in _load_filtered_files: {e}")
+            messagebox.showerror(
+                "Erreur Chargement",
+                f"Erreur lors du chargement des fichiers:\n{str(e)}",
+                parent=modal,
+            )
+            return
 
-            with self.db_manager._connect().get() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+        self._last_query = (query, tuple(params))
+        self._page_state = {
+            "modal": modal,
+            "progress_label": progress_label,
+            "query": query,
+            "params": tuple(params),
+            "category": category,
+            "tree": self.drill_tree,
+            "offset": 0,
+            "keyset_query": keyset_query,
+            "after": None,
+            "has_more": False,
+            "loading": False,
+        }
+        self._fetch_page(self._page_state)
+
+    def _fetch_page(self, state: Dict[str, Any]) -> None:
+        """Fetch the next result page on a worker thread, then poll for it."""
+        state["loading"] = True
+        result_queue: queue.Queue = queue.Queue(maxsize=1)
+        # Les colonnes d'affichage sont calculées par SQLite sur la page seulement
+        if state["after"] is not None:
+            size, file_id = state["after"]
+            paged_query = (
+                f"SELECT q.*, {_DISPLAY_COLUMNS_SQL} "
+                f"FROM ({state['keyset_query']} LIMIT ?) q"
+            )
+            paged_params = state["params"] + (size, size, file_id, self.PAGE_SIZE)
+        else:
+            paged_query = (
+                f"SELECT q.*, {_DISPLAY_COLUMNS_SQL} "
+                f"FROM ({state['query']} LIMIT ? OFFSET ?) q"
+            )
+            paged_params = state["params"] + (self.PAGE_SIZE, state["offset"])
+        modal = state["modal"]
+        progress_label = state["progress_label"]
+        started = time.time()
+
+        def worker() -> None:
+            try:
+                result_queue.put(self._fetch_cached(paged_query, paged_params))
+            except Exception as exc:  # pragma: no cover - runtime
+                result_queue.put(exc)
+
+        def poll() -> None:
+            try:
+                if (
+                    not modal.winfo_exists()
+                    or self._page_state is not state
+                    or self.drill_tree is not state["tree"]
+                ):
+                    return  # modale fermée ou remplacée entre-temps
+                try:
+                    result = result_queue.get_nowait()
+                except queue.Empty:
+                    if state["offset"] == 0:
+                        progress_label.config(
+                            text=f"🔄 Chargement des données... {time.time() - started:.1f}s"
+                        )
+                    modal.after(50, poll)
+                    return
+                state["loading"] = False
+                if isinstance(result, Exception):
+                    raise result
+                first_page = state["offset"] == 0
+                state["offset"] += len(result)
+                state["has_more"] = len(result) == self.PAGE_SIZE
+                if state["keyset_query"] and result:
+                    state["after"] = (result[-1][3], result[-1][0])
+                if first_page:
+                    self._populate_filtered_rows(
+                        modal,
+                        progress_label,
+                        result,
+                        state["query"],
+                        state["params"],
+                        state["category"],
+                    )
+                else:
+                    self._append_filtered_rows(result)
+            except tk.TclError:
+                return
+            except Exception as e:
+                logger.error(f"Critical error in _load_filtered_files: {e}")
+                if state["offset"] == 0:
+                    progress_label.config(text=f"❌ Erreur: {str(e)}")
+                messagebox.showerror(
+                    "Erreur Chargement",
+                    f"Erreur lors du chargement des fichiers:\n{str(e)}",
+                    parent=modal,
+                )
+
+        cached = self._peek_cached(paged_query, paged_params)
+        if cached is not None:
+            # Page déjà en mémoire: affichage immédiat, sans thread ni attente
+            result_queue.put(cached)
+            poll()
+            return
+        threading.Thread(target=worker, daemon=True).start()
+        modal.after(50, poll)
+
+    def _request_next_page(self) -> None:
+        """Load the next result page if the current query has more rows."""
+        state = self._page_state
+        if state and state["has_more"] and not state["loading"]:
+            self._fetch_page(state)
 
-                logger.info(f"Query executed: {query[:100]}... with params: {params}")
-                logger.info(f"Results found: {len(rows)} rows")
+    def _populate_filtered_rows(
+        self,
+        modal: tk.Toplevel,
+        progress_label: ttk.Label,
+        rows: List[tuple],
+        query: str,
+        params: tuple,
+        category: str,
+    ) -> None:
+        """Format query rows once and hand them to the treeview."""
+        logger.info(f"Query executed: {query[:100]}... with params: {params}")
+        logger.info(f"Results found: {len(rows)} rows")
+
+        if not rows:
+            progress_label.config(text="ℹ️ Aucun fichier trouvé pour ces critères")
+            logger.warning(f"No results for query: {query[:100]}... params: {params}")
+            return
 
-                if not rows:
-                    progress_label.config(
-                        text="ℹ️ Aucun fichier trouvé pour ces critères"
+        formatted_rows, self.current_files = self._format_filtered_rows(
+            rows, with_display=True
+        )
+        self._set_tree_rows(formatted_rows)
+        suffix = "+" if len(rows) == self.PAGE_SIZE else ""
+        progress_label.config(
+            text=f"✅ {len(rows)}{suffix} fichiers chargés - {category}"
+        )
+        modal.after(3000, progress_label.destroy)
+
+    def _append_filtered_rows(self, rows: List[tuple]) -> None:
+        """Append a further result page to the loaded rows."""
+        formatted_rows, files = self._format_filtered_rows(rows, with_display=True)
+        self._formatted_rows.extend(formatted_rows)
+        self.current_files.extend(files)
+        logger.info(f"Page loaded: {len(rows)} rows, total {len(self.current_files)}")
+        self._render_more(self.RENDER_BATCH)
+
+    def _format_filtered_rows(
+        self, rows: List[tuple], with_display: bool = False
+    ) -> Tuple[List[tuple], List[Dict[str, Any]]]:
+        """Format query rows into treeview values and export dicts.
+
+        With ``with_display`` each row ends with the size, owner and type
+        columns already computed by the SQL display functions.
+        """
+        if with_display:
+            return self._format_display_rows(rows)
+        fmt_size, truncate = _format_size_display, _truncate_display
+        if all(len(row) == 8 for row in rows):
+            # Chemin rapide: forme standard des requêtes modales, une passe par liste
+            try:
+                size_strs = _format_sizes_bulk([row[3] for row in rows])
+                formatted_rows = [
+                    (
+                        truncate(name, 50),
+                        truncate(path, 80),
+                        size_str,
+                        modified[:19] if modified else "N/A",
+                        classif,
+                        rgpd,
+                        "",
+                        str(owner or "Inconnu"),
                     )
-                    logger.warning(
-                        f"No results for query: {query[:100]}... params: {params}"
+                    for (_id, name, path, _size, modified, owner, classif, rgpd), size_str in zip(
+                        rows, size_strs
                     )
-                    return
+                ]
+                files = [
+                    {
+                        "id": file_id,
+                        "name": name,
+                        "path": path,
+                        "file_size": size,
+                        "last_modified": modified,
+                        "owner": owner,
+                        "classif": classif,
+                        "rgpd": rgpd,
+                    }
+                    for file_id, name, path, size, modified, owner, classif, rgpd in rows
+                ]
+                return formatted_rows, files
+            except Exception as fast_error:
+                logger.debug(f"Formatage rapide impossible, repli ligne à ligne: {fast_error}")
 
-                for item in self.drill_tree.get_children():
-                    self.drill_tree.delete(item)
+        files = []
+        formatted_rows = []
+        for row in rows:
+            try:
+                if len(row) >= 6:
+                    file_id, name, path, size, modified, owner = row[:6]
+                    classif = row[6] if len(row) > 6 else "N/A"
+                    rgpd = row[7] if len(row) > 7 else "N/A"
 
-                self.current_files = []
-                for row in rows:
-                    try:
-                        if len(row) >= 6:
-                            file_id, name, path, size, modified, owner = row[:6]
-                            classif = row[6] if len(row) > 6 else "N/A"
-                            rgpd = row[7] if len(row) > 7 else "N/A"
-
-                            size_str = self._format_file_size(size or 0)
-                            modified_str = modified[:19] if modified else "N/A"
-                            name_str = (
-                                str(name)[:50] + "..."
-                                if len(str(name)) > 50
-                                else str(name)
-                            )
-                            path_str = (
-                                str(path)[:80] + "..."
-                                if len(str(path)) > 80
-                                else str(path)
-                            )
-                            owner_str = str(owner or "Inconnu")
-
-                            self.drill_tree.insert(
-                                "",
-                                "end",
-                                values=(
-                                    name_str,
-                                    path_str,
-                                    size_str,
-                                    modified_str,
-                                    classif,
-                                    rgpd,
-                                    "",
-                                    owner_str,
-                                ),
-                            )
+                    size_str = fmt_size(size or 0)
+                    modified_str = modified[:19] if modified else "N/A"
+                    name_str = truncate(name, 50)
+                    path_str = truncate(path, 80)
+                    owner_str = str(owner or "Inconnu")
+
+                    formatted_rows.append(
+                        (
+                            name_str,
+                            path_str,
+                            size_str,
+                            modified_str,
+                            classif,
+                            rgpd,
+                            "",
+                            owner_str,
+                        )
+                    )
 
-                            self.current_files.append(
-                                {
-                                    "name": name,
-                                    "path": path,
-                                    "file_size": size,
-                                    "last_modified": modified,
-                                    "owner": owner,
-                                    "classif": classif,
-                                    "rgpd": rgpd,
-                                }
-                            )
-                    except Exception as row_error:
-                        logger.warning(f"Erreur traitement ligne: {row_error}")
-                        continue
+                    files.append(
+                        {
+                            "id": file_id,
+                            "name": name,
+                            "path": path,
+                            "file_size": size,
+                            "last_modified": modified,
+                            "owner": owner,
+                            "classif": classif,
+                            "rgpd": rgpd,
+                        }
+                    )
+            except Exception as row_error:
+                logger.warning(f"Erreur traitement ligne: {row_error}")
+                continue
 
-                progress_label.config(
-                    text=f"✅ {len(rows)} fichiers chargés - {category}"
+        return formatted_rows, files
+
+    def _format_display_rows(
+        self, rows: List[tuple]
+    ) -> Tuple[List[tuple], List[Dict[str, Any]]]:
+        """Build treeview values from rows carrying SQL-computed display columns."""
+        truncate = _truncate_display
+        formatted_rows: List[tuple] = []
+        files: List[Dict[str, Any]] = []
+        for row in rows:
+            try:
+                file_id, name, path, size, modified, owner = row[:6]
+                size_disp, owner_disp, type_disp = row[-3:]
+                classif = row[6] if len(row) > 9 else "N/A"
+                rgpd = row[7] if len(row) > 10 else "N/A"
+                formatted_rows.append(
+                    (
+                        truncate(name, 50),
+                        truncate(path, 80),
+                        size_disp,
+                        modified[:19] if modified else "N/A",
+                        classif,
+                        rgpd,
+                        type_disp,
+                        owner_disp,
+                    )
                 )
-                modal.after(3000, progress_label.destroy)
-        except Exception as e:
-            logger.error(f"Critical error in _load_filtered_files: {e}")
-            if "progress_label" in locals():
-                progress_label.config(text=f"❌ Erreur: {str(e)}")
-            messagebox.showerror(
-                "Erreur Chargement",
-                f"Erreur lors du chargement des fichiers:\n{str(e)}",
-                parent=modal,
-            )
+                files.append(
+                    {
+                        "id": file_id,
+                        "name": name,
+                        "path": path,
+                        "file_size": size,
+                        "last_modified": modified,
+                        "owner": owner,
+                        "classif": classif,
+                        "rgpd": rgpd,
+                    }
+                )
+            except Exception as row_error:
+                logger.warning(f"Erreur traitement ligne: {row_error}")
+        return formatted_rows, files
 
     def _load_filtered_files_direct(
         self, modal: tk.Toplevel, file_rows: List, category_name: str
@@ -498,57 +1615,54 @@ class AnalyticsDrillDownViewer:
                 logger.warning(f"No files to display for {category_name}")
                 return
 
-            for item in self.drill_tree.get_children():
-                self.drill_tree.delete(item)
-
+            self._page_state = None
+            self._last_query = None
             self.current_files = []
-            for row in file_rows:
+            formatted_rows: List[tuple] = []
+            truncate = _truncate_display
+            valid_rows = [row for row in file_rows if len(row) >= 7]
+            size_strs = _format_sizes_bulk([row[3] for row in valid_rows])
+            for row, size_str in zip(valid_rows, size_strs):
                 try:
-                    if len(row) >= 7:
-                        file_id, name, path, size, modified, creation, owner = row[:7]
-                        classif = row[7] if len(row) > 7 else "N/A"
-                        rgpd = row[8] if len(row) > 8 else "N/A"
-
-                        size_str = self._format_file_size(size or 0)
-                        date_str = (modified or creation or "")[:19] or "N/A"
-                        name_str = (
-                            str(name)[:50] + "..." if len(str(name)) > 50 else str(name)
-                        )
-                        path_str = (
-                            str(path)[:80] + "..." if len(str(path)) > 80 else str(path)
-                        )
-                        owner_str = str(owner or "Inconnu")
-
-                        self.drill_tree.insert(
+                    file_id, name, path, size, modified, creation, owner = row[:7]
+                    classif = row[7] if len(row) > 7 else "N/A"
+                    rgpd = row[8] if len(row) > 8 else "N/A"
+
+                    date_str = (modified or creation or "")[:19] or "N/A"
+                    name_str = truncate(name, 50)
+                    path_str = truncate(path, 80)
+                    owner_str = str(owner or "Inconnu")
+
+                    formatted_rows.append(
+                        (
+                            name_str,
+                            path_str,
+                            size_str,
+                            date_str,
+                            classif,
+                            rgpd,
                             "",
-                            "end",
-                            values=(
-                                name_str,
-                                path_str,
-                                size_str,
-                                date_str,
-                                classif,
-                                rgpd,
-                                "",
-                                owner_str,
-                            ),
+                            owner_str,
                         )
+                    )
 
-                        self.current_files.append(
-                            {
-                                "name": name,
-                                "path": path,
-                                "file_size": size,
-                                "last_modified": modified,
-                                "owner": owner,
-                                "classif": classif,
-                                "rgpd": rgpd,
-                            }
-                        )
+                    self.current_files.append(
+                        {
+                            "id": file_id,
+                            "name": name,
+                            "path": path,
+                            "file_size": size,
+                            "last_modified": modified,
+                            "owner": owner,
+                            "classif": classif,
+                            "rgpd": rgpd,
+                        }
+                    )
                 except Exception as row_error:
                     logger.warning(f"Erreur traitement ligne: {row_error}")
                     continue
 
+            self._set_tree_rows(formatted_rows)
             progress_label.config(
                 text=f"✅ {len(file_rows)} fichiers chargés - {category_name}"
             )
@@ -576,35 +1690,7 @@ class AnalyticsDrillDownViewer:
             )
 
             logger.debug(f"Classification modal query for: {classification}")
-
-            if classification == "Autres":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS security_class,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd_risk
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND (r.security_classification_cached IS NULL
-                     OR r.security_classification_cached NOT IN ('C0', 'C1', 'C2', 'C3'))
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-            else:
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS security_class,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd_risk
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND r.security_classification_cached = ?
-                ORDER BY f.file_size DESC
-                """
-                params = (classification,)
-
+            query, params = self._build_modal_query_unified("security", classification)
             self._load_filtered_files(
                 modal, query, params, f"Sécurité {classification}"
             )
@@ -624,48 +1710,7 @@ class AnalyticsDrillDownViewer:
             modal = self._create_base_modal(title, f"🛡️ Risque RGPD: {risk_level}")
 
             logger.debug(f"RGPD modal query for: {risk_level}")
-
-            if risk_level == "Autres":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS security_class,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd_risk
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND (r.rgpd_risk_cached IS NULL
-                     OR r.rgpd_risk_cached NOT IN ('none', 'low', 'medium', 'high', 'critical'))
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-            elif risk_level == "none":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS security_class,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd_risk
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND (r.rgpd_risk_cached IS NULL OR r.rgpd_risk_cached = 'none')
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-            else:
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS security_class,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd_risk
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND r.rgpd_risk_cached = ?
-                ORDER BY f.file_size DESC
-                """
-                params = (risk_level,)
-
+            query, params = self._build_modal_query_unified("rgpd", risk_level)
             self._load_filtered_files(modal, query, params, f"RGPD {risk_level}")
 
         except Exception as e:
@@ -686,17 +1731,8 @@ class AnalyticsDrillDownViewer:
                 "last_modified" if "modification" in age_type else "creation_time"
             )
 
-            age_conditions = {
-                "recent_7_days": f"f.{date_field} >= date('now', '-7 days')",
-                "recent_30_days": f"f.{date_field} >= date('now', '-30 days') AND f.{date_field} < date('now', '-7 days')",
-                "recent_90_days": f"f.{date_field} >= date('now', '-90 days') AND f.{date_field} < date('now', '-30 days')",
-                "old_1_year": f"f.{date_field} < date('now', '-1 year')",
-                "old_2_years": f"f.{date_field} < date('now', '-2 years')",
-                "dormant": f"f.{date_field} < date('now', '-{threshold_days} days')",
-            }
-
-            condition = age_conditions.get(
-                age_category, f"f.{date_field} < date('now', '-1 year')"
+            condition, params = _age_condition(
+                date_field, age_category, threshold_days, datetime.now(timezone.utc)
             )
 
             query = f"""
@@ -709,9 +1745,11 @@ class AnalyticsDrillDownViewer:
             AND f.file_size > 0
             AND f.{date_field} IS NOT NULL
             AND {condition}
-            ORDER BY f.{date_field} ASC
+            ORDER BY f.{date_field} ASC, f.id DESC
             """
-            self._load_filtered_files(modal, query, (), f"Fichiers {age_category}")
+            self._load_filtered_files(
+                modal, query, params, f"Fichiers {age_category}"
+            )
             logger.info(
                 f"Opened age analysis modal: {age_type}, category: {age_category}"
             )
@@ -726,7 +1764,9 @@ class AnalyticsDrillDownViewer:
     ) -> None:
         try:
             modal = self._create_base_modal(title, f"📊 Analyse de taille: {size_type}")
-            query, params = self._build_modal_query_unified("size", size_type)
+            query, params = self._build_modal_query_unified(
+                "size", size_type, require_positive_size=False
+            )
             self._load_filtered_files(modal, query, params, f"Fichiers {size_type}")
             logger.info(f"Opened size analysis modal for: {size_type}")
         except Exception as e:  # pragma: no cover - UI
@@ -739,34 +1779,30 @@ class AnalyticsDrillDownViewer:
     def show_duplicates_modal(self, title: str, click_info: Dict[str, Any]) -> None:
         try:
             modal = self._create_base_modal(title, "🔄 Fichiers dupliqués par groupe")
+            # Groupes calculés une seule fois (agrégat) puis joints, au lieu
+            # d'un COUNT(*) corrélé par ligne
             query = """
+            WITH dup AS (
+                SELECT fast_hash, file_size, COUNT(*) AS duplicate_count
+                FROM fichiers
+                WHERE fast_hash IS NOT NULL
+                  AND fast_hash != ''
+                  AND file_size > 0
+                  AND (status IS NULL OR status != 'error')
+                GROUP BY fast_hash, file_size
+                HAVING COUNT(*) > 1
+            )
             SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
                    COALESCE(r.security_classification_cached, 'none') AS classif,
                    COALESCE(r.rgpd_risk_cached, 'none') AS rgpd,
                    f.fast_hash,
-                   (
-                       SELECT COUNT(*) FROM fichiers f2
-                       WHERE f2.fast_hash = f.fast_hash
-                         AND f2.file_size = f.file_size
-                         AND f2.fast_hash IS NOT NULL
-                         AND f2.fast_hash != ''
-                         AND (f2.status IS NULL OR f2.status != 'error')
-                   ) as duplicate_count
-            FROM fichiers f
+                   dup.duplicate_count
+            FROM dup
+            JOIN fichiers f
+              ON f.fast_hash = dup.fast_hash AND f.file_size = dup.file_size
             LEFT JOIN reponses_llm r ON f.id = r.fichier_id
             WHERE (f.status IS NULL OR f.status != 'error')
-            AND f.file_size > 0
-            AND f.fast_hash IS NOT NULL
-            AND f.fast_hash != ''
-            AND (
-                SELECT COUNT(*) FROM fichiers f2
-                WHERE f2.fast_hash = f.fast_hash
-                  AND f2.file_size = f.file_size
-                  AND f2.fast_hash IS NOT NULL
-                  AND f2.fast_hash != ''
-                  AND (f2.status IS NULL OR f2.status != 'error')
-            ) > 1
-            ORDER BY duplicate_count DESC, f.file_size DESC
+            ORDER BY dup.duplicate_count DESC, f.file_size DESC, f.id DESC
             """
             self._load_filtered_files(
                 modal, query, (), "Groupes fichiers dupliqués (FastHash)"
@@ -791,103 +1827,37 @@ class AnalyticsDrillDownViewer:
                 f"Fichiers - Analyse Temporelle ({date_type})", title
             )
 
-            from datetime import datetime, timedelta
-
             now = datetime.now()
-            period_definitions = {
-                "0_1y": (now - timedelta(days=365), now),
-                "1_2y": (now - timedelta(days=730), now - timedelta(days=365)),
-                "2_3y": (now - timedelta(days=1095), now - timedelta(days=730)),
-                "3_4y": (now - timedelta(days=1460), now - timedelta(days=1095)),
-                "4_5y": (now - timedelta(days=1825), now - timedelta(days=1460)),
-                "5_6y": (now - timedelta(days=2190), now - timedelta(days=1825)),
-                "6plus": (datetime.min, now - timedelta(days=2190)),
-            }
-
-            if period not in period_definitions:
+            if period not in _PERIOD_DAYS:
                 raise ValueError(f"Période temporelle inconnue: {period}")
+            min_days, max_days = _PERIOD_DAYS[period]
+            range_def = {"min_days": min_days, "max_days": max_days}
 
-            start_date, end_date = period_definitions[period]
-
-            date_column = (
-                "f.last_modified" if date_type == "modification" else "f.creation_time"
-            )
-            fallback_column = (
-                "f.creation_time" if date_type == "modification" else "f.last_modified"
-            )
-
-            range_definitions = {
-                "0_1y": {"min_days": 0, "max_days": 365},
-                "1_2y": {"min_days": 365, "max_days": 730},
-                "2_3y": {"min_days": 730, "max_days": 1095},
-                "3_4y": {"min_days": 1095, "max_days": 1460},
-                "4_5y": {"min_days": 1460, "max_days": 1825},
-                "5_6y": {"min_days": 1825, "max_days": 2190},
-                "6plus": {"min_days": 2190, "max_days": None},
-            }
-
-            range_def = range_definitions[period]
-
-            query = f"""
-        SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.creation_time, f.owner,
-               COALESCE(r.security_classification_cached, 'none') AS security_class,
-               COALESCE(r.rgpd_risk_cached, 'none') AS rgpd_risk,
-               COALESCE(r.finance_type_cached, 'none') AS finance_type,
-               COALESCE(r.legal_type_cached, 'none') AS legal_type,
-               r.document_resume
-        FROM fichiers f
-        LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-        WHERE (f.status IS NULL OR f.status != 'error')
-        AND f.file_size > 0
-        AND (
-            COALESCE({date_column}, {fallback_column}) IS NOT NULL
-            AND COALESCE({date_column}, {fallback_column}) != ''
-        )
-        ORDER BY f.file_size DESC
-        LIMIT 10000
-            """
-
-            params: tuple = ()
-
-            logger.debug("Executing base query to get files for temporal filtering")
+            if date_type not in _TEMPORAL_DATE_COLUMNS:
+                raise ValueError(f"Type de date inconnu: {date_type}")
 
             with self.analytics_panel.db_manager._connect().get() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                all_files = cursor.fetchall()
-
-            logger.info(f"Retrieved {len(all_files)} candidate files for temporal filtering")
-
-            filtered_files = []
-            date_col_idx = 4 if date_type == "modification" else 5
-            fallback_col_idx = 5 if date_type == "modification" else 4
-
-            for row in all_files:
-                date_str = row[date_col_idx] or row[fallback_col_idx]
-                if date_str and date_str != "0":
-                    try:
-                        parsed_date = self.analytics_panel._parse_date_flexible(date_str)
-                        if parsed_date:
-                            if range_def["max_days"] is None:
-                                cutoff = now - timedelta(days=range_def["min_days"])
-                                if parsed_date <= cutoff:
-                                    filtered_files.append(row)
-                            else:
-                                start_cutoff = now - timedelta(days=range_def["max_days"])
-                                end_cutoff = now - timedelta(days=range_def["min_days"])
-                                if start_cutoff <= parsed_date < end_cutoff:
-                                    filtered_files.append(row)
-                    except Exception as e:
-                        logger.debug(f"Date parsing failed for {date_str}: {e}")
-                        continue
-
-            logger.info(
-                f"Temporal filtering result: {len(filtered_files)} files match period {period}"
-            )
+                use_ts = self.analytics_panel._has_timestamp_columns(conn)
+                filtered_files = (
+                    None
+                    if use_ts
+                    else self._filter_temporal_rows_python(conn, date_type, range_def, now)
+                )
 
-            self._load_filtered_files_direct(
-                modal, filtered_files, f"Temporel {date_type} - {period}"
-            )
+            category = f"Temporel {date_type} - {period}"
+            if filtered_files is None:
+                # Pages lues à la demande, reprise par (taille, id) sans OFFSET
+                query, keyset_query, params = self._temporal_ts_query(
+                    date_type, range_def, now
+                )
+                self._load_filtered_files(
+                    modal, query, params, category, keyset_query=keyset_query
+                )
+            else:
+                logger.info(
+                    f"Temporal filtering result: {len(filtered_files)} files match period {period}"
+                )
+                self._load_filtered_files_direct(modal, filtered_files, category)
 
             logger.info(f"Modal temporel ouvert: {date_type}, période: {period}")
 
@@ -899,6 +1869,71 @@ class AnalyticsDrillDownViewer:
                 parent=self.analytics_panel.parent,
             )
 
+    def _temporal_ts_query(
+        self,
+        date_type: str,
+        range_def: Dict[str, Optional[int]],
+        now: datetime,
+    ) -> Tuple[str, str, tuple]:
+        """Return the first-page and keyset SQL plus epoch bounds for a period."""
+        now_ts = int(now.timestamp())
+        end_ts = now_ts - range_def["min_days"] * 86400
+        bounded = range_def["max_days"] is not None
+        if bounded:
+            start_ts = now_ts - range_def["max_days"] * 86400
+            params: tuple = (start_ts, end_ts, start_ts, end_ts)
+        else:
+            params = (end_ts, end_ts)
+        return (
+            _TEMPORAL_TS_SQL[(date_type, bounded, False)],
+            _TEMPORAL_TS_SQL[(date_type, bounded, True)],
+            params,
+        )
+
+    def _filter_temporal_rows_python(
+        self,
+        conn: sqlite3.Connection,
+        date_type: str,
+        range_def: Dict[str, Optional[int]],
+        now: datetime,
+    ) -> List[tuple]:
+        """Fallback for databases without *_ts columns: parse dates in Python."""
+        query = _TEMPORAL_FALLBACK_SQL[date_type]
+
+        params: tuple = ()
+
+        logger.debug("Executing base query to get files for temporal filtering")
+
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        all_files = cursor.fetchall()
+
+        logger.info(f"Retrieved {len(all_files)} candidate files for temporal filtering")
+
+        filtered_files = []
+        date_col_idx = 4 if date_type == "modification" else 5
+        fallback_col_idx = 5 if date_type == "modification" else 4
+
+        for row in all_files:
+            date_str = row[date_col_idx] or row[fallback_col_idx]
+            if date_str and date_str != "0":
+                try:
+                    parsed_date = self.analytics_panel._parse_date_flexible(date_str)
+                    if parsed_date:
+                        if range_def["max_days"] is None:
+                            cutoff = now - timedelta(days=range_def["min_days"])
+                            if parsed_date <= cutoff:
+                                filtered_files.append(row)
+                        else:
+                            start_cutoff = now - timedelta(days=range_def["max_days"])
+                            end_cutoff = now - timedelta(days=range_def["min_days"])
+                            if start_cutoff <= parsed_date < end_cutoff:
+                                filtered_files.append(row)
+                except Exception as e:
+                    logger.debug(f"Date parsing failed for {date_str}: {e}")
+                    continue
+        return filtered_files
+
     def show_combined_files_modal(
         self, title: str, subtitle: str, click_info: Dict[str, Any]
     ) -> None:
@@ -907,42 +1942,44 @@ class AnalyticsDrillDownViewer:
             modal = self._create_base_modal(title, subtitle)
 
             category = click_info.get("category", "")
+            # Seules les lignes C3 sont voulues: jointure interne, le planificateur
+            # peut partir de reponses_llm (index *_cached) puis lire fichiers par id
             if category == "c3_rgpd":
                 query = """
                 SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd
+                       r.security_classification_cached AS classif,
+                       r.rgpd_risk_cached AS rgpd
                 FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+                JOIN reponses_llm r ON f.id = r.fichier_id
                 WHERE (f.status IS NULL OR f.status != 'error')
-                AND COALESCE(r.security_classification_cached, 'none') = 'C3'
-                AND COALESCE(r.rgpd_risk_cached, 'none') = 'critical'
-                ORDER BY f.file_size DESC
+                AND r.security_classification_cached = 'C3'
+                AND r.rgpd_risk_cached = 'critical'
+                ORDER BY f.file_size DESC, f.id DESC
                 """
                 params = ()
             elif category == "c3_legal":
                 query = """
                 SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.legal_type_cached, 'none') AS legal
+                       r.security_classification_cached AS classif,
+                       r.legal_type_cached AS legal
                 FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+                JOIN reponses_llm r ON f.id = r.fichier_id
                 WHERE (f.status IS NULL OR f.status != 'error')
-                AND COALESCE(r.security_classification_cached, 'none') = 'C3'
-                AND COALESCE(r.legal_type_cached, 'none') IN ('nda', 'litigation')
-                ORDER BY f.file_size DESC
+                AND r.security_classification_cached = 'C3'
+                AND r.legal_type_cached IN ('nda', 'litigation')
+                ORDER BY f.file_size DESC, f.id DESC
                 """
                 params = ()
             elif category == "c3_total":
                 query = """
                 SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
+                       r.security_classification_cached AS classif,
                        COALESCE(r.rgpd_risk_cached, 'none') AS rgpd
                 FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+                JOIN reponses_llm r ON f.id = r.fichier_id
                 WHERE (f.status IS NULL OR f.status != 'error')
-                AND COALESCE(r.security_classification_cached, 'none') = 'C3'
-                ORDER BY f.file_size DESC
+                AND r.security_classification_cached = 'C3'
+                ORDER BY f.file_size DESC, f.id DESC
                 """
                 params = ()
             else:
@@ -965,61 +2002,12 @@ class AnalyticsDrillDownViewer:
 
             logger.debug(f"Duplicates detailed modal query for: {level}")
 
-            if level == "1x":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd,
-                       1 as copy_count
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.fast_hash IS NOT NULL AND f.fast_hash != ''
-                AND (SELECT COUNT(*) FROM fichiers f2
-                     WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
-                       AND (f2.status IS NULL OR f2.status != 'error')) = 1
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-
-            elif level == "7x+":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd,
-                       (SELECT COUNT(*) FROM fichiers f2
-                        WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
-                          AND (f2.status IS NULL OR f2.status != 'error')) as copy_count
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.fast_hash IS NOT NULL AND f.fast_hash != ''
-                AND (SELECT COUNT(*) FROM fichiers f2
-                     WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
-                       AND (f2.status IS NULL OR f2.status != 'error')) >= 7
-                ORDER BY copy_count DESC, f.file_size DESC
-                """
-                params = ()
-
+            params = _duplicate_level_bounds(level)
+            # Nombre de copies constant pour un niveau exact: même ordre que par taille
+            if self._has_duplicate_stats():
+                query = _DUPLICATE_STATS_QUERY
             else:
-                target_count = int(level.replace("x", ""))
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.rgpd_risk_cached, 'none') AS rgpd,
-                       (SELECT COUNT(*) FROM fichiers f2
-                        WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
-                          AND (f2.status IS NULL OR f2.status != 'error')) as copy_count
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.fast_hash IS NOT NULL AND f.fast_hash != ''
-                AND (SELECT COUNT(*) FROM fichiers f2
-                     WHERE f2.fast_hash = f.fast_hash AND f2.file_size = f.file_size
-                       AND (f2.status IS NULL OR f2.status != 'error')) = ?
-                ORDER BY f.file_size DESC
-                """
-                params = (target_count,)
+                query = _DUPLICATE_LEVEL_QUERY
 
             self._load_filtered_files(modal, query, params, f"Groupes avec {level}")
             logger.info(f"Opened duplicates detailed modal: {level}")
@@ -1031,6 +2019,24 @@ class AnalyticsDrillDownViewer:
                 f"Impossible d'ouvrir la vue doublons détaillée.\nErreur: {str(e)}",
             )
 
+    def _has_duplicate_stats(self) -> bool:
+        """True when duplicate_stats (rebuilt at import and after analysis) is current.
+
+        Lecture seule: la table n'est jamais recalculée depuis un clic.
+        """
+        try:
+            with self.analytics_panel.db_manager._connect().get() as conn:
+                return duplicate_stats_current(conn)
+        except Exception as e:
+            logger.debug(f"duplicate_stats indisponible, calcul direct: {e}")
+            return False
+
+    def _doc_type_query(self, family: str, value: str) -> Tuple[str, tuple]:
+        """Pick the precompiled finance/legal template for a category value."""
+        if value in ("Autres", "none"):
+            return _DOC_TYPE_SQL[(family, value)], ()
+        return _DOC_TYPE_SQL[(family, "exact")], (value,)
+
     def show_finance_modal(
         self, finance_type: str, title: str, click_info: Dict[str, Any]
     ) -> None:
@@ -1039,51 +2045,7 @@ class AnalyticsDrillDownViewer:
             modal = self._create_base_modal(title, f"💰 Finance: {finance_type}")
 
             logger.debug(f"Finance modal query for: {finance_type}")
-
-            if finance_type == "Autres":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.finance_type_cached, 'none') AS finance
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND (r.finance_type_cached NOT IN ('none', 'invoice', 'contract', 'budget', 'accounting', 'payment')
-                     OR r.finance_type_cached IS NULL)
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-                logger.debug("Using NOT IN query for Finance 'Autres' category")
-            elif finance_type == "none":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.finance_type_cached, 'none') AS finance
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND (r.finance_type_cached IS NULL OR r.finance_type_cached = 'none')
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-                logger.debug("Using NULL/none query for Finance 'none' category")
-            else:
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.finance_type_cached, 'none') AS finance
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND r.finance_type_cached = ?
-                ORDER BY f.file_size DESC
-                """
-                params = (finance_type,)
-                logger.debug(f"Using exact match query for Finance '{finance_type}'")
-
+            query, params = self._doc_type_query("finance", finance_type)
             self._load_filtered_files(modal, query, params, f"Finance {finance_type}")
 
         except Exception as e:
@@ -1096,492 +2058,262 @@ class AnalyticsDrillDownViewer:
 
     def show_legal_modal(
         self, legal_type: str, title: str, click_info: Dict[str, Any]
-    ) -> None:
-        """Fixed Legal modal with proper 'Autres'/'none' handling."""
-        try:
-            modal = self._create_base_modal(title, f"⚖️ Légal: {legal_type}")
-
-            logger.debug(f"Legal modal query for: {legal_type}")
-
-            if legal_type == "Autres":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.legal_type_cached, 'none') AS legal
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND (r.legal_type_cached NOT IN ('none', 'employment', 'lease', 'sale', 'nda', 'compliance', 'litigation')
-                     OR r.legal_type_cached IS NULL)
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-                logger.debug("Using NOT IN query for Legal 'Autres' category")
-            elif legal_type == "none":
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.legal_type_cached, 'none') AS legal
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND (r.legal_type_cached IS NULL OR r.legal_type_cached = 'none')
-                ORDER BY f.file_size DESC
-                """
-                params = ()
-                logger.debug("Using NULL/none query for Legal 'none' category")
-            else:
-                query = """
-                SELECT f.id, f.name, f.path, f.file_size, f.last_modified, f.owner,
-                       COALESCE(r.security_classification_cached, 'none') AS classif,
-                       COALESCE(r.legal_type_cached, 'none') AS legal
-                FROM fichiers f
-                LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                WHERE (f.status IS NULL OR f.status != 'error')
-                AND f.file_size > 0
-                AND r.legal_type_cached = ?
-                ORDER BY f.file_size DESC
-                """
-                params = (legal_type,)
-                logger.debug(f"Using exact match query for Legal '{legal_type}'")
-
-            self._load_filtered_files(modal, query, params, f"Légal {legal_type}")
-
-        except Exception as e:
-            logger.error(f"Failed to show legal modal: {e}")
-            messagebox.showerror(
-                "Erreur",
-                f"Impossible d'ouvrir la vue Légale.\nErreur: {str(e)}",
-                parent=self.analytics_panel.parent,
-            )
-
-
-class AnalyticsTabClickManager:
-    """Manage click functionality across all Analytics tabs."""
-
-    def __init__(self, parent_analytics_panel: "AnalyticsPanel") -> None:
-        self.analytics_panel = parent_analytics_panel
-        self.db_manager = parent_analytics_panel.db_manager
-        self.drill_down_viewer = AnalyticsDrillDownViewer(parent_analytics_panel)
-
-    # ------------------------------------------------------------------
-    def add_click_handlers_to_all_tabs(self) -> None:
-        """Add click handlers to all analytics result displays."""
-
-        self._add_security_click_handlers()
-        self._add_rgpd_click_handlers()
-        self._add_security_focus_click_handlers()
-        self._add_age_analysis_click_handlers()
-        self._add_size_analysis_click_handlers()
-        self._add_duplicates_click_handlers()
-        self._add_duplicates_detailed_click_handlers()
-        self._add_temporal_click_handlers()
-        self._add_finance_click_handlers()
-        self._add_legal_click_handlers()
-
-    # ------------------------------------------------------------------
-    def _add_security_click_handlers(self) -> None:
-        if not hasattr(self.analytics_panel, "security_labels"):
-            return
-        for level, label in self.analytics_panel.security_labels.items():
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "classification",
-                "classification": level,
-                "category": "security_classification",
-            }
-            label.bind(
-                "<Button-1>",
-                lambda e, lbl=label: self._handle_classification_click(lbl),
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 10, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 10, "normal")
-                ),
-            )
-
-    def _add_rgpd_click_handlers(self) -> None:
-        if not hasattr(self.analytics_panel, "rgpd_labels"):
-            return
-        for level, label in self.analytics_panel.rgpd_labels.items():
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "rgpd_risk",
-                "risk_level": level,
-                "category": "rgpd_risk",
-            }
-            label.bind("<Button-1>", lambda e, lbl=label: self._handle_rgpd_click(lbl))
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 10, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 10, "normal")
-                ),
-            )
-
-    def _add_security_focus_click_handlers(self) -> None:
-        """Add click handlers for security focus labels."""
-        if not hasattr(self.analytics_panel, "security_focus_labels"):
-            return
-
-        labels = self.analytics_panel.security_focus_labels
-
-        if "C3 Total" in labels:
-            label = labels["C3 Total"]
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "security_focus",
-                "category": "c3_total",
-                "classification": "C3",
-            }
-            label.bind(
-                "<Button-1>",
-                lambda e, lbl=label: self._handle_security_focus_click(lbl),
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 11, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 11, "normal")
-                ),
-            )
-
-        if "C3 + RGPD" in labels:
-            label = labels["C3 + RGPD"]
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "security_focus",
-                "category": "c3_rgpd",
-                "classification": "C3",
-                "rgpd_risk": "critical",
-            }
-            label.bind(
-                "<Button-1>",
-                lambda e, lbl=label: self._handle_security_focus_click(lbl),
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 11, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 11, "normal")
-                ),
-            )
-
-        if "C3 + Legal" in labels:
-            label = labels["C3 + Legal"]
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "security_focus",
-                "category": "c3_legal",
-                "classification": "C3",
-                "legal_types": ["nda", "litigation"],
-            }
-            label.bind(
-                "<Button-1>",
-                lambda e, lbl=label: self._handle_security_focus_click(lbl),
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 11, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 11, "normal")
-                ),
-            )
-
-    def _add_age_analysis_click_handlers(self) -> None:
-        for attr in ["modification_labels", "creation_labels"]:
-            if hasattr(self.analytics_panel, attr):
-                labels = getattr(self.analytics_panel, attr)
-                for key, label in labels.items():
-                    label.configure(cursor="hand2")
-                    label.click_info = {
-                        "type": "age_analysis",
-                        "age_type": f"{attr.split('_')[0]}_{key}",
-                        "category": "age_analysis",
-                    }
-                    label.bind(
-                        "<Button-1>", lambda e, lbl=label: self._handle_age_click(lbl)
-                    )
-                    label.bind(
-                        "<Enter>",
-                        lambda e, l=label: l.configure(
-                            foreground="blue", font=("Arial", 10, "underline")
-                        ),
-                    )
-                    label.bind(
-                        "<Leave>",
-                        lambda e, l=label: l.configure(
-                            foreground="black", font=("Arial", 10, "normal")
-                        ),
-                    )
-
-    def _add_size_analysis_click_handlers(self) -> None:
-        if not hasattr(self.analytics_panel, "file_size_labels"):
-            return
-        for level, label in self.analytics_panel.file_size_labels.items():
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "size_analysis",
-                "size_type": level,
-                "category": "size_analysis",
-            }
-            label.bind("<Button-1>", lambda e, lbl=label: self._handle_size_click(lbl))
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 10, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 10, "normal")
-                ),
-            )
-
-    def _add_duplicates_click_handlers(self) -> None:
-        if hasattr(self.analytics_panel, "duplicates_label"):
-            label = self.analytics_panel.duplicates_label
-            label.configure(cursor="hand2")
-            label.click_info = {"type": "duplicates", "category": "duplicate_files"}
-            label.bind(
-                "<Button-1>", lambda e, lbl=label: self._handle_duplicates_click(lbl)
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 10, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 10, "normal")
-                ),
-            )
-
-    def _add_duplicates_detailed_click_handlers(self) -> None:
-        """Add click handlers for detailed duplicates labels."""
-        if not hasattr(self.analytics_panel, "duplicates_detailed_labels"):
-            return
-        for level, label in self.analytics_panel.duplicates_detailed_labels.items():
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "duplicates_detailed",
-                "level": level,
-                "category": "duplicate_analysis",
-                "logic_type": "exact_count" if level != "7x+" else "minimum_count",
-            }
-            label.bind(
-                "<Button-1>",
-                lambda e, lbl=label: self._handle_duplicates_detailed_click(lbl),
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 11, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 11, "normal")
-                ),
+    ) -> None:
+        """Fixed Legal modal with proper 'Autres'/'none' handling."""
+        try:
+            modal = self._create_base_modal(title, f"⚖️ Légal: {legal_type}")
+
+            logger.debug(f"Legal modal query for: {legal_type}")
+            query, params = self._doc_type_query("legal", legal_type)
+            self._load_filtered_files(modal, query, params, f"Légal {legal_type}")
+
+        except Exception as e:
+            logger.error(f"Failed to show legal modal: {e}")
+            messagebox.showerror(
+                "Erreur",
+                f"Impossible d'ouvrir la vue Légale.\nErreur: {str(e)}",
+                parent=self.analytics_panel.parent,
             )
 
-    def _add_temporal_click_handlers(self) -> None:
-        """Add click handlers for temporal analysis with standardized keys."""
-        for attr in ["modification_labels", "creation_labels"]:
-            if hasattr(self.analytics_panel, attr):
-                labels = getattr(self.analytics_panel, attr)
-                for key, label in labels.items():
-                    label.configure(cursor="hand2")
-                    label.click_info = {
-                        "type": "temporal_analysis",
-                        "temporal_type": attr.split("_")[0],
-                        "period_filter": key,
-                        "category": "temporal_analysis",
-                    }
-                    label.bind(
-                        "<Button-1>",
-                        lambda e, lbl=label: self._handle_temporal_click(lbl),
-                    )
-                    label.bind(
-                        "<Enter>",
-                        lambda e, l=label: l.configure(
-                            foreground="blue", font=("Arial", 10, "underline")
-                        ),
-                    )
-                    label.bind(
-                        "<Leave>",
-                        lambda e, l=label: l.configure(
-                            foreground="black", font=("Arial", 10, "normal")
-                        ),
-                    )
 
-    def _add_finance_click_handlers(self) -> None:
-        """Ajouter gestionnaires de clic pour types financiers."""
-        if not hasattr(self.analytics_panel, "finance_labels"):
-            return
+def _on_click(event) -> None:
+    """Callback <Button-1> partagé: délègue au handler stocké sur le label."""
+    event.widget._click_handler(event.widget)
+
+
+def _on_enter(event) -> None:
+    """Callback <Enter> partagé: souligne le label survolé."""
+    event.widget.configure(
+        foreground="blue", font=("Arial", event.widget._hover_size, "underline")
+    )
+
+
+def _on_leave(event) -> None:
+    """Callback <Leave> partagé: restaure le style du label."""
+    event.widget.configure(
+        foreground="black", font=("Arial", event.widget._hover_size, "normal")
+    )
+
+
+# Infos de clic des labels "Focus Sécurité" (clés absentes: non cliquables)
+_SECURITY_FOCUS_INFO: Dict[str, Dict[str, Any]] = {
+    "C3 Total": {"category": "c3_total"},
+    "C3 + RGPD": {"category": "c3_rgpd", "rgpd_risk": "critical"},
+    "C3 + Legal": {"category": "c3_legal", "legal_types": ["nda", "litigation"]},
+}
+
+
+def _temporal_click_info(temporal_type: str):
+    """Fabrique de click_info pour les labels d'une analyse temporelle."""
+    return lambda key: {
+        "type": "temporal_analysis",
+        "temporal_type": temporal_type,
+        "period_filter": key,
+        "category": "temporal_analysis",
+    }
+
+
+# (attribut du panneau, fabrique de click_info, handler, taille de police)
+# Un attribut non-dict (label unique) est traité comme {None: label}.
+_LABEL_MANIFEST: List[Tuple[str, Callable[[Any], Optional[Dict[str, Any]]], str, int]] = [
+    (
+        "security_labels",
+        lambda key: {
+            "type": "classification",
+            "classification": key,
+            "category": "security_classification",
+        },
+        "_handle_classification_click",
+        10,
+    ),
+    (
+        "rgpd_labels",
+        lambda key: {"type": "rgpd_risk", "risk_level": key, "category": "rgpd_risk"},
+        "_handle_rgpd_click",
+        10,
+    ),
+    (
+        "security_focus_labels",
+        lambda key: (
+            {"type": "security_focus", "classification": "C3", **_SECURITY_FOCUS_INFO[key]}
+            if key in _SECURITY_FOCUS_INFO
+            else None
+        ),
+        "_handle_security_focus_click",
+        11,
+    ),
+    (
+        "file_size_labels",
+        lambda key: {"type": "size_analysis", "size_type": key, "category": "size_analysis"},
+        "_handle_size_click",
+        10,
+    ),
+    (
+        "duplicates_label",
+        lambda key: {"type": "duplicates", "category": "duplicate_files"},
+        "_handle_duplicates_click",
+        10,
+    ),
+    (
+        "duplicates_detailed_labels",
+        lambda key: {
+            "type": "duplicates_detailed",
+            "level": key,
+            "category": "duplicate_analysis",
+            "logic_type": "exact_count" if key != "7x+" else "minimum_count",
+        },
+        "_handle_duplicates_detailed_click",
+        11,
+    ),
+    ("modification_labels", _temporal_click_info("modification"), "_handle_temporal_click", 10),
+    ("creation_labels", _temporal_click_info("creation"), "_handle_temporal_click", 10),
+    (
+        "finance_labels",
+        lambda key: {"type": "finance", "finance_type": key, "category": "finance_type"},
+        "_handle_finance_click",
+        10,
+    ),
+    (
+        "legal_labels",
+        lambda key: {"type": "legal", "legal_type": key, "category": "legal_type"},
+        "_handle_legal_click",
+        10,
+    ),
+]
+
+
+# Handlers de clic simples: (clé de click_info, méthode du viewer, titre, debug).
+# Sans clé, la méthode reçoit seulement (titre, click_info).
+_CLICK_DISPATCH: Dict[str, Tuple[Optional[str], str, str, bool]] = {
+    "classification": (
+        "classification",
+        "show_classification_files_modal",
+        "Fichiers de Classification {v}",
+        False,
+    ),
+    "rgpd": ("risk_level", "show_rgpd_files_modal", "Fichiers RGPD - Risque {v}", False),
+    "age": ("age_type", "show_age_files_modal", "Fichiers - Analyse d'Âge ({v})", False),
+    "size": (
+        "size_type",
+        "show_size_files_modal",
+        "Fichiers - Analyse de Taille ({v})",
+        False,
+    ),
+    "finance": ("finance_type", "show_finance_modal", "Types Financiers - {v}", True),
+    "legal": ("legal_type", "show_legal_modal", "Types Légaux - {v}", True),
+    "duplicates": (None, "show_duplicates_modal", "Fichiers Dupliqués - Groupes", False),
+    "duplicates_detailed": (
+        "level",
+        "show_duplicates_detailed_modal",
+        "Fichiers Dupliqués - {v}",
+        False,
+    ),
+}
 
-        for finance_type, label in self.analytics_panel.finance_labels.items():
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "finance",
-                "finance_type": finance_type,
-                "category": "finance_type",
-            }
-            label.bind(
-                "<Button-1>",
-                lambda e, lbl=label: self._handle_finance_click(lbl),
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 10, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 10, "normal")
-                ),
-            )
 
-    def _add_legal_click_handlers(self) -> None:
-        """Ajouter gestionnaires de clic pour types légaux."""
-        if not hasattr(self.analytics_panel, "legal_labels"):
+class AnalyticsTabClickManager:
+    """Manage click functionality across all Analytics tabs."""
+
+    def __init__(self, parent_analytics_panel: "AnalyticsPanel") -> None:
+        self.analytics_panel = parent_analytics_panel
+        self.db_manager = parent_analytics_panel.db_manager
+        self.drill_down_viewer = AnalyticsDrillDownViewer(parent_analytics_panel)
+
+    # ------------------------------------------------------------------
+    def add_click_handlers_to_all_tabs(self) -> None:
+        """Add click handlers to all analytics result displays.
+
+        Une ligne du manifeste par callback ``after_idle``: le panneau se
+        dessine d'abord, les bindings sont posés ensuite par petits lots.
+        """
+
+        # AnalyticsPanel n'est pas un widget: la file idle est celle de son parent Tk
+        schedule = getattr(getattr(self.analytics_panel, "parent", None), "after_idle", None)
+        for row in _LABEL_MANIFEST:
+            if schedule is None:
+                self._attach_manifest_row(*row)
+            else:
+                schedule(self._attach_manifest_row, *row)
+
+    def _attach_manifest_row(
+        self,
+        attr: str,
+        info_factory: Callable[[Any], Optional[Dict[str, Any]]],
+        handler_name: str,
+        font_size: int,
+    ) -> None:
+        """Bind the click callbacks for one ``_LABEL_MANIFEST`` entry."""
+        labels = getattr(self.analytics_panel, attr, None)
+        if labels is None:
             return
+        if not isinstance(labels, dict):
+            labels = {None: labels}
+        handler = getattr(self, handler_name)
+        try:
+            for key, label in labels.items():
+                click_info = info_factory(key)
+                if click_info is None:
+                    continue
+                label.click_info = click_info
+                self._bind_click(label, handler, font_size)
+        except tk.TclError as e:
+            # Panneau détruit avant l'exécution du callback différé
+            logger.warning(f"Click handlers for {attr} not attached: {e}")
 
-        for legal_type, label in self.analytics_panel.legal_labels.items():
-            label.configure(cursor="hand2")
-            label.click_info = {
-                "type": "legal",
-                "legal_type": legal_type,
-                "category": "legal_type",
-            }
-            label.bind(
-                "<Button-1>",
-                lambda e, lbl=label: self._handle_legal_click(lbl),
-            )
-            label.bind(
-                "<Enter>",
-                lambda e, l=label: l.configure(
-                    foreground="blue", font=("Arial", 10, "underline")
-                ),
-            )
-            label.bind(
-                "<Leave>",
-                lambda e, l=label: l.configure(
-                    foreground="black", font=("Arial", 10, "normal")
-                ),
-            )
+    # ------------------------------------------------------------------
+    def _bind_click(self, label, handler, font_size: int = 10) -> None:
+        """Rendre un label cliquable avec les callbacks partagés du module."""
+        label.configure(cursor="hand2")
+        label._hover_size = font_size
+        label._click_handler = handler
+        label.bind("<Button-1>", _on_click)
+        label.bind("<Enter>", _on_enter)
+        label.bind("<Leave>", _on_leave)
 
     # ------------------------------------------------------------------
     # Click handlers
     # ------------------------------------------------------------------
 
     def _debug_click_info(self, label_widget, handler_name: str) -> None:
-        """Méthode de debug pour validation click_info."""
+        """Méthode de debug pour validation click_info (sans effet hors niveau DEBUG)."""
         try:
             click_info = getattr(label_widget, "click_info", {})
+            if not click_info:
+                logger.error(f"click_info manquant pour {handler_name}")
+            if not logger.isEnabledFor(logging.DEBUG):
+                return
             text = label_widget.cget("text") if hasattr(label_widget, "cget") else "N/A"
 
-            logger.info(f"DEBUG {handler_name}:")
-            logger.info(f"  - Label text: {text}")
-            logger.info(f"  - Click info: {click_info}")
-
-            if not click_info:
-                logger.error(f"  - ERROR: click_info manquant pour {handler_name}")
+            logger.debug(f"DEBUG {handler_name}:")
+            logger.debug(f"  - Label text: {text}")
+            logger.debug(f"  - Click info: {click_info}")
 
         except Exception as e:
             logger.error(f"Debug error in {handler_name}: {e}")
 
-    def _handle_classification_click(self, label_widget) -> None:
-        click_info = getattr(label_widget, "click_info", {})
-        classification = click_info.get("classification", "")
-        self.drill_down_viewer.show_classification_files_modal(
-            classification, f"Fichiers de Classification {classification}", click_info
-        )
-
-    def _handle_rgpd_click(self, label_widget) -> None:
-        click_info = getattr(label_widget, "click_info", {})
-        risk_level = click_info.get("risk_level", "")
-        self.drill_down_viewer.show_rgpd_files_modal(
-            risk_level, f"Fichiers RGPD - Risque {risk_level}", click_info
-        )
-
-    def _handle_age_click(self, label_widget) -> None:
-        click_info = getattr(label_widget, "click_info", {})
-        age_type = click_info.get("age_type", "")
-        self.drill_down_viewer.show_age_files_modal(
-            age_type, f"Fichiers - Analyse d'Âge ({age_type})", click_info
-        )
-
-    def _handle_size_click(self, label_widget) -> None:
-        click_info = getattr(label_widget, "click_info", {})
-        size_type = click_info.get("size_type", "")
-        self.drill_down_viewer.show_size_files_modal(
-            size_type, f"Fichiers - Analyse de Taille ({size_type})", click_info
-        )
-
-    def _handle_finance_click(self, label_widget) -> None:
-        self._debug_click_info(label_widget, "_handle_finance_click")
-        click_info = getattr(label_widget, "click_info", {})
-        finance_type = click_info.get("finance_type", "")
-        self.drill_down_viewer.show_finance_modal(
-            finance_type, f"Types Financiers - {finance_type}", click_info
-        )
-
-    def _handle_legal_click(self, label_widget) -> None:
-        self._debug_click_info(label_widget, "_handle_legal_click")
+    def _dispatch_click(self, kind: str, label_widget) -> None:
+        """Ouvre la modale associée à ``kind`` dans ``_CLICK_DISPATCH``."""
+        info_key, method_name, title, debug = _CLICK_DISPATCH[kind]
+        if debug:
+            self._debug_click_info(label_widget, f"_handle_{kind}_click")
         click_info = getattr(label_widget, "click_info", {})
-        legal_type = click_info.get("legal_type", "")
-        self.drill_down_viewer.show_legal_modal(
-            legal_type, f"Types Légaux - {legal_type}", click_info
-        )
-
-    def _handle_duplicates_click(self, label_widget) -> None:
-        click_info = getattr(label_widget, "click_info", {})
-        self.drill_down_viewer.show_duplicates_modal(
-            "Fichiers Dupliqués - Groupes", click_info
-        )
-
-    def _handle_duplicates_detailed_click(self, label_widget) -> None:
-        click_info = getattr(label_widget, "click_info", {})
-        level = click_info.get("level", "")
-        self.drill_down_viewer.show_duplicates_detailed_modal(
-            level, f"Fichiers Dupliqués - {level}", click_info
-        )
+        show = getattr(self.drill_down_viewer, method_name)
+        if info_key is None:
+            show(title, click_info)
+            return
+        value = click_info.get(info_key, "")
+        show(value, title.format(v=value), click_info)
+
+    _handle_classification_click = partialmethod(_dispatch_click, "classification")
+    _handle_rgpd_click = partialmethod(_dispatch_click, "rgpd")
+    _handle_age_click = partialmethod(_dispatch_click, "age")
+    _handle_size_click = partialmethod(_dispatch_click, "size")
+    _handle_finance_click = partialmethod(_dispatch_click, "finance")
+    _handle_legal_click = partialmethod(_dispatch_click, "legal")
+    _handle_duplicates_click = partialmethod(_dispatch_click, "duplicates")
+    _handle_duplicates_detailed_click = partialmethod(
+        _dispatch_click, "duplicates_detailed"
+    )
 
     def _handle_temporal_click(self, label_widget) -> None:
         click_info = getattr(label_widget, "click_info", {})
@@ -1595,23 +2327,8 @@ class AnalyticsTabClickManager:
                 break
 
         if not period:
-            label_text = label_widget.cget("text")
-            if "0-1" in label_text:
-                period = "0_1y"
-            elif "1-2" in label_text:
-                period = "1_2y"
-            elif "2-3" in label_text:
-                period = "2_3y"
-            elif "3-4" in label_text:
-                period = "3_4y"
-            elif "4-5" in label_text:
-                period = "4_5y"
-            elif "5-6" in label_text:
-                period = "5_6y"
-            elif "+6" in label_text:
-                period = "6plus"
-            else:
-                period = "0_1y"
+            match = _TEMPORAL_LABEL_RE.search(label_widget.cget("text"))
+            period = _TEMPORAL_LABEL_PERIODS[match.group(0)] if match else "0_1y"
 
         self.drill_down_viewer.show_temporal_files_modal(
             period,
@@ -1638,12 +2355,63 @@ class AnalyticsTabClickManager:
             )
 
 
+# Unités du drill-down utilisateur, une par tranche de 10 bits
+_USER_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Colonnes affichées du drill-down utilisateur: nom, chemin et date tronqués par SQLite
+_USER_FILES_DISPLAY = """
+    SELECT CASE WHEN length(f.name) > 50
+                THEN substr(f.name, 1, 50) || '...' ELSE f.name END as name,
+           CASE WHEN length(f.path) > 60
+                THEN substr(f.path, 1, 60) || '...' ELSE f.path END as path,
+           f.file_size,
+           COALESCE(NULLIF(substr(f.last_modified, 1, 19), ''), 'N/A') as modified,"""
+# Calcul direct (repli si user_category_files est indisponible)
+_USER_FILES_QUERY = _USER_FILES_DISPLAY + """
+           COALESCE(r.security_classification_cached, 'N/A') as classif,
+           COALESCE(r.rgpd_risk_cached, 'N/A') as rgpd
+    FROM fichiers f
+    LEFT JOIN reponses_llm r ON f.id = r.fichier_id
+    WHERE f.owner = ? AND (f.status IS NULL OR f.status != 'error')
+    {filter}
+    ORDER BY f.file_size DESC, f.id DESC
+    LIMIT ? OFFSET ?
+"""
+# Filtre optionnel et ses paramètres, insérés entre l'utilisateur et LIMIT/OFFSET
+_USER_FILES_SQL: Dict[str, Tuple[str, tuple]] = {
+    category: (_USER_FILES_QUERY.format(filter=condition), params)
+    for category, (condition, params) in USER_FILE_CATEGORIES.items()
+}
+# Lecture de la table matérialisée: une recherche (owner, category) triée par taille puis id
+_USER_CATEGORY_FILES_QUERY = _USER_FILES_DISPLAY + """
+           f.classif, f.rgpd
+    FROM user_category_files f
+    WHERE f.owner = ? AND f.category = ?
+    ORDER BY f.file_size DESC, f.fichier_id DESC
+    LIMIT ? OFFSET ?
+"""
+
+
 class UserDrillDownViewer:
     """Système de drill-down interactif pour l'exploration des fichiers utilisateur."""
 
+    # Lignes déjà chargées, rejouées sans requête à la réouverture d'une modale
+    FILES_CACHE_TTL = 30.0
+    FILES_CACHE_SIZE = 64
+    # Lignes insérées par tick Tk et intervalle de scrutation du worker
+    INSERT_BATCH_SIZE = 200
+    POLL_INTERVAL_MS = 50
+    COLUMNS = tuple(column for column, _, _ in _USER_FILES_COLUMNS)
+    # Lignes par page: au-delà, bouton "Suivant" plutôt qu'un Treeview géant
+    USER_PAGE_SIZE = 5000
+
     def __init__(self, parent_analytics_panel: "AnalyticsPanel") -> None:
         self.analytics_panel = parent_analytics_panel
         self.db_manager = parent_analytics_panel.db_manager
+        self._files_cache: "OrderedDict[tuple, Tuple[float, List[tuple]]]" = OrderedDict()
+        self._files_cache_lock = threading.Lock()
+        # (version des données, user_category_files à jour) vérifié une fois par version
+        self._category_files_state: Optional[Tuple[int, bool]] = None
 
     def show_user_files_modal(
         self, username: str, category: str, user_data: Dict[str, Any]
@@ -1668,30 +2436,23 @@ class UserDrillDownViewer:
 
             summary_label = ttk.Label(
                 header_frame,
-                text=f"Catégorie: {category} | {user_data.get('count', 0)} fichiers | {user_data.get('total_size', 0)/(1024**3):.1f} GB",
+                text=f"Catégorie: {category} | {user_data.get('count', 0)} fichiers | {user_data.get('total_size', 0) * INV_GIB:.1f} GB",
                 font=("Arial", 12),
             )
             summary_label.pack(anchor="w", pady=2)
 
+            page_label = ttk.Label(header_frame, text="", font=("Arial", 10))
+            page_label.pack(anchor="w")
+
             tree_frame = ttk.Frame(drill_window)
             tree_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
-            columns = ("nom", "chemin", "taille", "modifie", "classification", "rgpd")
-            tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=20)
-
-            tree.heading("nom", text="Nom du fichier")
-            tree.heading("chemin", text="Chemin")
-            tree.heading("taille", text="Taille")
-            tree.heading("modifie", text="Modifié")
-            tree.heading("classification", text="Classification")
-            tree.heading("rgpd", text="RGPD")
+            tree = ttk.Treeview(
+                tree_frame, columns=self.COLUMNS, show="headings", height=20
+            )
 
-            tree.column("nom", width=200)
-            tree.column("chemin", width=300)
-            tree.column("taille", width=100)
-            tree.column("modifie", width=150)
-            tree.column("classification", width=100)
-            tree.column("rgpd", width=100)
+            # En-têtes et largeurs en un seul appel Tcl
+            tree.tk.eval(_drill_columns_script(tree._w, _USER_FILES_COLUMNS))
 
             v_scrollbar = ttk.Scrollbar(
                 tree_frame, orient="vertical", command=tree.yview
@@ -1713,13 +2474,31 @@ class UserDrillDownViewer:
             ttk.Button(
                 buttons_frame,
                 text="📊 Export",
-                command=lambda: self._export_user_files(username, category),
+                command=partial(self._export_user_files, username, category),
             ).pack(side="left", padx=5)
+            page_state: Dict[str, Any] = {
+                "window": drill_window,
+                "tree": tree,
+                "username": username,
+                "category": category,
+                "offset": 0,
+                "loading": False,
+                "page_label": page_label,
+                "next_button": None,
+            }
+            next_button = ttk.Button(
+                buttons_frame,
+                text=f"▶ Suivant {self.USER_PAGE_SIZE}",
+                command=partial(self._next_user_page, page_state),
+                state="disabled",
+            )
+            next_button.pack(side="left", padx=5)
+            page_state["next_button"] = next_button
             ttk.Button(
                 buttons_frame, text="❌ Fermer", command=drill_window.destroy
             ).pack(side="right", padx=5)
 
-            self._load_user_files(tree, username, category)
+            self._load_user_files(page_state)
 
             drill_window.update_idletasks()
             x = (drill_window.winfo_screenwidth() // 2) - (700 // 2)
@@ -1729,7 +2508,7 @@ class UserDrillDownViewer:
             drill_window.deiconify()
             drill_window.lift()
             drill_window.focus_set()
-            drill_window.after(50, lambda: drill_window.grab_set())
+            drill_window.after(50, drill_window.grab_set)
 
             logger.info(f"Modal utilisateur créée: {username} - {category}")
 
@@ -1741,107 +2520,231 @@ class UserDrillDownViewer:
                 parent=self.analytics_panel.parent,
             )
 
-    def _load_user_files(
-        self, tree: ttk.Treeview, username: str, category: str
-    ) -> None:
-        """Charge les fichiers utilisateur dans le TreeView."""
-        try:
-            if not self.db_manager:
-                return
+    def _load_user_files(self, state: Dict[str, Any]) -> None:
+        """Lance le chargement de la page courante hors du thread Tk."""
+        if not self.db_manager:
+            return
+        state["loading"] = True
+        username, category, offset = state["username"], state["category"], state["offset"]
+        # Lots de lignes au fil de la lecture, puis None en fin de page
+        result_queue: queue.Queue = queue.Queue()
 
-            if category == "Gros fichiers":
-                query = """
-                    SELECT f.name, f.path, f.file_size, f.last_modified,
-                           COALESCE(r.security_classification_cached, 'N/A') as classif,
-                           COALESCE(r.rgpd_risk_cached, 'N/A') as rgpd
-                    FROM fichiers f
-                    LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                    WHERE f.owner = ? AND (f.status IS NULL OR f.status != 'error')
-                    AND f.file_size > 100000000
-                    ORDER BY f.file_size DESC
-                """
-            elif category == "Classification C3":
-                query = """
-                    SELECT f.name, f.path, f.file_size, f.last_modified,
-                           COALESCE(r.security_classification_cached, 'N/A') as classif,
-                           COALESCE(r.rgpd_risk_cached, 'N/A') as rgpd
-                    FROM fichiers f
-                    LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                    WHERE f.owner = ? AND (f.status IS NULL OR f.status != 'error')
-                    AND r.security_classification_cached = 'C3'
-                    ORDER BY f.file_size DESC
-                """
-            elif category == "RGPD Critical":
-                query = """
-                    SELECT f.name, f.path, f.file_size, f.last_modified,
-                           COALESCE(r.security_classification_cached, 'N/A') as classif,
-                           COALESCE(r.rgpd_risk_cached, 'N/A') as rgpd
-                    FROM fichiers f
-                    LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                    WHERE f.owner = ? AND (f.status IS NULL OR f.status != 'error')
-                    AND r.rgpd_risk_cached = 'critical'
-                    ORDER BY f.file_size DESC
-                """
-            else:
-                query = """
-                    SELECT f.name, f.path, f.file_size, f.last_modified,
-                           COALESCE(r.security_classification_cached, 'N/A') as classif,
-                           COALESCE(r.rgpd_risk_cached, 'N/A') as rgpd
-                    FROM fichiers f
-                    LEFT JOIN reponses_llm r ON f.id = r.fichier_id
-                    WHERE f.owner = ? AND (f.status IS NULL OR f.status != 'error')
-                    ORDER BY f.file_size DESC
-                """
+        def worker() -> None:
+            try:
+                self._fetch_user_files(
+                    username, category, offset, on_batch=result_queue.put
+                )
+                result_queue.put(None)
+            except Exception as exc:  # pragma: no cover - runtime
+                result_queue.put(exc)
 
-            with self.db_manager._connect().get() as conn:
-                cursor = conn.cursor()
-                cursor.execute(query, (username,))
-                rows = cursor.fetchall()
+        threading.Thread(target=worker, daemon=True).start()
+        state["window"].after(
+            self.POLL_INTERVAL_MS, self._drain_results, state, result_queue
+        )
 
-                for row in rows:
-                    name, path, size, modified, classif, rgpd = row
-                    size_str = self._format_file_size(size)
-                    modified_str = modified[:19] if modified else "N/A"
-                    tree.insert(
-                        "",
-                        "end",
-                        values=(
-                            name[:50] + "..." if len(name) > 50 else name,
-                            path[:60] + "..." if len(path) > 60 else path,
-                            size_str,
-                            modified_str,
-                            classif,
-                            rgpd,
-                        ),
-                    )
+    def _next_user_page(self, state: Dict[str, Any]) -> None:
+        """Remplace le contenu de la modale par la page suivante."""
+        if state["loading"]:
+            return
+        tree = state["tree"]
+        tree.delete(*tree.get_children())
+        state["offset"] += self.USER_PAGE_SIZE
+        self._load_user_files(state)
 
-                logger.info(
-                    f"Chargement {len(rows)} fichiers pour utilisateur {username}"
-                )
+    def _fetch_user_files(
+        self,
+        username: str,
+        category: str,
+        offset: int = 0,
+        on_batch: Optional[Callable[[List[tuple]], None]] = None,
+    ) -> List[tuple]:
+        """Return one page of a user drill-down (worker thread, no Tk access).
+
+        ``on_batch`` receives the rows in ``INSERT_BATCH_SIZE`` chunks as they
+        are read, so the first rows can be shown before the page is complete.
+        """
+        batch_size = self.INSERT_BATCH_SIZE
+        rows = self._get_cached_user_files(username, category, offset)
+        if rows is not None:
+            if on_batch is not None:
+                for start in range(0, len(rows), batch_size):
+                    on_batch(rows[start : start + batch_size])
+            return rows
+        key = category if category in USER_FILE_CATEGORIES else "all"
+        rows = []
+        with self.db_manager._connect().get() as conn:
+            if self._use_user_category_files(conn):
+                query = _USER_CATEGORY_FILES_QUERY
+                params: tuple = (username, key)
+            else:
+                query, filter_params = _USER_FILES_SQL[key]
+                params = (username, *filter_params)
+            cursor = conn.cursor()
+            cursor.arraysize = batch_size
+            cursor.execute(query, params + (self.USER_PAGE_SIZE, offset))
+            while True:
+                batch = cursor.fetchmany()
+                if not batch:
+                    break
+                rows.extend(batch)
+                if on_batch is not None:
+                    on_batch(batch)
+        self._store_cached_user_files(username, category, offset, rows)
+        return rows
 
+    def _use_user_category_files(self, conn: sqlite3.Connection) -> bool:
+        """True when user_category_files is current for this data version.
+
+        La table est recalculée à l'import et en fin d'analyse, jamais ici:
+        absente ou périmée, la requête directe sur fichiers prend le relais.
+        """
+        version = getattr(self.analytics_panel, "_data_version", 0)
+        checked = self._category_files_state
+        if checked and checked[0] == version:
+            return checked[1]
+        try:
+            current = user_category_files_current(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"user_category_files indisponible, calcul direct: {e}")
+            current = False
+        self._category_files_state = (version, current)
+        return current
+
+    def _drain_results(
+        self, state: Dict[str, Any], result_queue: queue.Queue, loaded: int = 0
+    ) -> None:
+        """Insère un lot reçu du worker par tick pour garder l'interface réactive."""
+        drill_window = state["window"]
+        try:
+            if not drill_window.winfo_exists():
+                return  # modale fermée avant la fin du chargement
+            try:
+                batch = result_queue.get_nowait()
+            except queue.Empty:
+                drill_window.after(
+                    self.POLL_INTERVAL_MS,
+                    self._drain_results,
+                    state,
+                    result_queue,
+                    loaded,
+                )
+                return
+            if isinstance(batch, Exception):
+                raise batch
+            if batch is not None:
+                self._populate_tree(state["tree"], batch)
+                loaded += len(batch)
+                drill_window.after(1, self._drain_results, state, result_queue, loaded)
+                return
+            state["loading"] = False
+            page = state["offset"] // self.USER_PAGE_SIZE + 1
+            if state["page_label"] is not None:
+                state["page_label"].config(text=f"{loaded} affichés (page {page})")
+            if state["next_button"] is not None:
+                has_more = loaded == self.USER_PAGE_SIZE
+                state["next_button"].config(state="normal" if has_more else "disabled")
+            logger.info(
+                f"Chargement {loaded} fichiers pour utilisateur {state['username']}"
+            )
+        except tk.TclError:
+            return
         except Exception as e:
+            state["loading"] = False
             logger.error(f"Erreur chargement fichiers utilisateur: {e}")
 
-    def _format_file_size(self, size_bytes: int) -> str:
-        """Formate la taille de fichier lisible."""
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+    def _populate_tree(self, tree: ttk.Treeview, rows: List[tuple]) -> None:
+        """Insère un lot de lignes (nom, chemin, taille, date, classif, rgpd)."""
+        fmt_size = self._format_file_size
+        formatted_rows = [
+            (name, path, fmt_size(size), modified, classif, rgpd)
+            for name, path, size, modified, classif, rgpd in rows
+        ]
+        call, widget = tree.tk.call, tree._w
+        # Colonnes masquées pendant le lot: une seule mise en page à la fin
+        call(widget, "configure", "-displaycolumns", "")
+        tree.tk.eval(_drill_stretch_script(widget, False, len(self.COLUMNS)))
+        try:
+            for values in formatted_rows:
+                call(widget, "insert", "", "end", "-values", values)
+        finally:
+            call(widget, "configure", "-displaycolumns", "#all")
+            tree.tk.eval(_drill_stretch_script(widget, True, len(self.COLUMNS)))
+
+    def _get_cached_user_files(
+        self, username: str, category: str, offset: int = 0
+    ) -> Optional[List[tuple]]:
+        """Return cached rows for (username, category, page) while still fresh."""
+        key = (
+            username,
+            category,
+            offset,
+            getattr(self.analytics_panel, "_data_version", 0),
+        )
+        with self._files_cache_lock:
+            hit = self._files_cache.get(key)
+            if hit and time.time() - hit[0] < self.FILES_CACHE_TTL:
+                self._files_cache.move_to_end(key)
+                return hit[1]
+        return None
+
+    def _store_cached_user_files(
+        self, username: str, category: str, offset: int, rows: List[tuple]
+    ) -> None:
+        """Remember fetched rows, evicting the least recently used entries."""
+        key = (
+            username,
+            category,
+            offset,
+            getattr(self.analytics_panel, "_data_version", 0),
+        )
+        with self._files_cache_lock:
+            self._files_cache[key] = (time.time(), rows)
+            self._files_cache.move_to_end(key)
+            while len(self._files_cache) > self.FILES_CACHE_SIZE:
+                self._files_cache.popitem(last=False)
+
+    @staticmethod
+    def _format_file_size(size_bytes: int) -> str:
+        """Formate la taille de fichier lisible (unité tirée de ``bit_length``)."""
+        size_bytes = int(size_bytes or 0)
+        if size_bytes <= 0:
+            return f"{size_bytes:.1f} B"
+        idx = min((size_bytes.bit_length() - 1) // 10, 5)
+        return f"{size_bytes / (1 << (10 * idx)):.1f} {_USER_SIZE_UNITS[idx]}"
 
     def _export_user_files(self, username: str, category: str) -> None:
         """Exporte les fichiers utilisateur."""
         messagebox.showinfo("Export", f"Export des fichiers de {username} - {category}")
 
 
+class _AnalysisFallback(dict):
+    """Résultat par défaut renvoyé après une erreur: jamais mis en cache."""
+
+
 class AnalyticsPanel:
     """Dashboard de supervision business."""
 
+    # Lignes traitées par lot lors de l'agrégation temporelle vectorisée
+    TEMPORAL_CHUNK_SIZE = 50000
+    # Délai de regroupement des demandes d'actualisation successives
+    REFRESH_DEBOUNCE_MS = 200
+    # Au-delà de ce nombre de fichiers, l'export JSON est écrit sans indentation
+    COMPACT_EXPORT_THRESHOLD = 1_000_000
+    # Récupération: au-delà de ce nombre de lignes, les métriques sont échantillonnées
+    RECOVERY_SAMPLE_THRESHOLD = 1_000_000
+    RECOVERY_SAMPLE_SIZE = 100_000
+    # Validations réussies par db_manager, partagées entre panneaux (secondes)
+    VALIDATION_CACHE_TTL = 60.0
+    _validation_cache: "weakref.WeakKeyDictionary[Any, Dict[str, float]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(self, parent, db_manager) -> None:
         """Initialize Analytics Panel with robust database manager handling."""
 
         self.parent = parent
+        schema_valid = False
 
         if db_manager is None:
             logger.critical("AnalyticsPanel initialized with None database manager")
@@ -1849,19 +2752,23 @@ class AnalyticsPanel:
             self.db_manager = None
         else:
             try:
+                # Une seule connexion du pool pour toutes les validations initiales
                 with db_manager._connect().get() as conn:
                     cursor = conn.cursor()
                     cursor.execute(
                         "SELECT name FROM sqlite_master WHERE type='table' LIMIT 1"
                     )
                     cursor.fetchone()
-                self.db_manager = db_manager
-                self._db_manager_error = False
-                logger.info("Analytics Panel: Database manager validated successfully")
-                if not self._validate_connection_manager():
-                    logger.warning(
-                        "Connection manager validation failed during initialization"
+                    self.db_manager = db_manager
+                    self._db_manager_error = False
+                    logger.info(
+                        "Analytics Panel: Database manager validated successfully"
                     )
+                    if not self._validate_connection_manager(conn):
+                        logger.warning(
+                            "Connection manager validation failed during initialization"
+                        )
+                    schema_valid = self._validate_database_schema(conn)
             except Exception as e:
                 logger.error("Database manager validation failed during init: %s", e)
                 self._db_manager_error = True
@@ -1881,17 +2788,39 @@ class AnalyticsPanel:
         self._metrics_cache: Dict[str, Any] = {}
         self._cache_timestamp = 0.0
         self.CACHE_DURATION = 30
+        # Résultats d'analyses SQL indexés par révision des données
+        self._analysis_cache: Dict[str, tuple] = {}
+        # Version des données, incrémentée à chaque invalidation du cache
+        self._data_version = 0
+        self._files_context_cache: Optional[tuple] = None
+        # (version, (classification, rgpd, legal)) issus d'une seule jointure
+        self._maps_cache: Optional[tuple] = None
+        self._file_buckets: Optional[tuple] = None
+        self._prefs_cache: Optional[tuple] = None
+        self._recommendations_cache: Optional[tuple] = None
+        # Identifiant du after() d'actualisation différée (debounce)
+        self._refresh_after: Optional[str] = None
+        # Dernier texte écrit par label, pour éviter les appels Tcl inutiles
+        self._last_label_text: Dict[Any, str] = {}
+        # Préfixe constant de chaque label temporel, fixé à la création
+        self._label_prefix: Dict[Any, str] = {}
+        # Signature du dernier classement affiché par catégorie top_users
+        self._top_users_sig: Dict[str, tuple] = {}
 
         # async calculation helpers
         self._calculation_thread: Optional[threading.Thread] = None
         self._result_queue: queue.Queue = queue.Queue()
         self._calculation_in_progress = False
+        # Tâches ponctuelles hors thread UI (ex: détection des doublons)
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="analytics-ui"
+        )
         self.click_manager = AnalyticsTabClickManager(self)
 
         if self._db_manager_error:
             self._show_database_manager_error()
         else:
-            if not self._validate_database_schema():
+            if not schema_valid:
                 logger.error("Database schema validation failed during initialization")
                 self._show_schema_error()
             else:
@@ -1910,8 +2839,22 @@ class AnalyticsPanel:
         """Wrapper to build the analytics UI."""
         self._build_ui()
 
+    def _reset_root_frame(self) -> ttk.Frame:
+        """Remplace tout le contenu du panneau par un cadre vide.
+
+        Toute l'interface vit dans ``self._root_frame``: un seul ``destroy``
+        Tk suffit pour la retirer, au lieu d'un appel par enfant du parent.
+        """
+        old_frame = getattr(self, "_root_frame", None)
+        if old_frame is not None:
+            old_frame.destroy()
+        self._root_frame = ttk.Frame(self.parent)
+        self._root_frame.pack(fill="both", expand=True)
+        return self._root_frame
+
     def _build_ui(self) -> None:
-        params_frame = ttk.LabelFrame(self.parent, text="⚙️ PARAMÈTRES UTILISATEUR")
+        root_frame = self._reset_root_frame()
+        params_frame = ttk.LabelFrame(root_frame, text="⚙️ PARAMÈTRES UTILISATEUR")
         params_frame.pack(fill="x", padx=5, pady=5)
 
         ttk.Label(params_frame, text="Âge fichiers (années):").grid(
@@ -1960,7 +2903,7 @@ class AnalyticsPanel:
         ).grid(row=0, column=10, padx=5)
 
         alerts_frame = ttk.LabelFrame(
-            self.parent, text="📊 SUPERVISION BUSINESS - MÉTRIQUES CLÉS"
+            root_frame, text="📊 SUPERVISION BUSINESS - MÉTRIQUES CLÉS"
         )
         alerts_frame.pack(fill="x", padx=5, pady=5)
         cards_container = ttk.Frame(alerts_frame)
@@ -2036,7 +2979,7 @@ class AnalyticsPanel:
             cards_container.columnconfigure(i, weight=1)
 
         notebook_frame = ttk.LabelFrame(
-            self.parent, text="🔍 ANALYSE DÉTAILLÉE BUSINESS INTELLIGENCE"
+            root_frame, text="🔍 ANALYSE DÉTAILLÉE BUSINESS INTELLIGENCE"
         )
         notebook_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
@@ -2077,7 +3020,7 @@ class AnalyticsPanel:
         self.thematic_notebook.add(top_users_frame, text="🏆 Top Utilisateurs")
         self._build_top_users_tab(top_users_frame)
 
-        actions_frame = ttk.Frame(self.parent)
+        actions_frame = ttk.Frame(root_frame)
         actions_frame.pack(fill="x", padx=5, pady=5)
 
         self.progress_frame = ttk.Frame(actions_frame)
@@ -2108,28 +3051,52 @@ class AnalyticsPanel:
         try:
             if hasattr(self, "click_manager"):
                 self.click_manager.add_click_handlers_to_all_tabs()
-                logger.info("Click functionality initialized for all analytics tabs")
+                logger.info("Click functionality scheduled for all analytics tabs")
         except Exception as e:  # pragma: no cover - init
             logger.error("Failed to initialize click functionality: %s", e)
 
-    def _validate_connection_manager(self) -> bool:
+    def _validate_connection_manager(
+        self, conn: Optional[sqlite3.Connection] = None
+    ) -> bool:
         """Validate that database connection manager works properly."""
         try:
             if not self.db_manager:
                 logger.error("No database manager available for validation")
                 return False
+            if self._validation_is_cached("connection"):
+                return True
 
-            with self.db_manager._connect().get() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
+            if conn is None:
+                with self.db_manager._connect().get() as pooled:
+                    pooled.execute("SELECT 1").fetchone()
+            else:
+                conn.execute("SELECT 1").fetchone()
 
             logger.info("Database connection manager validation successful")
+            self._remember_validation("connection")
             return True
         except Exception as e:
             logger.error(f"Connection manager validation failed: {e}")
             return False
 
+    def _validation_is_cached(self, check: str) -> bool:
+        """True if ``check`` succeeded for this db_manager less than a TTL ago."""
+        try:
+            checks = self._validation_cache.get(self.db_manager)
+        except TypeError:  # db_manager sans weakref possible
+            return False
+        if not checks or check not in checks:
+            return False
+        return time.time() - checks[check] < self.VALIDATION_CACHE_TTL
+
+    def _remember_validation(self, check: str) -> None:
+        """Record a successful validation; failures are always re-checked."""
+        try:
+            checks = self._validation_cache.setdefault(self.db_manager, {})
+        except TypeError:
+            return
+        checks[check] = time.time()
+
     def _ensure_database_manager(self) -> bool:
         """Ensure database manager is available and functional."""
         if self.db_manager is None:
@@ -2158,56 +3125,70 @@ class AnalyticsPanel:
             self.db_manager = None
             return False
 
-    def _validate_database_schema(self) -> bool:
-        """Validate database schema compatibility."""
+    def _validate_database_schema(
+        self, conn: Optional[sqlite3.Connection] = None
+    ) -> bool:
+        """Validate database schema compatibility.
+
+        ``conn`` permet de réutiliser une connexion déjà ouverte et validée
+        (initialisation); sinon une connexion du pool est prise.
+        """
 
-        if not self._ensure_database_manager():
+        if conn is None and not self._ensure_database_manager():
             logger.error("No database manager available for analytics")
             return False
+        if self._validation_is_cached("schema"):
+            return True
 
         try:
-            with self.db_manager._connect().get() as conn:
-                cursor = conn.cursor()
-
-                cursor.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('fichiers', 'reponses_llm')"
-                )
-                tables = [row[0] for row in cursor.fetchall()]
+            if conn is None:
+                with self.db_manager._connect().get() as pooled:
+                    valid = self._check_schema(pooled)
+            else:
+                valid = self._check_schema(conn)
+        except Exception as e:
+            logger.error(f"Database schema validation failed: {e}")
+            return False
+        if valid:
+            self._remember_validation("schema")
+        return valid
 
-                if "fichiers" not in tables:
-                    logger.error("Table 'fichiers' not found in database")
-                    return False
+    def _check_schema(self, conn: sqlite3.Connection) -> bool:
+        """Tables, colonnes requises et présence d'au moins un fichier actif."""
+        cursor = conn.cursor()
 
-                cursor.execute("PRAGMA table_info(fichiers)")
-                columns = [row[1] for row in cursor.fetchall()]
-                required_columns = ["id", "path", "file_size", "status", "owner"]
-                missing_columns = [
-                    col for col in required_columns if col not in columns
-                ]
-                if missing_columns:
-                    logger.error(
-                        f"Missing required columns in fichiers table: {missing_columns}"
-                    )
-                    return False
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('fichiers', 'reponses_llm')"
+        )
+        tables = [row[0] for row in cursor.fetchall()]
 
-                cursor.execute(
-                    "SELECT COUNT(*) FROM fichiers WHERE (status IS NULL OR status != 'error')"
-                )
-                file_count = cursor.fetchone()[0]
-                logger.info(f"Found {file_count} available files in database")
+        if "fichiers" not in tables:
+            logger.error("Table 'fichiers' not found in database")
+            return False
 
-                return file_count > 0
+        cursor.execute("PRAGMA table_info(fichiers)")
+        columns = [row[1] for row in cursor.fetchall()]
+        required_columns = ["id", "path", "file_size", "status", "owner"]
+        missing_columns = [col for col in required_columns if col not in columns]
+        if missing_columns:
+            logger.error(
+                f"Missing required columns in fichiers table: {missing_columns}"
+            )
+            return False
 
-        except Exception as e:
-            logger.error(f"Database schema validation failed: {e}")
+        # Test d'existence: s'arrête à la première ligne au lieu de compter
+        cursor.execute(
+            "SELECT 1 FROM fichiers WHERE (status IS NULL OR status != 'error') LIMIT 1"
+        )
+        if cursor.fetchone() is None:
+            logger.info("No available files in database")
             return False
+        logger.info("Available files found in database")
+        return True
 
     def _show_database_manager_error(self) -> None:
         """Display enhanced database manager error with recovery options."""
-        for widget in self.parent.winfo_children():
-            widget.destroy()
-
-        error_frame = ttk.Frame(self.parent)
+        error_frame = ttk.Frame(self._reset_root_frame())
         error_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
         title_label = ttk.Label(
@@ -2277,9 +3258,6 @@ class AnalyticsPanel:
                         )
                         cursor.fetchone()
 
-                    for widget in self.parent.winfo_children():
-                        widget.destroy()
-
                     if self._validate_database_schema():
                         self._build_interface()
                         self._initialize_click_functionality()
@@ -2367,7 +3345,7 @@ class AnalyticsPanel:
 
     def _show_schema_error(self) -> None:
         """Display schema validation error to user."""
-        error_frame = ttk.Frame(self.parent)
+        error_frame = ttk.Frame(self._reset_root_frame())
         error_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
         ttk.Label(
@@ -2385,7 +3363,7 @@ class AnalyticsPanel:
 
     def _show_initialization_error(self, error: Exception) -> None:
         """Display initialization error to user."""
-        error_frame = ttk.Frame(self.parent)
+        error_frame = ttk.Frame(self._reset_root_frame())
         error_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
         ttk.Label(
@@ -2406,9 +3384,6 @@ class AnalyticsPanel:
     def _retry_initialization(self) -> None:
         """Retry analytics panel initialization."""
         try:
-            for widget in self.parent.winfo_children():
-                widget.destroy()
-
             if self.db_manager and self._validate_database_schema():
                 self._build_interface()
                 self._initialize_click_functionality()
@@ -2557,23 +3532,28 @@ class AnalyticsPanel:
         )
         return result
 
-    def _query_distribution(self, column: str) -> Dict[str, Dict[str, Any]]:
-        result: Dict[str, Dict[str, Any]] = {}
+    def _query_distributions_bulk(
+        self, columns: List[str]
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Run every distribution query on a single pooled connection."""
+        results: Dict[str, Dict[str, Dict[str, Any]]] = {col: {} for col in columns}
         if self.db_manager is None:
-            return result
+            return results
         try:
             with self.db_manager._connect().get() as conn:
-                cur = conn.cursor()
-                cur.execute(
-                    f"SELECT COALESCE(r.{column}, 'none'), COUNT(*), SUM(f.file_size)"
-                    " FROM fichiers f LEFT JOIN reponses_llm r ON f.id = r.fichier_id"
-                    f" GROUP BY r.{column}"
-                )
-                for name, count, size in cur.fetchall():
-                    result[str(name)] = {"count": count or 0, "size": size or 0}
-        except Exception:
-            pass
-        return result
+                for column in columns:
+                    rows = conn.execute(
+                        f"SELECT COALESCE(r.{column}, 'none'), COUNT(*),"
+                        " COALESCE(SUM(f.file_size), 0)"
+                        " FROM fichiers f LEFT JOIN reponses_llm r ON f.id = r.fichier_id"
+                        f" GROUP BY r.{column}"
+                    ).fetchall()
+                    dist = results[column]
+                    for name, count, size in rows:
+                        dist[str(name)] = {"count": count or 0, "size": size or 0}
+        except Exception as e:
+            logger.warning(f"Distribution queries failed: {e}")
+        return results
 
     def _get_classification_distribution_optimized(self) -> List[tuple]:
         if self.db_manager is None:
@@ -2617,53 +3597,48 @@ class AnalyticsPanel:
             )
             return [row[0] for row in cursor.fetchall()]
 
-    def _get_classification_map(self) -> Dict[int, str]:
-        mapping: Dict[int, str] = {}
+    def _get_all_maps(self) -> Tuple[Dict[int, str], Dict[int, str], Dict[int, str]]:
+        """Return (classification, rgpd, legal) maps from a single join pass."""
+        cached = getattr(self, "_maps_cache", None)
+        version = getattr(self, "_data_version", 0)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        class_map: Dict[int, str] = {}
+        rgpd_map: Dict[int, str] = {}
+        legal_map: Dict[int, str] = {}
+        maps = (class_map, rgpd_map, legal_map)
         if self.db_manager is None:
-            return mapping
+            return maps
         try:
             with self.db_manager._connect().get() as conn:
                 cur = conn.cursor()
-                cur.execute(
-                    "SELECT f.id, r.security_classification_cached FROM fichiers f LEFT JOIN reponses_llm r ON f.id = r.fichier_id"
-                )
-                for fid, cls in cur.fetchall():
-                    mapping[int(fid)] = cls or ""
-        except Exception:
-            pass
-        return mapping
+                cur.arraysize = 1000
+                cur.execute(_ALL_MAPS_SQL)
+                while True:
+                    rows = cur.fetchmany()
+                    if not rows:
+                        break
+                    for fid, cls, lvl, typ in rows:
+                        fid = int(fid)
+                        class_map[fid] = cls or ""
+                        rgpd_map[fid] = lvl or "none"
+                        legal_map[fid] = typ or "none"
+        except Exception as e:
+            # Pas de mise en cache d'un résultat partiel
+            logger.warning(f"Chargement des classifications impossible: {e}")
+            return ({}, {}, {})
+        self._maps_cache = (version, maps)
+        return maps
+
+    def _get_classification_map(self) -> Dict[int, str]:
+        return self._get_all_maps()[0]
 
     def _get_rgpd_map(self) -> Dict[int, str]:
-        mapping: Dict[int, str] = {}
-        if self.db_manager is None:
-            return mapping
-        try:
-            with self.db_manager._connect().get() as conn:
-                cur = conn.cursor()
-                cur.execute(
-                    "SELECT f.id, r.rgpd_risk_cached FROM fichiers f LEFT JOIN reponses_llm r ON f.id = r.fichier_id"
-                )
-                for fid, lvl in cur.fetchall():
-                    mapping[int(fid)] = lvl or "none"
-        except Exception:
-            pass
-        return mapping
+        return self._get_all_maps()[1]
 
     def _get_legal_map(self) -> Dict[int, str]:
-        mapping: Dict[int, str] = {}
-        if self.db_manager is None:
-            return mapping
-        try:
-            with self.db_manager._connect().get() as conn:
-                cur = conn.cursor()
-                cur.execute(
-                    "SELECT f.id, r.legal_type_cached FROM fichiers f LEFT JOIN reponses_llm r ON f.id = r.fichier_id"
-                )
-                for fid, typ in cur.fetchall():
-                    mapping[int(fid)] = typ or "none"
-        except Exception:
-            pass
-        return mapping
+        return self._get_all_maps()[2]
 
     def _get_all_files_safe(self) -> List[FileInfo]:
         """Get all files with comprehensive error handling."""
@@ -2740,7 +3715,7 @@ class AnalyticsPanel:
             # Calcul de l'espace archivable (union des fichiers volumineux ET anciens)
             archival_size_gb = (
                 sum(f.file_size for f in large_files) + sum(f.file_size for f in dormant_files)
-            ) / (1024 ** 3)
+            ) * INV_GIB
 
             # Nombre total de fichiers affectés (union sans doublons)
             total_affected = len({f.id for f in large_files} | {f.id for f in dormant_files})
@@ -2866,9 +3841,63 @@ class AnalyticsPanel:
     # Metrics caching helpers
     # ------------------------------------------------------------------
 
+    def close(self) -> None:
+        """Release the drill-down read connections and the UI task executor."""
+        for viewer in (
+            getattr(getattr(self, "click_manager", None), "drill_down_viewer", None),
+            getattr(self, "drill_down_viewer", None),
+        ):
+            if isinstance(viewer, AnalyticsDrillDownViewer):
+                viewer.close()
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _invalidate_cache(self) -> None:
         self._metrics_cache.clear()
         self._cache_timestamp = 0.0
+        self._data_version += 1
+        self._maps_cache = None
+        _parse_date_cached.cache_clear()
+
+    def _clear_analysis_cache(self) -> None:
+        """Drop revision-keyed analysis results (explicit user refresh)."""
+        self._analysis_cache.clear()
+
+    def _get_data_revision(self) -> str:
+        """Return a cheap fingerprint of the fichiers table contents."""
+        with self.db_manager._connect().get() as conn:
+            max_rowid, total, errors = conn.execute(
+                """
+                SELECT COALESCE(MAX(rowid), 0), COUNT(*),
+                       (SELECT COUNT(*) FROM fichiers WHERE status = 'error')
+                FROM fichiers
+                """
+            ).fetchone()
+        # La date du jour fait partie de la révision: les tranches d'âge en dépendent
+        return f"{max_rowid}_{total}_{errors}_{datetime.now().date().isoformat()}"
+
+    def _cached_analysis(self, name: str, compute) -> Any:
+        """Return ``compute()`` result, reused while the data revision is unchanged.
+
+        Only successful results are stored; ``_AnalysisFallback`` defaults are not.
+        """
+        try:
+            revision = self._get_data_revision()
+        except Exception as e:
+            logger.debug(f"Révision des données indisponible pour {name}: {e}")
+            return compute()
+
+        cached = self._analysis_cache.get(name)
+        if cached and cached[0] == revision:
+            logger.debug(f"Analyse {name} servie depuis le cache (révision {revision})")
+            return cached[1]
+
+        result = compute()
+        # Valeurs par défaut d'un échec transitoire: recalculées au prochain appel
+        if not isinstance(result, _AnalysisFallback):
+            self._analysis_cache[name] = (revision, result)
+        return result
 
     # ------------------------------------------------------------------
     # Async helpers
@@ -2922,7 +3951,7 @@ class AnalyticsPanel:
             total_files = global_metrics.get("total_files", 0)
             total_size_gb = global_metrics.get("total_size_gb", 0)
             if not hasattr(self, "totals_label"):
-                totals_frame = ttk.Frame(self.parent)
+                totals_frame = ttk.Frame(self._root_frame)
                 totals_frame.pack(fill="x", padx=5, pady=2)
                 self.totals_label = ttk.Label(
                     totals_frame,
@@ -3079,28 +4108,16 @@ class AnalyticsPanel:
         )
         dup_families = self.duplicate_detector.detect_duplicate_family(files)
         dup_stats = self.duplicate_detector.get_duplicate_statistics(dup_families)
-        class_map = self._get_classification_map()
-        rgpd_map = self._get_rgpd_map()
-        legal_map = self._get_legal_map()
-        super_critical_files = [
-            f
-            for f in files
-            if (
-                class_map.get(f.id) == "C3"
-                and rgpd_map.get(f.id) == "critical"
-                and legal_map.get(f.id) in ["nda", "litigation"]
-            )
-        ]
-        critical_files = [
-            f
-            for f in files
-            if (
-                class_map.get(f.id) == "C3"
-                or rgpd_map.get(f.id) == "critical"
-                or legal_map.get(f.id) in ["nda", "litigation"]
-            )
-            and f not in super_critical_files
-        ]
+        class_map, rgpd_map, legal_map = self._get_all_maps()
+        # Un seul passage: chaque fichier rangé dans au plus une catégorie
+        super_critical_files: List[FileInfo] = []
+        critical_files: List[FileInfo] = []
+        for f in files:
+            cls, rgpd, legal = class_map.get(f.id), rgpd_map.get(f.id), legal_map.get(f.id)
+            if is_super_critical(cls, rgpd, legal):
+                super_critical_files.append(f)
+            elif is_any_critical(cls, rgpd, legal):
+                critical_files.append(f)
         duplicates_2x = self._count_files_duplicated_n_times(dup_families, 2)
         duplicates_3x = self._count_files_duplicated_n_times(dup_families, 3)
         duplicates_4x = self._count_files_duplicated_n_times(dup_families, 4)
@@ -3119,7 +4136,7 @@ class AnalyticsPanel:
                     if total_files
                     else 0
                 ),
-                "size_gb": sum(f.file_size for f in super_critical_files) / (1024**3),
+                "size_gb": sum(f.file_size for f in super_critical_files) * INV_GIB,
             },
             "critical": {
                 "count": len(critical_files),
@@ -3128,7 +4145,7 @@ class AnalyticsPanel:
                     if total_files
                     else 0
                 ),
-                "size_gb": sum(f.file_size for f in critical_files) / (1024**3),
+                "size_gb": sum(f.file_size for f in critical_files) * INV_GIB,
             },
             "duplicates": {
                 "files_2x": duplicates_2x,
@@ -3136,7 +4153,7 @@ class AnalyticsPanel:
                 "files_4x": duplicates_4x,
                 "max_copies": max_duplicates,
                 "total_groups": len(dup_families),
-                "wasted_space_gb": dup_stats.get("space_wasted_bytes", 0) / (1024**3),
+                "wasted_space_gb": dup_stats.get("space_wasted_bytes", 0) * INV_GIB,
                 "percentage": (
                     round(dup_stats.get("total_duplicates", 0) / total_files * 100, 1)
                     if total_files
@@ -3146,7 +4163,7 @@ class AnalyticsPanel:
             "size_age": size_age_direct,
             "global": {
                 "total_files": total_files,
-                "total_size_gb": total_size / (1024**3),
+                "total_size_gb": total_size * INV_GIB,
             },
         }
 
@@ -3159,6 +4176,20 @@ class AnalyticsPanel:
     def calculate_business_metrics(self) -> Dict[str, Any]:
         """Calculate comprehensive business metrics with robust error handling."""
 
+        # Mémo par version des données et seuils courants
+        memo_key = (
+            f"business_metrics_{self.threshold_age_years.get()}"
+            f"_{self.threshold_size_mb.get()}"
+        )
+        cached = self._metrics_cache.get(memo_key)
+        if (
+            cached is not None
+            and cached[0] == self._data_version
+            and time.time() - cached[1] < self.CACHE_DURATION
+        ):
+            return cached[2]
+        data_version = self._data_version
+
         try:
             if not self._validate_database_schema():
                 logger.error("Database schema validation failed")
@@ -3171,12 +4202,19 @@ class AnalyticsPanel:
 
             logger.info(f"Successfully retrieved {len(files)} files for analytics")
 
-            metrics = {
-                "global": {
-                    "total_files": len(files),
-                    "total_size_gb": sum(f.file_size for f in files) / (1024**3),
-                }
+            # Analyses SQL indépendantes: chaque tâche prend sa propre connexion du pool
+            executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="analytics")
+            futures = {
+                name: executor.submit(self._cached_analysis, name, compute)
+                for name, compute in (
+                    ("temporal", self._calculate_temporal_analysis),
+                    ("size", self._calculate_size_analysis),
+                    ("duplicates_analysis", self._calculate_duplicates_analysis),
+                )
             }
+            executor.shutdown(wait=False)
+
+            metrics = {"global": self._calculate_global_metrics(files)}
 
             try:
                 class_map = self._get_classification_map_safe()
@@ -3205,7 +4243,7 @@ class AnalyticsPanel:
                 }
 
             try:
-                metrics["duplicates_analysis"] = self._calculate_duplicates_analysis()
+                metrics["duplicates_analysis"] = futures["duplicates_analysis"].result()
             except Exception as e:
                 logger.warning("Detailed duplicate analysis failed: %s", e)
                 metrics["duplicates_analysis"] = {
@@ -3222,7 +4260,7 @@ class AnalyticsPanel:
                 metrics["top_users"] = {}
 
             try:
-                temporal = self._calculate_temporal_analysis()
+                temporal = futures["temporal"].result()
                 metrics["temporal_creation"] = temporal.get("creation_dates", {})
                 metrics["temporal_modification"] = temporal.get(
                     "modification_dates", {}
@@ -3233,7 +4271,7 @@ class AnalyticsPanel:
                 metrics["temporal_modification"] = {}
 
             try:
-                metrics["file_size_analysis"] = self._calculate_size_analysis().get(
+                metrics["file_size_analysis"] = futures["size"].result().get(
                     "size_distribution", {}
                 )
             except Exception as e:
@@ -3261,8 +4299,12 @@ class AnalyticsPanel:
                     "total_affected": 0
                 }
 
-            self._metrics_cache["business_metrics"] = metrics
             self._cache_timestamp = time.time()
+            self._metrics_cache[memo_key] = (
+                data_version,
+                self._cache_timestamp,
+                metrics,
+            )
 
             self._last_calculated_metrics = metrics
 
@@ -3524,7 +4566,7 @@ class AnalyticsPanel:
                 "percentage": (
                     round(files_count / total_files * 100, 1) if total_files else 0
                 ),
-                "size_gb": size_total / (1024**3),
+                "size_gb": size_total * INV_GIB,
                 "families_count": len(matching_families),
             }
 
@@ -3611,6 +4653,7 @@ class AnalyticsPanel:
             desc_label.pack(side="left", padx=10)
 
             temporal_labels[period["key"]] = label
+            self._label_prefix[label] = period["label"]
 
     def _calculate_temporal_metrics(
         self, files: List[FileInfo], date_type: str = "modification"
@@ -3720,9 +4763,24 @@ class AnalyticsPanel:
         try:
             if not self.db_manager:
                 logger.warning("Gestionnaire DB non disponible pour analyse temporelle")
-                return {"creation_dates": {}, "modification_dates": {}}
+                return _AnalysisFallback(creation_dates={}, modification_dates={})
+
+            # Référence temporelle unique partagée par les deux modes
+            now = datetime.now()
 
             with self.db_manager._connect().get() as conn:
+                # Colonnes *_ts renseignées par l'import CSV: lecture seule ici
+                if self._has_timestamp_columns(conn):
+                    now_ts = int(now.timestamp())
+                    return {
+                        "creation_dates": self._calculate_temporal_metrics_sql(
+                            conn, "creation_time_ts", now_ts
+                        ),
+                        "modification_dates": self._calculate_temporal_metrics_sql(
+                            conn, "last_modified_ts", now_ts
+                        ),
+                    }
+
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -3743,143 +4801,143 @@ class AnalyticsPanel:
                 AND file_size > 0
                 """
                 )
-                raw_data = cursor.fetchall()
-
-            logger.info(f"Récupération données temporelles: {len(raw_data)} fichiers")
+                # Agrégation en flux: aucune liste intermédiaire de lignes
+                return self._calculate_temporal_metrics_streaming(cursor, now)
 
-            if not raw_data:
-                logger.warning("Aucune donnée temporelle trouvée")
-                return {"creation_dates": {}, "modification_dates": {}}
-
-            valid_modifications = sum(1 for row in raw_data if row[3] == 1)
-            valid_creations = sum(1 for row in raw_data if row[4] == 1)
-            logger.info(
-                f"Données valides - Modifications: {valid_modifications}, Créations: {valid_creations}"
-            )
+        except Exception as e:
+            logger.error(f"Erreur calcul analyse temporelle: {e}")
+            return _AnalysisFallback(creation_dates={}, modification_dates={})
 
-            modification_data = self._calculate_temporal_metrics_safe(
-                raw_data, "modification"
-            )
-            creation_data = self._calculate_temporal_metrics_safe(raw_data, "creation")
+    def _has_timestamp_columns(self, conn) -> bool:
+        """Return True when fichiers exposes the integer timestamp columns."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(fichiers)")}
+        return {"last_modified_ts", "creation_time_ts"} <= columns
 
-            return {
-                "creation_dates": creation_data,
-                "modification_dates": modification_data,
-            }
+    def _calculate_temporal_metrics_sql(
+        self, conn, ts_column: str, now_ts: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Aggregate temporal buckets directly from an integer timestamp column."""
+        if now_ts is None:
+            now_ts = int(time.time())
+        rows = conn.execute(
+            f"""
+            SELECT CASE WHEN {ts_column} > :now THEN -1
+                        ELSE MIN(6, (:now - {ts_column}) / {_SECONDS_PER_YEAR})
+                   END AS years,
+                   COUNT(*), COALESCE(SUM(file_size), 0)
+            FROM fichiers
+            WHERE {ts_column} IS NOT NULL
+            AND (status IS NULL OR status != 'error')
+            AND file_size > 0
+            GROUP BY years
+            """,
+            {"now": now_ts},
+        ).fetchall()
+
+        counts = [0] * len(TEMPORAL_BUCKET_KEYS)
+        sizes = [0] * len(TEMPORAL_BUCKET_KEYS)
+        total_valid = 0
+        for years, count, total_size in rows:
+            total_valid += count
+            # Dates dans le futur: valides mais hors tranche
+            if years < 0:
+                continue
+            counts[years] = count
+            sizes[years] = total_size
 
-        except Exception as e:
-            logger.error(f"Erreur calcul analyse temporelle: {e}")
-            return {"creation_dates": {}, "modification_dates": {}}
+        logger.info(f"Fichiers avec {ts_column} valides: {total_valid}")
+        return self._format_temporal_metrics(counts, sizes, total_valid)
 
-    def _calculate_temporal_metrics_safe(
-        self, raw_data: List[tuple], mode: str
+    @staticmethod
+    def _format_temporal_metrics(
+        counts: List[int], sizes: List[int], total_valid: int
     ) -> Dict[str, Dict[str, Any]]:
-        """Calculate temporal metrics with standardized period logic."""
-        from datetime import datetime, timedelta
+        """Format per-period counters into the temporal metrics dict."""
+        inv100 = 100.0 / total_valid if total_valid else 0.0
+        return {
+            key: {
+                "count": counts[idx],
+                "percentage": round(counts[idx] * inv100, 1),
+                "size_gb": sizes[idx] * INV_GIB,
+            }
+            for idx, key in enumerate(TEMPORAL_BUCKET_KEYS)
+        }
 
-        try:
-            now = datetime.now()
-            total_files = len(raw_data)
-            temporal_metrics: Dict[str, Dict[str, Any]] = {}
+    def _calculate_temporal_metrics_streaming(
+        self, rows: Iterable[tuple], now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Aggregate modification and creation periods while iterating rows once.
 
-            date_index = 0 if mode == "modification" else 1
-            valid_index = 3 if mode == "modification" else 4
+        ``rows`` yields ``(last_modified, creation_time, file_size,
+        has_valid_modification, has_valid_creation)``; a cursor can be passed
+        directly. Rows are consumed in chunks whose date columns are parsed
+        with pandas and bucketed with numpy, so memory stays bounded by
+        ``TEMPORAL_CHUNK_SIZE``.
+        """
+        # Âges comparés en secondes à des seuils flottants: aucun timedelta par ligne
+        now_s = ((now or datetime.now()) - _EPOCH).total_seconds()
+        n_buckets = len(TEMPORAL_BUCKET_KEYS)
+
+        # Compteurs en tableaux contigus (SoA) plutôt que listes de tuples
+        counts = {
+            "modification": np.zeros(n_buckets, dtype=np.int64),
+            "creation": np.zeros(n_buckets, dtype=np.int64),
+        }
+        sizes = {
+            "modification": np.zeros(n_buckets, dtype=np.int64),
+            "creation": np.zeros(n_buckets, dtype=np.int64),
+        }
+        valid = {"modification": 0, "creation": 0}
+        total_files = 0
 
-            valid_files = []
-            for row in raw_data:
-                if row[valid_index] == 1:
-                    try:
-                        date_str = row[date_index]
-                        if date_str and date_str != "0":
-                            parsed_date = self._parse_date_flexible(date_str)
-                            if parsed_date:
-                                valid_files.append((parsed_date, row[2]))
-                    except Exception as e:
-                        logger.debug(f"Échec parsing date {date_str}: {e}")
-                        continue
+        iterator = iter(rows)
+        while True:
+            batch = list(islice(iterator, self.TEMPORAL_CHUNK_SIZE))
+            if not batch:
+                break
+            total_files += len(batch)
+            frame = pd.DataFrame(batch, columns=["lm", "ct", "sz", "vm", "vc"])
 
-            logger.info(
-                f"Fichiers avec dates {mode} valides: {len(valid_files)} sur {total_files}"
-            )
+            for mode, date_col, flag_col in (
+                ("modification", "lm", "vm"),
+                ("creation", "ct", "vc"),
+            ):
+                subset = frame[frame[flag_col] == 1]
+                if subset.empty:
+                    continue
+                ages = now_s - _parse_dates_to_epoch(subset[date_col]).to_numpy()
+                file_sizes = subset["sz"].to_numpy(dtype=np.int64)
 
-            if not valid_files:
-                for key in ["0_1y", "1_2y", "2_3y", "3_4y", "4_5y", "5_6y", "6plus"]:
-                    temporal_metrics[key] = {
-                        "count": 0,
-                        "percentage": 0.0,
-                        "size_gb": 0.0,
-                    }
-                return temporal_metrics
-
-            temporal_ranges = [
-                {"key": "0_1y", "min_days": 0, "max_days": 365},
-                {"key": "1_2y", "min_days": 365, "max_days": 730},
-                {"key": "2_3y", "min_days": 730, "max_days": 1095},
-                {"key": "3_4y", "min_days": 1095, "max_days": 1460},
-                {"key": "4_5y", "min_days": 1460, "max_days": 1825},
-                {"key": "5_6y", "min_days": 1825, "max_days": 2190},
-                {"key": "6plus", "min_days": 2190, "max_days": None},
-            ]
+                parsed = ~np.isnan(ages)
+                valid[mode] += int(parsed.sum())
 
-            for range_def in temporal_ranges:
-                if range_def["max_days"] is None:
-                    cutoff = now - timedelta(days=range_def["min_days"])
-                    matching_files = [(d, s) for d, s in valid_files if d <= cutoff]
-                else:
-                    upper_cutoff = now - timedelta(days=range_def["min_days"])
-                    lower_cutoff = now - timedelta(days=range_def["max_days"])
-                    matching_files = [
-                        (d, s)
-                        for d, s in valid_files
-                        if lower_cutoff < d <= upper_cutoff
-                    ]
-
-                total_size = sum(size for _, size in matching_files)
-                temporal_metrics[range_def["key"]] = {
-                    "count": len(matching_files),
-                    "percentage": (
-                        round(len(matching_files) / len(valid_files) * 100, 1)
-                        if valid_files
-                        else 0
-                    ),
-                    "size_gb": total_size / (1024**3),
-                }
+                # Dates futures: âge négatif -> valides mais hors tranche
+                in_range = parsed & (ages >= 0)
+                bucket_idx = np.minimum(
+                    (ages[in_range] // _SECONDS_PER_YEAR).astype(np.int64),
+                    n_buckets - 1,
+                )
+                counts[mode] += np.bincount(bucket_idx, minlength=n_buckets)
+                np.add.at(sizes[mode], bucket_idx, file_sizes[in_range])
 
-            return temporal_metrics
+        logger.info(f"Récupération données temporelles: {total_files} fichiers")
+        logger.info(
+            f"Données valides - Modifications: {valid['modification']}, "
+            f"Créations: {valid['creation']}"
+        )
 
-        except Exception as e:
-            logger.error(f"Erreur calcul métriques temporelles {mode}: {e}")
-            return {}
+        return {
+            f"{mode}_dates": self._format_temporal_metrics(
+                counts[mode].tolist(), sizes[mode].tolist(), valid[mode]
+            )
+            for mode in ("modification", "creation")
+        }
 
     def _parse_date_flexible(self, date_str: str) -> Optional[datetime]:
         """Parse date avec multiple formats supportés."""
-        if not date_str or date_str in ["0", "", "NULL", "None"]:
-            return None
-
-        formats = [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d %H:%M:%S.%f",
-            "%Y-%m-%d",
-            "%d/%m/%Y %H:%M:%S",
-            "%d/%m/%Y",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%SZ",
-        ]
-
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-
-        try:
-            timestamp = float(date_str)
-            return datetime.fromtimestamp(timestamp)
-        except (ValueError, OSError):
-            pass
-
-        logger.debug(f"Format de date non reconnu: {date_str}")
-        return None
+        if not isinstance(date_str, str):
+            date_str = str(date_str) if date_str is not None else ""
+        return _parse_date_cached(date_str)
 
     def _build_file_size_analysis_tab(self, parent_frame: ttk.Frame) -> None:
         container = ttk.LabelFrame(
@@ -3919,132 +4977,128 @@ class AnalyticsPanel:
 
             self.file_size_labels[range_label] = label
 
+    @staticmethod
+    def _build_size_distribution(
+        counts: List[int], sizes: List[int], total_files: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """Format per-bucket counters into the size distribution dict."""
+        size_metrics: Dict[str, Dict[str, Any]] = {}
+        for idx, range_label in enumerate(SIZE_BUCKET_LABELS):
+            size_metrics[range_label] = {
+                "count": counts[idx],
+                "percentage": (
+                    round(counts[idx] / total_files * 100, 1) if total_files else 0
+                ),
+                "size_gb": sizes[idx] * INV_GIB,
+            }
+        return size_metrics
+
     def _calculate_file_size_metrics(
         self, files: List[FileInfo]
     ) -> Dict[str, Dict[str, Any]]:
-        total_files = len(files)
-        size_metrics: Dict[str, Dict[str, Any]] = {}
+        """Single pass bucketing of already loaded files."""
+        counts = [0] * len(SIZE_BUCKET_LABELS)
+        sizes = [0] * len(SIZE_BUCKET_LABELS)
+        bounds = SIZE_BUCKET_BOUNDS
+        bisect_right = bisect.bisect_right
 
-        size_ranges = [
-            ("<50MB", 0, 50),
-            ("50-100MB", 50, 100),
-            ("100-150MB", 100, 150),
-            ("150-200MB", 150, 200),
-            ("200-300MB", 200, 300),
-            ("300-500MB", 300, 500),
-            (">500MB", 500, float("inf")),
-        ]
+        for f in files:
+            size = f.file_size
+            idx = bisect_right(bounds, size)
+            counts[idx] += 1
+            sizes[idx] += size
 
-        for range_label, min_mb, max_mb in size_ranges:
-            min_bytes = min_mb * 1024 * 1024
-            max_bytes = max_mb * 1024 * 1024 if max_mb != float("inf") else float("inf")
+        return self._build_size_distribution(counts, sizes, len(files))
 
-            if max_mb == float("inf"):
-                matching_files = [f for f in files if f.file_size >= min_bytes]
-            else:
-                matching_files = [
-                    f for f in files if min_bytes <= f.file_size < max_bytes
-                ]
+    def _calculate_size_analysis_sql(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Aggregate the size distribution in a single grouped SQL query."""
+        if not self.db_manager:
+            return None
 
-            total_size = sum(f.file_size for f in matching_files)
-            size_metrics[range_label] = {
-                "count": len(matching_files),
-                "percentage": (
-                    round(len(matching_files) / total_files * 100, 1)
-                    if total_files
-                    else 0
-                ),
-                "size_gb": total_size / (1024**3),
-            }
+        case_parts = [
+            f"WHEN COALESCE(file_size, 0) < {bound} THEN {idx}"
+            for idx, bound in enumerate(SIZE_BUCKET_BOUNDS)
+        ]
+        query = f"""
+        SELECT CASE {' '.join(case_parts)} ELSE {len(SIZE_BUCKET_BOUNDS)} END AS bucket,
+               COUNT(*), COALESCE(SUM(file_size), 0)
+        FROM fichiers
+        WHERE status IS NULL OR status != 'error'
+        GROUP BY bucket
+        """
 
-        return size_metrics
+        counts = [0] * len(SIZE_BUCKET_LABELS)
+        sizes = [0] * len(SIZE_BUCKET_LABELS)
+        with self.db_manager._connect().get() as conn:
+            for bucket, count, total_size in conn.execute(query):
+                counts[bucket] = count
+                sizes[bucket] = total_size
+
+        total_files = sum(counts)
+        if not total_files:
+            return {}
+        return self._build_size_distribution(counts, sizes, total_files)
 
     def _calculate_size_analysis(self) -> Dict[str, Any]:
         """Calculate file size distribution analysis."""
         try:
-            files = self._connect_files()
-            if not files:
-                return {"size_distribution": {}}
-
-            total_files = len(files)
-            size_distribution: Dict[str, Dict[str, Any]] = {}
-
-            size_ranges = [
-                ("<50MB", 0, 50 * 1024 * 1024),
-                ("50-100MB", 50 * 1024 * 1024, 100 * 1024 * 1024),
-                ("100-150MB", 100 * 1024 * 1024, 150 * 1024 * 1024),
-                ("150-200MB", 150 * 1024 * 1024, 200 * 1024 * 1024),
-                ("200-300MB", 200 * 1024 * 1024, 300 * 1024 * 1024),
-                ("300-500MB", 300 * 1024 * 1024, 500 * 1024 * 1024),
-                (">500MB", 500 * 1024 * 1024, float("inf")),
-            ]
+            try:
+                size_distribution = self._calculate_size_analysis_sql()
+            except Exception as e:
+                logger.warning(f"SQL size aggregation failed, fallback Python: {e}")
+                size_distribution = None
 
-            for range_label, min_size, max_size in size_ranges:
-                if max_size == float("inf"):
-                    matching_files = [f for f in files if f.file_size >= min_size]
-                else:
-                    matching_files = [
-                        f for f in files if min_size <= f.file_size < max_size
-                    ]
-
-                total_size = sum(f.file_size for f in matching_files)
-                size_distribution[range_label] = {
-                    "count": len(matching_files),
-                    "percentage": (
-                        round(len(matching_files) / total_files * 100, 1)
-                        if total_files
-                        else 0
-                    ),
-                    "size_gb": total_size / (1024**3),
-                }
+            if size_distribution is None:
+                files = self._connect_files()
+                if not files:
+                    return {"size_distribution": {}}
+                size_distribution = self._calculate_file_size_metrics(files)
 
+            total_files = sum(b["count"] for b in size_distribution.values())
             logger.info(f"Size analysis calculated for {total_files} files")
             return {"size_distribution": size_distribution}
 
         except Exception as e:
             logger.error(f"Error calculating size analysis: {e}")
-            return {"size_distribution": {}}
+            return _AnalysisFallback(size_distribution={})
 
     def _calculate_global_metrics(self, files: List[FileInfo]) -> Dict[str, Any]:
         """Compute global metrics for total files and size."""
-        total_files = len(files)
-        total_size = sum(f.file_size for f in files)
-        return {"total_files": total_files, "total_size_gb": total_size / (1024**3)}
+        total_size = 0
+        for f in files:
+            total_size += f.file_size
+        return {"total_files": len(files), "total_size_gb": total_size * INV_GIB}
 
     def _calculate_classification_metrics(
         self, files: List[FileInfo], class_map: Dict[int, str], rgpd_map: Dict[int, str]
     ) -> Dict[str, Any]:
         """Compute classification based metrics."""
-        super_critical_files = [
-            f
-            for f in files
-            if (class_map.get(f.id) == "C3" and rgpd_map.get(f.id) == "critical")
-        ]
-        critical_files = [
-            f
-            for f in files
-            if (class_map.get(f.id) == "C3" or rgpd_map.get(f.id) == "critical")
-            and f not in super_critical_files
-        ]
+        sc_count = sc_size = cr_count = cr_size = 0
+        for f in files:
+            is_c3 = class_map.get(f.id) == "C3"
+            is_rgpd_critical = rgpd_map.get(f.id) == "critical"
+            if is_c3 and is_rgpd_critical:
+                sc_count += 1
+                sc_size += f.file_size
+            elif is_c3 or is_rgpd_critical:
+                cr_count += 1
+                cr_size += f.file_size
+
         total_files = len(files)
         return {
             "super_critical": {
-                "count": len(super_critical_files),
+                "count": sc_count,
                 "percentage": (
-                    round(len(super_critical_files) / total_files * 100, 1)
-                    if total_files
-                    else 0
+                    round(sc_count / total_files * 100, 1) if total_files else 0
                 ),
-                "size_gb": sum(f.file_size for f in super_critical_files) / (1024**3),
+                "size_gb": sc_size * INV_GIB,
             },
             "critical": {
-                "count": len(critical_files),
+                "count": cr_count,
                 "percentage": (
-                    round(len(critical_files) / total_files * 100, 1)
-                    if total_files
-                    else 0
+                    round(cr_count / total_files * 100, 1) if total_files else 0
                 ),
-                "size_gb": sum(f.file_size for f in critical_files) / (1024**3),
+                "size_gb": cr_size * INV_GIB,
             },
         }
 
@@ -4066,36 +5120,38 @@ class AnalyticsPanel:
             return {
                 "files_2x": self._count_files_duplicated_n_times(families, 2),
                 "total_groups": len(families),
-                "wasted_space_gb": dup_stats.get("space_wasted_bytes", 0) / (1024**3),
+                "wasted_space_gb": dup_stats.get("space_wasted_bytes", 0) * INV_GIB,
             }
         except Exception as e:
             logger.warning("Duplicate statistics failed: %s", e)
             return {"files_2x": 0, "total_groups": 0, "wasted_space_gb": 0}
 
     def _calculate_duplicates_analysis(self) -> Dict[str, Any]:
-        """Fix duplicate analysis - currently returning zeros."""
+        """Name/size based duplicate groups aggregated in SQL."""
         try:
             if not self._ensure_database_manager():
-                return {"duplicates_by_count": {}, "total_duplicates": 0}
+                return _AnalysisFallback(duplicates_by_count={}, total_duplicates=0)
 
+            query = """
+            SELECT f.name, f.file_size, COUNT(*) as duplicate_count,
+                   (COUNT(*) - 1) * COALESCE(f.file_size, 0) as wasted_bytes
+            FROM fichiers f
+            WHERE (f.status IS NULL OR f.status != 'error')
+            GROUP BY f.name, f.file_size
+            HAVING COUNT(*) > 1
+            ORDER BY duplicate_count DESC
+            """
+            # _connect() renvoie le pool; get() fournit la connexion (context manager)
             with self.db_manager._connect().get() as conn:
-                cursor = conn.cursor()
-                query = """
-                SELECT f.name, COUNT(*) as duplicate_count
-                FROM fichiers f
-                WHERE (f.status IS NULL OR f.status != 'error')
-                GROUP BY f.name
-                HAVING COUNT(*) > 1
-                ORDER BY duplicate_count DESC
-                """
-                cursor.execute(query)
-                duplicates = cursor.fetchall()
+                duplicates = conn.execute(query).fetchall()
 
             duplicates_by_count: Dict[int, List[str]] = {}
             total_duplicates = 0
-            for name, count in duplicates:
+            wasted_bytes = 0
+            for name, _size, count, waste in duplicates:
                 duplicates_by_count.setdefault(count, []).append(name)
                 total_duplicates += count - 1
+                wasted_bytes += waste
 
             logger.info(
                 f"Found {len(duplicates)} duplicate groups, {total_duplicates} excess files"
@@ -4105,11 +5161,12 @@ class AnalyticsPanel:
                 "duplicates_by_count": duplicates_by_count,
                 "total_duplicates": total_duplicates,
                 "duplicate_groups": len(duplicates),
+                "wasted_space_gb": wasted_bytes * INV_GIB,
             }
 
         except Exception as e:
             logger.error(f"Error calculating duplicates: {e}")
-            return {"duplicates_by_count": {}, "total_duplicates": 0}
+            return _AnalysisFallback(duplicates_by_count={}, total_duplicates=0)
 
     def _get_fallback_classification_metrics(self) -> Dict[str, Any]:
         """Fallback structure when classification metrics fail."""
@@ -4195,55 +5252,44 @@ class AnalyticsPanel:
             return self._get_empty_top_users_data()
 
         try:
-            large_files = [
-                f
-                for f in files
-                if f.file_size > 100 * 1024 * 1024 and f.owner and f.owner.strip()
-            ]
+            large_threshold = 100 * 1024 * 1024
             large_files_by_user: Dict[str, Dict[str, Any]] = {}
-            for f in large_files:
-                owner = f.owner or "Inconnu"
-                if owner not in large_files_by_user:
-                    large_files_by_user[owner] = {"count": 0, "total_size": 0}
-                large_files_by_user[owner]["count"] += 1
-                large_files_by_user[owner]["total_size"] += f.file_size
-            top_large_files = sorted(
-                large_files_by_user.items(),
-                key=lambda x: x[1]["total_size"],
-                reverse=True,
-            )[:TOP_USERS_COUNT]
-
-            c3_files = [
-                f
-                for f in files
-                if class_map.get(f.id) == "C3" and f.owner and f.owner.strip()
-            ]
             c3_by_user: Dict[str, Dict[str, Any]] = {}
-            for f in c3_files:
-                owner = f.owner or "Inconnu"
-                if owner not in c3_by_user:
-                    c3_by_user[owner] = {"count": 0, "total_size": 0}
-                c3_by_user[owner]["count"] += 1
-                c3_by_user[owner]["total_size"] += f.file_size
-            top_c3_files = sorted(
-                c3_by_user.items(), key=lambda x: x[1]["count"], reverse=True
-            )[:TOP_USERS_COUNT]
-
-            rgpd_critical_files = [
-                f
-                for f in files
-                if rgpd_map.get(f.id) == "critical" and f.owner and f.owner.strip()
-            ]
             rgpd_by_user: Dict[str, Dict[str, Any]] = {}
-            for f in rgpd_critical_files:
-                owner = f.owner or "Inconnu"
-                if owner not in rgpd_by_user:
-                    rgpd_by_user[owner] = {"count": 0, "total_size": 0}
-                rgpd_by_user[owner]["count"] += 1
-                rgpd_by_user[owner]["total_size"] += f.file_size
-            top_rgpd_critical = sorted(
-                rgpd_by_user.items(), key=lambda x: x[1]["count"], reverse=True
-            )[:TOP_USERS_COUNT]
+
+            for f in files:
+                owner = f.owner
+                if not owner or not owner.strip():
+                    continue
+                size = f.file_size
+                if size > large_threshold:
+                    entry = large_files_by_user.setdefault(
+                        owner, {"count": 0, "total_size": 0}
+                    )
+                    entry["count"] += 1
+                    entry["total_size"] += size
+                if class_map.get(f.id) == "C3":
+                    entry = c3_by_user.setdefault(owner, {"count": 0, "total_size": 0})
+                    entry["count"] += 1
+                    entry["total_size"] += size
+                if rgpd_map.get(f.id) == "critical":
+                    entry = rgpd_by_user.setdefault(
+                        owner, {"count": 0, "total_size": 0}
+                    )
+                    entry["count"] += 1
+                    entry["total_size"] += size
+
+            top_large_files = nlargest(
+                TOP_USERS_COUNT,
+                large_files_by_user.items(),
+                key=lambda x: x[1]["total_size"],
+            )
+            top_c3_files = nlargest(
+                TOP_USERS_COUNT, c3_by_user.items(), key=lambda x: x[1]["count"]
+            )
+            top_rgpd_critical = nlargest(
+                TOP_USERS_COUNT, rgpd_by_user.items(), key=lambda x: x[1]["count"]
+            )
 
             result = {
                 "top_large_files": [
@@ -4436,8 +5482,7 @@ class AnalyticsPanel:
                     "Info", "Aucun fichier de préférences trouvé", parent=self.parent
                 )
                 return
-            with open("user_prefs.json", "r", encoding="utf-8") as f:
-                prefs = json.load(f)
+            prefs = self._read_user_preferences(Path("user_prefs.json"))
             self.threshold_age_years.set(prefs.get("age_years", "2"))
             self.threshold_size_mb.set(prefs.get("size_mb", "100"))
             self.classification_filter.set(prefs.get("classification_filter", "Tous"))
@@ -4453,6 +5498,16 @@ class AnalyticsPanel:
                 "Erreur Restauration", f"Échec: {str(exc)}", parent=self.parent
             )
 
+    def _read_user_preferences(self, prefs_path: Path) -> Dict[str, Any]:
+        """Return parsed preferences, reusing the cached dict while mtime is unchanged."""
+        mtime = prefs_path.stat().st_mtime
+        if self._prefs_cache and self._prefs_cache[0] == mtime:
+            return self._prefs_cache[1]
+        with open(prefs_path, "r", encoding="utf-8") as f:
+            prefs = json.load(f)
+        self._prefs_cache = (mtime, prefs)
+        return prefs
+
     def show_affected_files(self) -> None:
         try:
             metrics = self.calculate_business_metrics()
@@ -4464,175 +5519,279 @@ class AnalyticsPanel:
             results_window.focus_set()
             notebook = ttk.Notebook(results_window)
             notebook.pack(fill="both", expand=True, padx=10, pady=10)
+            # Onglets remplis à la première activation seulement
+            notebook.files_ctx = self._get_files_context()
+            notebook.pending_tabs = {}
+            notebook.bind("<<NotebookTabChanged>>", self._on_tab_shown)
             if metrics.get("super_critical", {}).get("count", 0) > 0:
                 super_frame = ttk.Frame(notebook)
                 notebook.add(
                     super_frame,
                     text=f"🔴 Super Critiques ({metrics['super_critical']['count']})",
                 )
-                self._populate_files_list(super_frame, "super_critical")
+                notebook.pending_tabs[str(super_frame)] = (super_frame, "super_critical")
             if metrics.get("critical", {}).get("count", 0) > 0:
                 crit_frame = ttk.Frame(notebook)
                 notebook.add(
                     crit_frame, text=f"🟠 Critiques ({metrics['critical']['count']})"
                 )
-                self._populate_files_list(crit_frame, "critical")
+                notebook.pending_tabs[str(crit_frame)] = (crit_frame, "critical")
             if metrics.get("duplicates", {}).get("total_groups", 0) > 0:
                 dup_frame = ttk.Frame(notebook)
                 notebook.add(
                     dup_frame,
                     text=f"🟡 Doublons ({metrics['duplicates']['total_groups']} groupes)",
                 )
-                self._populate_files_list(dup_frame, "duplicates")
+                notebook.pending_tabs[str(dup_frame)] = (dup_frame, "duplicates")
+            self._populate_selected_tab(notebook)
             ttk.Button(
                 results_window, text="Fermer", command=results_window.destroy
             ).pack(pady=5)
         except Exception as exc:
             self._handle_analytics_error("affichage des fichiers", exc)
 
-    def _populate_files_list(self, frame: ttk.Frame, category: str) -> None:
+    def _on_tab_shown(self, event: tk.Event) -> None:
+        """Populate a results tab the first time it becomes visible."""
+        self._populate_selected_tab(event.widget)
+
+    def _populate_selected_tab(self, notebook: ttk.Notebook) -> None:
+        pending = getattr(notebook, "pending_tabs", {})
+        entry = pending.pop(notebook.select(), None)
+        if entry:
+            frame, category = entry
+            self._populate_files_list(frame, category, notebook.files_ctx)
+
+    def _get_files_context(self) -> Dict[str, Any]:
+        """Return files and classification maps for the current data version."""
+        cached = self._files_context_cache
+        if cached and cached[0] == self._data_version:
+            return cached[1]
+
         files = self._connect_files()
-        class_map = self._get_classification_map()
-        rgpd_map = self._get_rgpd_map()
-        legal_map = self._get_legal_map()
-        dup_families = self.duplicate_detector.detect_duplicate_family(files)
-        items: List[FileInfo] = []
-        if category == "super_critical":
-            for f in files:
-                if (
-                    class_map.get(f.id) == "C3"
-                    and rgpd_map.get(f.id) == "critical"
-                    and legal_map.get(f.id) in ["nda", "litigation"]
-                ):
-                    items.append(f)
-        elif category == "critical":
-            for f in files:
-                if (
-                    class_map.get(f.id) == "C3"
-                    or rgpd_map.get(f.id) == "critical"
-                    or legal_map.get(f.id) in ["nda", "litigation"]
-                ) and not (
-                    class_map.get(f.id) == "C3"
-                    and rgpd_map.get(f.id) == "critical"
-                    and legal_map.get(f.id) in ["nda", "litigation"]
-                ):
-                    items.append(f)
-        elif category == "duplicates":
-            for fam in dup_families.values():
-                items.extend(fam)
-        listbox = tk.Listbox(frame)
+        class_map, rgpd_map, legal_map = self._get_all_maps()
+        files_ctx = {
+            "files": files,
+            "class_map": class_map,
+            "rgpd_map": rgpd_map,
+            "legal_map": legal_map,
+        }
+        self._files_context_cache = (self._data_version, files_ctx)
+        return files_ctx
+
+    def _get_file_buckets(self, files_ctx: Dict[str, Any]) -> Dict[str, List[FileInfo]]:
+        """Assign each file to at most one alert bucket in a single pass."""
+        cached = self._file_buckets
+        if cached and cached[0] == self._data_version:
+            return cached[1]
+
+        # Méthodes pré-liées: évite les résolutions d'attributs dans la boucle
+        cm_get = files_ctx["class_map"].get
+        rm_get = files_ctx["rgpd_map"].get
+        lm_get = files_ctx["legal_map"].get
+        get_id = attrgetter("id")
+        super_critical: List[FileInfo] = []
+        critical: List[FileInfo] = []
+        add_super = super_critical.append
+        add_critical = critical.append
+        for f in files_ctx["files"]:
+            file_id = get_id(f)
+            cls, rgpd, legal = cm_get(file_id), rm_get(file_id), lm_get(file_id)
+            # Cas courant (non critique): un seul appel de prédicat
+            if is_any_critical(cls, rgpd, legal):
+                if is_super_critical(cls, rgpd, legal):
+                    add_super(f)
+                else:
+                    add_critical(f)
+
+        buckets = {
+            "super_critical": super_critical,
+            "critical": critical,
+        }
+        self._file_buckets = (self._data_version, buckets)
+        return buckets
+
+    def _find_duplicate_files(self, files: List[FileInfo]) -> List[FileInfo]:
+        """Flatten duplicate families (pure: safe on a worker thread)."""
+        families = self.duplicate_detector.detect_duplicate_family(files)
+        return [f for fam in families.values() for f in fam]
+
+    def _get_duplicate_files(self, files_ctx: Dict[str, Any]) -> List[FileInfo]:
+        """Flatten duplicate families, computed once per files context."""
+        duplicates = files_ctx.get("duplicates")
+        if duplicates is None:
+            duplicates = self._find_duplicate_files(files_ctx["files"])
+            files_ctx["duplicates"] = duplicates
+        return duplicates
+
+    def _populate_files_list(
+        self,
+        frame: ttk.Frame,
+        category: str,
+        files_ctx: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        files_ctx = files_ctx or self._get_files_context()
+        # Un seul appel Tcl pour tous les chemins via listvariable
+        paths_var = tk.StringVar(frame)
+        listbox = tk.Listbox(frame, listvariable=paths_var)
+        listbox.paths_var = paths_var
         listbox.pack(fill="both", expand=True, padx=5, pady=5)
-        for f in items:
-            listbox.insert(tk.END, f.path)
 
-    def update_thematic_tabs(self) -> None:
-        security_dist = self._query_distribution("security_classification_cached")
-        total = sum(v["count"] for v in security_dist.values())
-        for level in ["C0", "C1", "C2", "C3"]:
-            info = security_dist.get(level, {"count": 0, "size": 0})
-            pct = round(info["count"] / total * 100, 1) if total else 0
-            size_gb = info["size"] / (1024**3)
-            self.security_labels[level].config(
-                text=f"{level}: {pct}% | {info['count']} fichiers | {size_gb:.1f}GB"
-            )
-        others_count = total - sum(
-            security_dist.get(l, {"count": 0})["count"]
-            for l in ["C0", "C1", "C2", "C3"]
-        )
-        others_size = sum(
-            security_dist.get(k, {"size": 0})["size"]
-            for k in security_dist.keys()
-            if k not in {"C0", "C1", "C2", "C3"}
-        )
-        pct_others = round(others_count / total * 100, 1) if total else 0
-        self.security_labels["Autres"].config(
-            text=f"Autres: {pct_others}% | {others_count} fichiers | {others_size/(1024**3):.1f}GB"
-        )
-        rgpd_dist = self._query_distribution("rgpd_risk_cached")
-        total_r = sum(v["count"] for v in rgpd_dist.values())
-        levels_rgpd = ["none", "low", "medium", "high", "critical"]
-        for lvl in levels_rgpd:
-            info = rgpd_dist.get(lvl, {"count": 0, "size": 0})
-            pct = round(info["count"] / total_r * 100, 1) if total_r else 0
-            self.rgpd_labels[lvl].config(
-                text=f"{lvl}: {pct}% | {info['count']} fichiers | {info['size']/(1024**3):.1f}GB"
+        if category == "duplicates" and "duplicates" not in files_ctx:
+            # Détection des doublons en arrière-plan, résultat relevé par after()
+            paths_var.set(("Chargement…",))
+            result_queue: queue.Queue = queue.Queue(maxsize=1)
+            self._executor.submit(
+                self._duplicate_files_worker, files_ctx["files"], result_queue
             )
-        others_rgpd = total_r - sum(
-            rgpd_dist.get(l, {"count": 0})["count"] for l in levels_rgpd
-        )
-        size_rgpd = sum(
-            rgpd_dist.get(k, {"size": 0})["size"]
-            for k in rgpd_dist.keys()
-            if k not in levels_rgpd
-        )
-        pct_rgpd_oth = round(others_rgpd / total_r * 100, 1) if total_r else 0
-        self.rgpd_labels["Autres"].config(
-            text=f"Autres: {pct_rgpd_oth}% | {others_rgpd} fichiers | {size_rgpd/(1024**3):.1f}GB"
-        )
-        fin_dist = self._query_distribution("finance_type_cached")
-        total_f = sum(v["count"] for v in fin_dist.values())
-        fin_types = ["none", "invoice", "contract", "budget", "accounting", "payment"]
-        for typ in fin_types:
-            info = fin_dist.get(typ, {"count": 0, "size": 0})
-            pct = round(info["count"] / total_f * 100, 1) if total_f else 0
-            self.finance_labels[typ].config(
-                text=f"{typ}: {pct}% | {info['count']} fichiers | {info['size']/(1024**3):.1f}GB"
+            self.parent.after(
+                100, self._poll_dup_listbox, listbox, files_ctx, result_queue
             )
-        others_f = total_f - sum(
-            fin_dist.get(t, {"count": 0})["count"] for t in fin_types
-        )
-        size_f = sum(
-            fin_dist.get(k, {"size": 0})["size"]
-            for k in fin_dist.keys()
-            if k not in fin_types
+            return
+
+        if category == "duplicates":
+            items = files_ctx["duplicates"]
+        else:
+            items = self._get_file_buckets(files_ctx).get(category, [])
+        paths_var.set(tuple(f.path for f in items))
+
+    def _duplicate_files_worker(
+        self, files: List[FileInfo], result_queue: queue.Queue
+    ) -> None:
+        """Worker thread: no Tk access, the result goes through the queue."""
+        try:
+            result_queue.put(self._find_duplicate_files(files))
+        except Exception as exc:  # pragma: no cover - runtime
+            result_queue.put(exc)
+
+    def _poll_dup_listbox(
+        self,
+        listbox: tk.Listbox,
+        files_ctx: Dict[str, Any],
+        result_queue: queue.Queue,
+    ) -> None:
+        """Remplit la liste des doublons une fois la détection terminée (thread Tk)."""
+        try:
+            items = result_queue.get_nowait()
+        except queue.Empty:
+            try:
+                self.parent.after(
+                    100, self._poll_dup_listbox, listbox, files_ctx, result_queue
+                )
+            except tk.TclError:
+                pass  # panneau détruit entre deux relevés
+            return
+        if isinstance(items, Exception):
+            logger.warning("Détection des doublons échouée: %s", items)
+            items = []
+        else:
+            files_ctx["duplicates"] = items
+        try:
+            listbox.paths_var.set(tuple(f.path for f in items))
+        except tk.TclError:
+            # Fenêtre fermée avant la fin du calcul
+            pass
+
+    def update_thematic_tabs(self) -> None:
+        pending: Dict[Any, str] = {}
+        distributions = self._query_distributions_bulk(
+            [
+                "security_classification_cached",
+                "rgpd_risk_cached",
+                "finance_type_cached",
+                "legal_type_cached",
+            ]
         )
-        pct_f_oth = round(others_f / total_f * 100, 1) if total_f else 0
-        self.finance_labels["Autres"].config(
-            text=f"Autres: {pct_f_oth}% | {others_f} fichiers | {size_f/(1024**3):.1f}GB"
+        self._update_dist_labels(
+            self.security_labels,
+            distributions["security_classification_cached"],
+            SEC_LEVELS,
+            pending=pending,
         )
-        legal_dist = self._query_distribution("legal_type_cached")
-        total_l = sum(v["count"] for v in legal_dist.values())
-        legal_types = [
-            "none",
-            "employment",
-            "lease",
-            "sale",
-            "nda",
-            "compliance",
-            "litigation",
-        ]
-        for typ in legal_types:
-            info = legal_dist.get(typ, {"count": 0, "size": 0})
-            pct = round(info["count"] / total_l * 100, 1) if total_l else 0
-            self.legal_labels[typ].config(
-                text=f"{typ}: {pct}% | {info['count']} fichiers | {info['size']/(1024**3):.1f}GB"
-            )
-        others_l = total_l - sum(
-            legal_dist.get(t, {"count": 0})["count"] for t in legal_types
+        self._update_dist_labels(
+            self.rgpd_labels,
+            distributions["rgpd_risk_cached"],
+            RGPD_LEVELS,
+            pending=pending,
         )
-        size_l = sum(
-            legal_dist.get(k, {"size": 0})["size"]
-            for k in legal_dist.keys()
-            if k not in legal_types
+        self._update_dist_labels(
+            self.finance_labels,
+            distributions["finance_type_cached"],
+            FIN_TYPES,
+            pending=pending,
         )
-        pct_l_oth = round(others_l / total_l * 100, 1) if total_l else 0
-        self.legal_labels["Autres"].config(
-            text=f"Autres: {pct_l_oth}% | {others_l} fichiers | {size_l/(1024**3):.1f}GB"
+        self._update_dist_labels(
+            self.legal_labels,
+            distributions["legal_type_cached"],
+            LEGAL_TYPES,
+            pending=pending,
         )
         metrics = self.calculate_business_metrics()
-        c3_total = metrics.get("critical", {}).get("count", 0) + metrics.get(
-            "super_critical", {}
-        ).get("count", 0)
-        self.security_focus_labels["C3 Total"].config(text=f"C3 Total: {c3_total}")
-        self.security_focus_labels["C3 + RGPD"].config(
-            text=f"C3 + RGPD: {metrics.get('super_critical', {}).get('count', 0)}"
-        )
-        self.security_focus_labels["C3 + Legal"].config(
-            text=f"C3 + Legal: {metrics.get('critical', {}).get('count', 0)}"
-        )
-        self.security_focus_labels["Recommandations"].config(
-            text=self.generate_recommendations(metrics)
+        critical_count = metrics.get("critical", _EMPTY).get("count", 0)
+        super_critical_count = metrics.get("super_critical", _EMPTY).get("count", 0)
+        c3_total = critical_count + super_critical_count
+        focus = self.security_focus_labels
+        pending[focus["C3 Total"]] = f"C3 Total: {c3_total}"
+        pending[focus["C3 + RGPD"]] = f"C3 + RGPD: {super_critical_count}"
+        pending[focus["C3 + Legal"]] = f"C3 + Legal: {critical_count}"
+        pending[focus["Recommandations"]] = self.generate_recommendations(metrics)
+        self._flush_label_texts(pending)
+
+    def _flush_label_texts(self, pending: Dict[Any, str]) -> None:
+        """Applique les textes de labels en attente puis un seul update_idletasks."""
+        for label, text in pending.items():
+            try:
+                self._set_label_text(label, text)
+            except Exception as e:
+                logger.warning("Erreur mise à jour label: %s", e)
+        parent = getattr(self, "parent", None)
+        if pending and parent is not None:
+            parent.update_idletasks()
+
+    def _set_label_text(self, label: Any, text: str) -> None:
+        """Écrit le texte du label seulement s'il a changé depuis le dernier rafraîchissement."""
+        if self._last_label_text.get(label) != text:
+            label.configure(text=text)
+            self._last_label_text[label] = text
+
+    def _update_dist_labels(
+        self,
+        labels: Dict[str, ttk.Label],
+        dist: Dict[str, Dict[str, Any]],
+        known_levels: frozenset,
+        other_key: str = "Autres",
+        pending: Optional[Dict[Any, str]] = None,
+    ) -> None:
+        """Update one distribution tab, splitting known levels and others in one pass.
+
+        Les textes sont ajoutés à ``pending`` s'il est fourni, sinon appliqués
+        immédiatement.
+        """
+        flush = pending is None
+        if flush:
+            pending = {}
+        total = 0
+        known: Dict[str, Dict[str, Any]] = {}
+        other_count = other_size = 0
+        for name, info in dist.items():
+            total += info["count"]
+            if name in known_levels:
+                known[name] = info
+            else:
+                other_count += info["count"]
+                other_size += info["size"]
+
+        for level in known_levels:
+            info = known.get(level, {"count": 0, "size": 0})
+            pct = round(info["count"] / total * 100, 1) if total else 0
+            pending[labels[level]] = (
+                f"{level}: {pct}% | {info['count']} fichiers | {_format_gb(info['size'])}"
+            )
+        pct_others = round(other_count / total * 100, 1) if total else 0
+        pending[labels[other_key]] = (
+            f"Autres: {pct_others}% | {other_count} fichiers | {_format_gb(other_size)}"
         )
+        if flush:
+            self._flush_label_texts(pending)
 
     def _safe_get_labels(self, labels_key: str) -> Dict[str, ttk.Label]:
         """Récupère de manière sécurisée un dictionnaire de labels d'interface."""
@@ -4648,8 +5807,15 @@ class AnalyticsPanel:
             logger.debug("Attribut %s non trouvé, retour dictionnaire vide", labels_key)
             return {}
 
-    def update_temporal_analysis_display(self, temporal_data: Dict[str, Any]) -> None:
+    def update_temporal_analysis_display(
+        self,
+        temporal_data: Dict[str, Any],
+        pending: Optional[Dict[Any, str]] = None,
+    ) -> None:
         """Update temporal analysis display with standardized keys."""
+        flush = pending is None
+        if flush:
+            pending = {}
         try:
             for mode in ["modification", "creation"]:
                 if mode in temporal_data:
@@ -4658,42 +5824,38 @@ class AnalyticsPanel:
                         labels = getattr(self, labels_attr)
                         mode_data = temporal_data[mode]
 
-                        key_mappings = {
-                            "0_1y": "0-1 an",
-                            "1_2y": "1-2 ans",
-                            "2_3y": "2-3 ans",
-                            "3_4y": "3-4 ans",
-                            "4_5y": "4-5 ans",
-                            "5_6y": "5-6 ans",
-                            "6plus": "+6 ans",
-                        }
-
-                        for key, label_text in key_mappings.items():
+                        for key, default_text in TEMPORAL_BUCKET_DISPLAY.items():
                             if key in labels and key in mode_data:
+                                label_text = self._label_prefix.get(
+                                    labels[key], default_text
+                                )
                                 metrics = mode_data[key]
                                 count = metrics.get("count", 0)
                                 percentage = metrics.get("percentage", 0.0)
                                 size_gb = metrics.get("size_gb", 0.0)
 
                                 display_text = f"{label_text}: {percentage}% | {count} fichiers | {size_gb:.1f}GB"
-                                labels[key].config(text=display_text)
+                                pending[labels[key]] = display_text
 
                                 logger.debug(f"Updated {mode} {key}: {count} files")
         except Exception as e:
             logger.error(f"Failed to update temporal display: {e}")
+        if flush:
+            self._flush_label_texts(pending)
 
     def update_extended_tabs(self, metrics: Dict[str, Any]) -> None:
         """Met à jour les onglets étendus avec vérifications robustes."""
+        pending: Dict[Any, str] = {}
         try:
-            dup_details = metrics.get("duplicates", {}).get("detailed", {})
+            dup_details = metrics.get("duplicates", _EMPTY).get("detailed", _EMPTY)
             duplicates_labels = self._safe_get_labels("duplicates_detailed_labels")
             for level, label in duplicates_labels.items():
                 try:
                     info = dup_details.get(
                         level, {"percentage": 0, "count": 0, "size_gb": 0}
                     )
-                    label.config(
-                        text=f"{level}: {info['percentage']}% | {info['count']} fichiers | {info['size_gb']:.1f}GB"
+                    pending[label] = (
+                        f"{level}: {info['percentage']}% | {info['count']} fichiers | {info['size_gb']:.1f}GB"
                     )
                 except Exception as e:
                     logger.warning("Erreur mise à jour niveau %s: %s", level, e)
@@ -4702,7 +5864,8 @@ class AnalyticsPanel:
                 {
                     "modification": metrics.get("temporal_modification", {}),
                     "creation": metrics.get("temporal_creation", {}),
-                }
+                },
+                pending=pending,
             )
 
             size_data = metrics.get("file_size_analysis", {})
@@ -4712,8 +5875,8 @@ class AnalyticsPanel:
                     data = size_data.get(
                         range_label, {"percentage": 0, "count": 0, "size_gb": 0}
                     )
-                    label.config(
-                        text=f"{range_label}: {data['percentage']}% | {data['count']} fichiers | {data['size_gb']:.1f}GB"
+                    pending[label] = (
+                        f"{range_label}: {data['percentage']}% | {data['count']} fichiers | {data['size_gb']:.1f}GB"
                     )
                 except Exception as e:
                     logger.warning("Erreur mise à jour taille %s: %s", range_label, e)
@@ -4722,23 +5885,32 @@ class AnalyticsPanel:
             for key in ["top_large_files", "top_c3_files", "top_rgpd_critical"]:
                 labels = self._safe_get_labels(f"{key}_labels")
                 entries = top_users.get(key, [])
+                # Classement inchangé pour ces labels: rien à reformater
+                sig = tuple(
+                    (e.get("owner"), e.get("count"), e.get("total_size"))
+                    for e in entries[:10]
+                )
+                previous = self._top_users_sig.get(key)
+                if previous is not None and previous[0] is labels and previous[1] == sig:
+                    continue
+                self._top_users_sig[key] = (labels, sig)
                 for rank in range(1, 11):
                     rank_key = f"rank_{rank}"
                     if rank_key in labels:
                         try:
                             if rank <= len(entries):
                                 item = entries[rank - 1]
-                                size_gb = item.get("total_size", 0) / (1024**3)
+                                size_gb = item.get("total_size", 0) * INV_GIB
                                 owner = item.get("owner", "N/A")
                                 display_owner = (
                                     owner[:20] + "..." if len(owner) > 20 else owner
                                 )
-                                labels[rank_key].config(
-                                    text=f"#{rank}: {display_owner} ({item.get('count', 0)} fichiers, {size_gb:.1f}GB)"
+                                pending[labels[rank_key]] = (
+                                    f"#{rank}: {display_owner} ({item.get('count', 0)} fichiers, {size_gb:.1f}GB)"
                                 )
                             else:
-                                labels[rank_key].config(
-                                    text=f"#{rank}: -- (0 fichiers, 0GB)"
+                                pending[labels[rank_key]] = (
+                                    f"#{rank}: -- (0 fichiers, 0GB)"
                                 )
                         except Exception as e:
                             logger.warning(
@@ -4747,6 +5919,7 @@ class AnalyticsPanel:
                                 rank,
                                 e,
                             )
+            self._flush_label_texts(pending)
         except Exception as e:
             self._handle_analytics_error("mise à jour onglets étendus", e)
 
@@ -4771,8 +5944,8 @@ class AnalyticsPanel:
                     "metrics": metrics,
                     "recommendations": self.generate_recommendations(metrics),
                 }
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(report, f, indent=2, ensure_ascii=False)
+                size_hint = metrics.get("global", _EMPTY).get("total_files", 0)
+                self._write_json_report(filename, report, size_hint)
                 export_window = tk.Toplevel(self.parent)
                 export_window.title("Export Réussi")
                 export_window.geometry("300x120")
@@ -4789,23 +5962,59 @@ class AnalyticsPanel:
         except Exception as e:
             self._handle_analytics_error("export du rapport", e)
 
+    @classmethod
+    def _write_json_report(
+        cls, filename: str, report: Dict[str, Any], size_hint: int
+    ) -> None:
+        """Écrit le rapport JSON, indenté sauf pour les gros volumes."""
+        pretty = size_hint < cls.COMPACT_EXPORT_THRESHOLD
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(report, option=option, default=str))
+            return
+        with open(filename, "w", encoding="utf-8") as f:
+            if pretty:
+                json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+            else:
+                json.dump(
+                    report, f, separators=(",", ":"), ensure_ascii=False, default=str
+                )
+
     def generate_recommendations(self, metrics: Dict[str, Any]) -> str:
         """Génère des recommandations business basées sur les métriques."""
-        recommendations: List[str] = []
+        # Les métriques mémorisées sont réutilisées telles quelles
+        cached = self._recommendations_cache
+        if cached is not None and cached[0] is metrics:
+            return cached[1]
+        text = self._build_recommendations(metrics)
+        self._recommendations_cache = (metrics, text)
+        return text
+
+    def _build_recommendations(self, metrics: Dict[str, Any]) -> str:
+        get = metrics.get
+        global_info = get("global", _EMPTY)
+        # Base vide: rien à recommander, inutile d'examiner les autres métriques
+        total_files = global_info.get("total_files", 0)
+        if not total_files:
+            return NO_RECOMMENDATION_TEXT
 
-        super_critical_count = metrics.get("super_critical", {}).get("count", 0)
+        recommendations: List[str] = []
+        super_critical_count = get("super_critical", _EMPTY).get("count", 0)
         if super_critical_count > 0:
             recommendations.append(
                 f"🔴 URGENT: {super_critical_count} fichiers super critiques nécessitent une action immédiate"
             )
 
-        critical_count = metrics.get("critical", {}).get("count", 0)
+        critical_count = get("critical", _EMPTY).get("count", 0)
         if critical_count > 10:
             recommendations.append(
                 f"🟠 PRIORITÉ: {critical_count} fichiers critiques à traiter rapidement"
             )
 
-        duplicates_info = metrics.get("duplicates", {})
+        duplicates_info = get("duplicates", _EMPTY)
         wasted_gb = duplicates_info.get("wasted_space_gb", 0)
         if wasted_gb > 1.0:
             total_groups = duplicates_info.get("total_groups", 0)
@@ -4813,7 +6022,7 @@ class AnalyticsPanel:
                 f"🟡 OPTIMISATION: {wasted_gb:.1f}GB gaspillés dans {total_groups} groupes de doublons"
             )
 
-        size_age_info = metrics.get("size_age", {})
+        size_age_info = get("size_age", _EMPTY)
         archival_gb = size_age_info.get("archival_size_gb", 0)
         if archival_gb > 5.0:
             affected_files = size_age_info.get("total_affected", 0)
@@ -4821,7 +6030,6 @@ class AnalyticsPanel:
                 f"📦 ARCHIVAGE: {archival_gb:.1f}GB dans {affected_files} fichiers anciens/volumineux"
             )
 
-        global_info = metrics.get("global", {})
         total_size_gb = global_info.get("total_size_gb", 0)
         if total_size_gb > 100:
             recommendations.append(
@@ -4833,19 +6041,27 @@ class AnalyticsPanel:
                 "🛡️ SÉCURITÉ: Audit de sécurité recommandé pour les fichiers sensibles"
             )
 
-        total_files = global_info.get("total_files", 0)
         if total_files > 100000:
             recommendations.append(
                 "⚡ PERFORMANCE: Considérer l'indexation avancée pour les gros volumes"
             )
 
         if not recommendations:
-            return "✅ Aucune recommandation particulière - Le système fonctionne correctement"
+            return NO_RECOMMENDATION_TEXT
 
         return "\n".join(f"  {rec}" for rec in recommendations[:5])
 
     def refresh_all(self) -> None:
+        """Planifie une actualisation complète, en regroupant les appels rapprochés."""
+        if self._refresh_after is not None:
+            self.parent.after_cancel(self._refresh_after)
+        self._refresh_after = self.parent.after(
+            self.REFRESH_DEBOUNCE_MS, self._do_refresh_all
+        )
+
+    def _do_refresh_all(self) -> None:
         """Actualise toutes les métriques analytics avec vérifications de sécurité."""
+        self._refresh_after = None
         try:
             if hasattr(self, "progress_label"):
                 self.progress_label.config(text="🔄 Actualisation complète...")
@@ -4853,6 +6069,7 @@ class AnalyticsPanel:
 
             # Invalider le cache pour forcer le recalcul
             self._invalidate_cache()
+            self._clear_analysis_cache()
 
             # Recalculer toutes les métriques
             self.recalculate_all_metrics()
@@ -4886,17 +6103,17 @@ class AnalyticsPanel:
             "Database state: manager=%s", "available" if self.db_manager else "missing"
         )
 
+        # Une seule requête sert de sonde et de base à la récupération
+        basic_metrics: Optional[Dict[str, Any]] = None
         if self.db_manager:
-            try:
-                with self.db_manager._connect().get() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT COUNT(*) FROM fichiers")
-                    file_count = cursor.fetchone()[0]
-                    logger.info("Database accessible: %d files found", file_count)
-            except Exception as db_e:
-                logger.error(
-                    "Database connection failed during error handling: %s", db_e
+            basic_metrics = self._calculate_basic_metrics()
+            if basic_metrics:
+                logger.info(
+                    "Database accessible: %d files found",
+                    basic_metrics["total_files"],
                 )
+            else:
+                logger.error("Database connection failed during error handling")
 
         try:
             error_detail = str(error)[:200] + ("..." if len(str(error)) > 200 else "")
@@ -4914,7 +6131,7 @@ class AnalyticsPanel:
                 )
 
                 if response is True:
-                    self._attempt_recovery_calculation()
+                    self._attempt_recovery_calculation(basic_metrics)
                 elif response is False:
                     self._suggest_full_analysis()
             else:
@@ -4925,7 +6142,7 @@ class AnalyticsPanel:
                     parent=self.parent,
                 )
                 if response:
-                    self._attempt_recovery_calculation()
+                    self._attempt_recovery_calculation(basic_metrics)
 
         except Exception as dialog_error:
             logger.critical(
@@ -4934,8 +6151,13 @@ class AnalyticsPanel:
             if hasattr(self, "progress_label"):
                 self.progress_label.config(text=f"❌ Erreur critique: {operation}")
 
-    def _attempt_recovery_calculation(self) -> None:
-        """Attempt simplified calculation with available data only."""
+    def _attempt_recovery_calculation(
+        self, basic_metrics: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Attempt simplified calculation with available data only.
+
+        ``basic_metrics`` déjà calculées par la sonde d'erreur sont réutilisées.
+        """
         logger.info("Attempting analytics recovery calculation")
 
         try:
@@ -4947,7 +6169,7 @@ class AnalyticsPanel:
             if hasattr(self, "progress_label"):
                 self.progress_label.config(text="🔄 Tentative de récupération...")
 
-            recovery_metrics = self._calculate_basic_metrics()
+            recovery_metrics = basic_metrics or self._calculate_basic_metrics()
 
             if recovery_metrics and recovery_metrics.get("total_files", 0) > 0:
                 self._update_basic_metrics_display(recovery_metrics)
@@ -4994,13 +6216,30 @@ class AnalyticsPanel:
             with self.db_manager._connect().get() as conn:
                 cursor = conn.cursor()
 
-                cursor.execute(
-                    "SELECT status, COUNT(*), COALESCE(SUM(file_size), 0) FROM fichiers GROUP BY status"
-                )
+                # MAX(rowid) est immédiat, contrairement à COUNT(*) sur une grosse table
+                cursor.execute("SELECT COALESCE(MAX(rowid), 0) FROM fichiers")
+                max_rowid = cursor.fetchone()[0]
+                step = 1
+                if max_rowid > self.RECOVERY_SAMPLE_THRESHOLD:
+                    # Échantillon borné puis extrapolation pour rester rapide
+                    step = max_rowid // self.RECOVERY_SAMPLE_SIZE
+                    cursor.execute(
+                        "SELECT status, COUNT(*), COALESCE(SUM(file_size), 0) "
+                        "FROM fichiers WHERE rowid % ? = 0 GROUP BY status",
+                        (step,),
+                    )
+                    basic_metrics["estimated"] = True
+                    logger.warning(
+                        f"Basic metrics estimated from 1/{step} sample of fichiers"
+                    )
+                else:
+                    cursor.execute(
+                        "SELECT status, COUNT(*), COALESCE(SUM(file_size), 0) FROM fichiers GROUP BY status"
+                    )
                 for status, count, size in cursor.fetchall():
-                    basic_metrics[f"{status}_files"] = count
-                    basic_metrics["total_files"] += count
-                    basic_metrics["total_size"] += size or 0
+                    basic_metrics[f"{status}_files"] = count * step
+                    basic_metrics["total_files"] += count * step
+                    basic_metrics["total_size"] += (size or 0) * step
 
             logger.info("Basic metrics calculated: %s", basic_metrics)
             return basic_metrics
@@ -5016,11 +6255,11 @@ class AnalyticsPanel:
                 for key, value in metrics.items():
                     if key in self.stats_labels:
                         if "size" in key and isinstance(value, (int, float)):
-                            size_gb = value / (1024**3)
+                            size_gb = value * INV_GIB
                             display_value = f"{size_gb:.1f} GB"
                         else:
                             display_value = str(value)
-                        self.stats_labels[key].config(text=display_value)
+                        self._set_label_text(self.stats_labels[key], display_value)
 
             logger.info("Basic metrics display updated")
 
@@ -51,7 +51,11 @@ class ResultsCache:
 from content_analyzer.content_analyzer import ContentAnalyzer
 from content_analyzer.modules.api_client import APIClient
 from content_analyzer.modules.cache_manager import CacheManager
-from content_analyzer.modules.csv_parser import CSVParser
+from content_analyzer.modules.csv_parser import (
+    CSVParser,
+    refresh_duplicate_stats,
+    refresh_user_category_files,
+)
 from content_analyzer.modules.db_manager import SafeDBManager as DBManager
 from content_analyzer.modules.prompt_manager import PromptManager
 from content_analyzer.utils.prompt_validator import (
@@ -2487,8 +2491,21 @@ No need to run analysis to see your files.
             self.log_action(f"Analysis failed: {status}", "ERROR")
             self.status_app_label.config(text="Failed")
 
+        self._refresh_analytics_tables()
         self.invalidate_all_caches()
 
+    def _refresh_analytics_tables(self) -> None:
+        """Rebuild the analytics roll-up tables once analysis results are stored."""
+        if not self.db_manager:
+            return
+        try:
+            with self.db_manager._connect().get() as conn:
+                refresh_duplicate_stats(conn)
+                # Catégories C3 / RGPD du drill-down utilisateur: réponses LLM désormais présentes
+                refresh_user_category_files(conn)
+        except Exception as exc:
+            logger.warning("Analytics tables refresh failed: %s", exc)
+
     def on_analysis_complete_enhanced(self, result: dict) -> None:
         """Completion callback with performance statistics."""
         self.analysis_running = False
@@ -2529,6 +2546,7 @@ No need to run analysis to see your files.
             self.log_action(f"Analysis failed: {status}", "ERROR")
             self.status_app_label.config(text="Failed")
 
+        self._refresh_analytics_tables()
         self.invalidate_all_caches()
 
     def on_analysis_error(self, error: str) -> None:
@@ -5442,6 +5460,7 @@ Last Updated: {time.strftime('%Y-%m-%d %H:%M:%S')}
 
         def on_analytics_close():
             try:
+                analytics_panel.close()
                 self.analytics_window.grab_release()
                 self.analytics_window.destroy()
                 if hasattr(self, "analytics_window"):
@@ -5579,4 +5598,9 @@ Last Updated: {time.strftime('%Y-%m-%d %H:%M:%S')}
             self.prompt_debouncer.cancel()
         if hasattr(self, "results_refresh_debouncer"):
             self.results_refresh_debouncer.cancel()
+        if hasattr(self, "analytics_panel"):
+            try:
+                self.analytics_panel.close()
+            except Exception as e:
+                logger.warning(f"Error closing analytics panel: {e}")
         self.root.destroy()